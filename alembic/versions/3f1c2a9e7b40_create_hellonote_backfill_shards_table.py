@@ -0,0 +1,50 @@
+"""create hellonote_backfill_shards table
+
+Revision ID: 3f1c2a9e7b40
+Revises: d1bffb09f6a6
+Create Date: 2026-10-19 09:12:41.218730
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c2a9e7b40'
+down_revision: Union[str, Sequence[str], None] = 'd1bffb09f6a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "hellonote_backfill_shards",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("job_name", sa.String(length=100), nullable=False,
+                  comment="Backfill run identifier; reruns with the same job resume from here"),
+        sa.Column("shard_start", sa.Date(), nullable=False),
+        sa.Column("shard_end", sa.Date(), nullable=False),
+        sa.Column("status", sa.String(length=20), server_default="pending", nullable=False,
+                  comment="pending, done or failed"),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("fetched_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("inserted_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("skipped_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("started_at", sa.TIMESTAMP(), nullable=True),
+        sa.Column("finished_at", sa.TIMESTAMP(), nullable=True),
+        sa.Column("created_at", sa.TIMESTAMP(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.TIMESTAMP(), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("job_name", "shard_start", "shard_end", name="uq_hellonote_backfill_shard"),
+    )
+    op.create_index(op.f("ix_hellonote_backfill_shards_id"), "hellonote_backfill_shards", ["id"], unique=False)
+    op.create_index(op.f("ix_hellonote_backfill_shards_job_name"), "hellonote_backfill_shards", ["job_name"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_hellonote_backfill_shards_job_name"), table_name="hellonote_backfill_shards")
+    op.drop_index(op.f("ix_hellonote_backfill_shards_id"), table_name="hellonote_backfill_shards")
+    op.drop_table("hellonote_backfill_shards")
@@ -0,0 +1,48 @@
+"""create visit_reconciliation table
+
+Revision ID: 8e4d6b1f0a92
+Revises: 3f1c2a9e7b40
+Create Date: 2026-10-19 11:40:05.672314
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4d6b1f0a92'
+down_revision: Union[str, Sequence[str], None] = '3f1c2a9e7b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "visit_reconciliation",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("note_id", sa.BigInteger(), nullable=False),
+        sa.Column("visit_uid", sa.String(length=20), nullable=True),
+        sa.Column("patient_id", sa.BigInteger(), nullable=True),
+        sa.Column("note_date", sa.Date(), nullable=True),
+        sa.Column("status", sa.String(length=20), server_default="missing", nullable=False,
+                  comment="missing = in visits but not returned by HelloNote; resolved = seen again in a later check"),
+        sa.Column("window_start", sa.Date(), nullable=False),
+        sa.Column("window_end", sa.Date(), nullable=False),
+        sa.Column("first_detected_at", sa.TIMESTAMP(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("last_checked_at", sa.TIMESTAMP(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("resolved_at", sa.TIMESTAMP(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("note_id"),
+    )
+    op.create_index(op.f("ix_visit_reconciliation_id"), "visit_reconciliation", ["id"], unique=False)
+    op.create_index(op.f("ix_visit_reconciliation_note_date"), "visit_reconciliation", ["note_date"], unique=False)
+    op.create_index(op.f("ix_visit_reconciliation_status"), "visit_reconciliation", ["status"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_visit_reconciliation_status"), table_name="visit_reconciliation")
+    op.drop_index(op.f("ix_visit_reconciliation_note_date"), table_name="visit_reconciliation")
+    op.drop_index(op.f("ix_visit_reconciliation_id"), table_name="visit_reconciliation")
+    op.drop_table("visit_reconciliation")
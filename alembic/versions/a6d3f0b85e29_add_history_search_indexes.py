@@ -0,0 +1,34 @@
+"""add pg_trgm name index and patient_id index for history search
+
+Revision ID: a6d3f0b85e29
+Revises: f41b9d6e2c08
+Create Date: 2026-10-19 20:14:05.662391
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6d3f0b85e29'
+down_revision: Union[str, Sequence[str], None] = 'f41b9d6e2c08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Same expression as crud/visit_search.FULL_NAME_SQL
+    op.execute("""
+        CREATE INDEX ix_visits_full_name_trgm ON visits
+        USING gin ((coalesce(first_name, '') || ' ' || coalesce(last_name, '')) gin_trgm_ops)
+    """)
+    op.create_index(op.f("ix_visits_patient_id"), "visits", ["patient_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_visits_patient_id"), table_name="visits")
+    op.drop_index("ix_visits_full_name_trgm", table_name="visits")
@@ -0,0 +1,75 @@
+"""create typeahead_values
+
+Revision ID: b18e4c7a9f52
+Revises: a6d3f0b85e29
+Create Date: 2026-10-19 20:47:19.530874
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b18e4c7a9f52'
+down_revision: Union[str, Sequence[str], None] = 'a6d3f0b85e29'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "typeahead_values",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("kind", sa.String(length=30), nullable=False),
+        sa.Column("value", sa.String(length=255), nullable=False),
+        sa.Column("ref_id", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("created_at", sa.TIMESTAMP(), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("kind", "value", "ref_id", name="uq_typeahead_values_kind_value_ref"),
+    )
+    # pg_trgm is enabled by a6d3f0b85e29
+    op.create_index(
+        "ix_typeahead_values_value_trgm",
+        "typeahead_values",
+        ["value"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"value": "gin_trgm_ops"},
+    )
+
+    # Seed: crud/typeahead.py refresh_typeahead_values() (full scope) as of
+    # this revision
+    op.execute("""
+        INSERT INTO typeahead_values (kind, value, ref_id)
+        SELECT DISTINCT s.kind, s.value, s.ref_id
+        FROM (
+            SELECT x.kind, btrim(x.value) AS value, x.ref_id
+            FROM visits v
+            CROSS JOIN LATERAL (VALUES
+                ('primary_insurance', v.primary_insurance, 0::bigint),
+                ('secondary_insurance', v.secondary_insurance, 0::bigint),
+                ('therapist', v.visiting_therapist, 0::bigint),
+                ('therapist', v.supervising_therapist, 0::bigint),
+                ('patient', concat_ws(' ', v.first_name, v.last_name), COALESCE(v.patient_id, 0))
+            ) AS x(kind, value, ref_id)
+
+            UNION ALL
+
+            SELECT x.kind, btrim(x.value) AS value, x.ref_id
+            FROM patients p
+            CROSS JOIN LATERAL (VALUES
+                ('primary_insurance', p.primary_insurance, 0::bigint),
+                ('patient', concat_ws(' ', p.first_name, p.last_name), p.id)
+            ) AS x(kind, value, ref_id)
+        ) s
+        WHERE s.value IS NOT NULL
+          AND s.value <> ''
+        ON CONFLICT (kind, value, ref_id) DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_typeahead_values_value_trgm", table_name="typeahead_values")
+    op.drop_table("typeahead_values")
@@ -0,0 +1,173 @@
+"""create billing_day_stats + dirty outbox and triggers
+
+Revision ID: b7a2c4e91d35
+Revises: 8e4d6b1f0a92
+Create Date: 2026-10-19 14:02:17.904113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7a2c4e91d35'
+down_revision: Union[str, Sequence[str], None] = '8e4d6b1f0a92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Columns that feed a visit's bucket, sent/billed status or AR rate
+VISIT_STAT_COLUMNS = (
+    "note_date", "billed", "hold", "billing_id", "patient_id",
+    "primary_insurance", "secondary_insurance", "diagnosis", "medical_diagnosis",
+)
+
+
+def _row(alias: str) -> str:
+    return "(" + ", ".join(f"{alias}.{c}" for c in VISIT_STAT_COLUMNS) + ")"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "billing_day_stats",
+        sa.Column("note_date", sa.Date(), nullable=False),
+        sa.Column("unprepared", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("held_for_deductible", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("ready_to_bill", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("sent_to_billing", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("billed", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("ar", sa.Numeric(12, 2), server_default="0", nullable=False),
+        sa.Column("refreshed_at", sa.TIMESTAMP(), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("note_date"),
+    )
+    op.create_table(
+        "billing_day_stats_dirty",
+        sa.Column("note_date", sa.Date(), nullable=False),
+        sa.Column("marked_at", sa.TIMESTAMP(), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("note_date"),
+    )
+
+    # Transition tables allow a single event per trigger, hence one trigger
+    # per event below; each function branches on TG_OP.
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION billing_day_stats_mark_visits() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO billing_day_stats_dirty (note_date)
+                SELECT DISTINCT n.note_date FROM new_rows n WHERE n.note_date IS NOT NULL
+                ON CONFLICT (note_date) DO NOTHING;
+            ELSIF TG_OP = 'DELETE' THEN
+                INSERT INTO billing_day_stats_dirty (note_date)
+                SELECT DISTINCT o.note_date FROM old_rows o WHERE o.note_date IS NOT NULL
+                ON CONFLICT (note_date) DO NOTHING;
+            ELSE
+                INSERT INTO billing_day_stats_dirty (note_date)
+                SELECT DISTINCT d.note_date
+                FROM old_rows o
+                JOIN new_rows n ON n.id = o.id
+                CROSS JOIN LATERAL (VALUES (o.note_date), (n.note_date)) AS d(note_date)
+                WHERE d.note_date IS NOT NULL
+                  AND {_row("o")} IS DISTINCT FROM {_row("n")}
+                ON CONFLICT (note_date) DO NOTHING;
+            END IF;
+            RETURN NULL;
+        END;
+        $$;
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION billing_day_stats_mark_billing_status() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO billing_day_stats_dirty (note_date)
+            SELECT DISTINCT v.note_date
+            FROM old_rows o
+            JOIN new_rows n ON n.id = o.id
+            JOIN visits v ON v.billing_id = n.id
+            WHERE o.status IS DISTINCT FROM n.status
+              AND v.note_date IS NOT NULL
+            ON CONFLICT (note_date) DO NOTHING;
+            RETURN NULL;
+        END;
+        $$;
+    """)
+
+    # met_deductible only moves unbilled visits between held/ready
+    op.execute("""
+        CREATE OR REPLACE FUNCTION billing_day_stats_mark_patients() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO billing_day_stats_dirty (note_date)
+                SELECT DISTINCT v.note_date
+                FROM new_rows n
+                JOIN visits v ON v.patient_id = n.id
+                WHERE v.billed IS NOT TRUE
+                  AND v.note_date IS NOT NULL
+                ON CONFLICT (note_date) DO NOTHING;
+            ELSE
+                INSERT INTO billing_day_stats_dirty (note_date)
+                SELECT DISTINCT v.note_date
+                FROM old_rows o
+                JOIN new_rows n ON n.id = o.id
+                JOIN visits v ON v.patient_id = n.id
+                WHERE o.met_deductible IS DISTINCT FROM n.met_deductible
+                  AND v.billed IS NOT TRUE
+                  AND v.note_date IS NOT NULL
+                ON CONFLICT (note_date) DO NOTHING;
+            END IF;
+            RETURN NULL;
+        END;
+        $$;
+    """)
+
+    op.execute("""
+        CREATE TRIGGER trg_visits_day_stats_ins AFTER INSERT ON visits
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION billing_day_stats_mark_visits();
+
+        CREATE TRIGGER trg_visits_day_stats_upd AFTER UPDATE ON visits
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION billing_day_stats_mark_visits();
+
+        CREATE TRIGGER trg_visits_day_stats_del AFTER DELETE ON visits
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION billing_day_stats_mark_visits();
+
+        CREATE TRIGGER trg_billing_status_day_stats_upd AFTER UPDATE ON billing_status
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION billing_day_stats_mark_billing_status();
+
+        CREATE TRIGGER trg_patients_day_stats_ins AFTER INSERT ON patients
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION billing_day_stats_mark_patients();
+
+        CREATE TRIGGER trg_patients_day_stats_upd AFTER UPDATE ON patients
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION billing_day_stats_mark_patients();
+    """)
+
+    # Seed: every existing date is dirty; the first refresh builds the table
+    op.execute("""
+        INSERT INTO billing_day_stats_dirty (note_date)
+        SELECT DISTINCT note_date FROM visits WHERE note_date IS NOT NULL
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        DROP TRIGGER IF EXISTS trg_patients_day_stats_upd ON patients;
+        DROP TRIGGER IF EXISTS trg_patients_day_stats_ins ON patients;
+        DROP TRIGGER IF EXISTS trg_billing_status_day_stats_upd ON billing_status;
+        DROP TRIGGER IF EXISTS trg_visits_day_stats_del ON visits;
+        DROP TRIGGER IF EXISTS trg_visits_day_stats_upd ON visits;
+        DROP TRIGGER IF EXISTS trg_visits_day_stats_ins ON visits;
+        DROP FUNCTION IF EXISTS billing_day_stats_mark_patients();
+        DROP FUNCTION IF EXISTS billing_day_stats_mark_billing_status();
+        DROP FUNCTION IF EXISTS billing_day_stats_mark_visits();
+    """)
+    op.drop_table("billing_day_stats_dirty")
+    op.drop_table("billing_day_stats")
@@ -0,0 +1,46 @@
+"""create visit_edit_audit
+
+Revision ID: c4f7a2e19d86
+Revises: b18e4c7a9f52
+Create Date: 2026-10-19 21:15:42.087314
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f7a2e19d86'
+down_revision: Union[str, Sequence[str], None] = 'b18e4c7a9f52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "visit_edit_audit",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("visit_id", sa.Integer(), nullable=False),
+        sa.Column("note_id", sa.BigInteger(), nullable=False),
+        sa.Column("old_values", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("new_values", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("source", sa.String(length=30), nullable=False, comment="note_details | bulk_update"),
+        sa.Column("edited_by", sa.Integer(), nullable=True),
+        sa.Column("edited_at", sa.TIMESTAMP(), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["edited_by"], ["users.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_visit_edit_audit_note_id_edited_at",
+        "visit_edit_audit",
+        ["note_id", "edited_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_visit_edit_audit_note_id_edited_at", table_name="visit_edit_audit")
+    op.drop_table("visit_edit_audit")
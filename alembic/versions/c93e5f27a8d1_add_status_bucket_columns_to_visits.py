@@ -0,0 +1,94 @@
+"""add passes_abc, issue_keys, status_bucket to visits
+
+Revision ID: c93e5f27a8d1
+Revises: b7a2c4e91d35
+Create Date: 2026-10-19 16:25:48.311902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c93e5f27a8d1'
+down_revision: Union[str, Sequence[str], None] = 'b7a2c4e91d35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Backfill SQL: the app's passes_abc_expr / issue_keys_expr /
+# status_bucket_case (crud/billingQueries/unpreparedVisits.py) as of this
+# revision, copied so later changes there don't alter this migration.
+_BLOCKED_DIAGNOSIS = (
+    r"visits.diagnosis ~* '((^|[^A-Za-z0-9\.])G35($|[^A-Za-z0-9\.])"
+    r"|(^|[^A-Za-z0-9\.])E08\.37($|[^A-Za-z0-9\.]))'"
+)
+
+_PASSES_ABC = f"""(
+    visits.primary_insurance IS NOT NULL
+    AND visits.primary_insurance <> ''
+    AND visits.primary_insurance LIKE '%|%'
+    AND (visits.secondary_insurance IS NULL
+         OR visits.secondary_insurance = ''
+         OR visits.secondary_insurance LIKE '%|%')
+    AND visits.diagnosis IS NOT NULL
+    AND visits.diagnosis <> ''
+    AND visits.medical_diagnosis IS NOT NULL
+    AND visits.medical_diagnosis <> ''
+    AND NOT ({_BLOCKED_DIAGNOSIS})
+)"""
+
+_ISSUE_KEYS = f"""CAST(array_remove(ARRAY[
+    CASE WHEN trim(coalesce(visits.primary_insurance, '')) = ''
+           OR trim(coalesce(visits.primary_insurance, '')) NOT LIKE '%|%'
+         THEN 'primary_insurance' END,
+    CASE WHEN trim(coalesce(visits.secondary_insurance, '')) <> ''
+          AND trim(coalesce(visits.secondary_insurance, '')) NOT LIKE '%|%'
+         THEN 'secondary_insurance' END,
+    CASE WHEN trim(coalesce(visits.diagnosis, '')) = '' THEN 'diagnosis'
+         WHEN {_BLOCKED_DIAGNOSIS} THEN 'diagnosis_blocked_code' END,
+    CASE WHEN trim(coalesce(visits.medical_diagnosis, '')) = ''
+         THEN 'medical_diagnosis' END
+], NULL) AS VARCHAR(50)[])"""
+
+_STATUS_BUCKET = f"""CASE
+    WHEN {_PASSES_ABC} IS false THEN 'unprepared'
+    WHEN EXTRACT(year FROM visits.note_date) < 2026 THEN 'ready_to_bill'
+    WHEN (SELECT patients.met_deductible FROM patients
+          WHERE patients.id = visits.patient_id) IS true THEN 'ready_to_bill'
+    ELSE 'held_for_deductible'
+END"""
+
+
+def upgrade() -> None:
+    op.add_column("visits", sa.Column("passes_abc", sa.Boolean(), nullable=True,
+                                      comment="A/B/C check (insurance + diagnosis) result"))
+    op.add_column("visits", sa.Column("issue_keys", postgresql.ARRAY(sa.String(length=50)), nullable=True,
+                                      comment="Keys of ISSUE_LABELS that fail for this visit"))
+    op.add_column("visits", sa.Column("status_bucket", sa.String(length=30), nullable=True,
+                                      comment="unprepared | held_for_deductible | ready_to_bill"))
+
+    op.execute(f"""
+        UPDATE visits SET
+            passes_abc = {_PASSES_ABC},
+            issue_keys = {_ISSUE_KEYS},
+            status_bucket = {_STATUS_BUCKET}
+    """)
+
+    op.create_index(
+        "ix_visits_unbilled_note_date_bucket",
+        "visits",
+        ["note_date", "status_bucket"],
+        unique=False,
+        postgresql_where=sa.text("billed IS FALSE AND hold IS FALSE"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_visits_unbilled_note_date_bucket", table_name="visits")
+    op.drop_column("visits", "status_bucket")
+    op.drop_column("visits", "issue_keys")
+    op.drop_column("visits", "passes_abc")
@@ -0,0 +1,37 @@
+"""add keyset index for unprepared visits
+
+Revision ID: d58b0e3c4f17
+Revises: c93e5f27a8d1
+Create Date: 2026-10-19 17:48:09.125630
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd58b0e3c4f17'
+down_revision: Union[str, Sequence[str], None] = 'c93e5f27a8d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_visits_unprepared_keyset",
+        "visits",
+        # NULL-safe keys: same sentinels as unpreparedVisits.unprepared_keyset_columns()
+        [
+            sa.text("COALESCE(note_date, DATE '9999-12-31') DESC"),
+            sa.text("COALESCE(patient_id, 9223372036854775807)"),
+            sa.text("COALESCE(note_id, 9223372036854775807)"),
+        ],
+        unique=False,
+        postgresql_where=sa.text("billed IS FALSE AND hold IS FALSE AND status_bucket = 'unprepared'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_visits_unprepared_keyset", table_name="visits")
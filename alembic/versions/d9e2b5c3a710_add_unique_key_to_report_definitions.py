@@ -0,0 +1,65 @@
+"""add unique_key to report_definitions.output_columns
+
+Revision ID: d9e2b5c3a710
+Revises: c4f7a2e19d86
+Create Date: 2026-10-19 21:58:36.741205
+
+"""
+from typing import Sequence, Union
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9e2b5c3a710'
+down_revision: Union[str, Sequence[str], None] = 'c4f7a2e19d86'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Natural key per report, matching each SQL file's ON CONFLICT target
+UNIQUE_KEYS = {
+    "rpt_97110_97112_same_visit.sql": ["visit_row_id"],
+    "rpt_97750CPT.sql": ["visit_row_id"],
+    "rpt_double_notes.sql": ["visit_row_id"],
+    "rpt_low_cpt_code_use.sql": ["visit_row_id", "problematic_cpt", "problematic_amount"],
+    "rpt_overlapping_visits_by_therapist.sql": ["visit_row_id", "overlap_visit_row_id"],
+    "rpt_pt_ot_four_unit_minimum.sql": ["visit_row_id"],
+    "rpt_same_day_visits.sql": ["visit_row_id"],
+    "rpt_st_two_unit_minimum.sql": ["visit_row_id"],
+}
+
+
+def _column_type() -> str:
+    # created as json, declared as JSONB on the model: keep whatever is there
+    return op.get_bind().execute(sa.text("""
+        SELECT data_type FROM information_schema.columns
+        WHERE table_name = 'report_definitions' AND column_name = 'output_columns'
+    """)).scalar_one()
+
+
+def upgrade() -> None:
+    col_type = _column_type()
+    for sql_file, key in UNIQUE_KEYS.items():
+        op.execute(
+            sa.text(f"""
+                UPDATE report_definitions
+                SET output_columns = CAST(
+                    CAST(output_columns AS jsonb) || jsonb_build_object('unique_key', CAST(:key AS jsonb))
+                    AS {col_type}
+                )
+                WHERE sql_file = :sql_file
+            """).bindparams(key=json.dumps(key), sql_file=sql_file)
+        )
+    # The unique indexes themselves are built by the report runner
+    # (dynamicTableCreator) the next time each report runs.
+
+
+def downgrade() -> None:
+    col_type = _column_type()
+    op.execute(f"""
+        UPDATE report_definitions
+        SET output_columns = CAST(CAST(output_columns AS jsonb) - 'unique_key' AS {col_type})
+    """)
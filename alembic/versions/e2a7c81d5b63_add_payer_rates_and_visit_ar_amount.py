@@ -0,0 +1,145 @@
+"""add payer_rates and visits.ar_amount
+
+Revision ID: e2a7c81d5b63
+Revises: d58b0e3c4f17
+Create Date: 2026-10-19 18:52:31.407716
+
+"""
+from typing import Sequence, Union
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a7c81d5b63'
+down_revision: Union[str, Sequence[str], None] = 'd58b0e3c4f17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# The rates ar_rate_case() used to hard-code
+SEED_RATES = [
+    ("americare", 110),
+    ("royal care", 105),
+    ("extendedcare", 105),
+    ("able health", 105),
+    ("*", 104),
+]
+
+
+# b7a2c4e91d35's list, plus the stored columns the stats now read
+# (calendar AR sums visits.ar_amount, buckets come from status_bucket)
+OLD_VISIT_STAT_COLUMNS = (
+    "note_date", "billed", "hold", "billing_id", "patient_id",
+    "primary_insurance", "secondary_insurance", "diagnosis", "medical_diagnosis",
+)
+VISIT_STAT_COLUMNS = OLD_VISIT_STAT_COLUMNS + ("status_bucket", "ar_amount")
+
+
+def _mark_visits_function(columns) -> str:
+    def _row(alias: str) -> str:
+        return "(" + ", ".join(f"{alias}.{c}" for c in columns) + ")"
+
+    return f"""
+        CREATE OR REPLACE FUNCTION billing_day_stats_mark_visits() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO billing_day_stats_dirty (note_date)
+                SELECT DISTINCT n.note_date FROM new_rows n WHERE n.note_date IS NOT NULL
+                ON CONFLICT (note_date) DO NOTHING;
+            ELSIF TG_OP = 'DELETE' THEN
+                INSERT INTO billing_day_stats_dirty (note_date)
+                SELECT DISTINCT o.note_date FROM old_rows o WHERE o.note_date IS NOT NULL
+                ON CONFLICT (note_date) DO NOTHING;
+            ELSE
+                INSERT INTO billing_day_stats_dirty (note_date)
+                SELECT DISTINCT d.note_date
+                FROM old_rows o
+                JOIN new_rows n ON n.id = o.id
+                CROSS JOIN LATERAL (VALUES (o.note_date), (n.note_date)) AS d(note_date)
+                WHERE d.note_date IS NOT NULL
+                  AND {_row("o")} IS DISTINCT FROM {_row("n")}
+                ON CONFLICT (note_date) DO NOTHING;
+            END IF;
+            RETURN NULL;
+        END;
+        $$;
+    """
+
+
+def upgrade() -> None:
+    payer_rates = op.create_table(
+        "payer_rates",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("payer_key", sa.String(length=100), nullable=False),
+        sa.Column("cpt_code", sa.String(length=150), nullable=True, comment="NULL = any CPT"),
+        sa.Column("rate_per_visit", sa.Numeric(10, 2), server_default="0", nullable=False),
+        sa.Column("rate_per_unit", sa.Numeric(10, 2), nullable=True, comment="Added per visits.total_units"),
+        sa.Column("effective_from", sa.Date(), nullable=False),
+        sa.Column("effective_to", sa.Date(), nullable=True, comment="Inclusive; NULL = open-ended"),
+        sa.Column("created_at", sa.TIMESTAMP(), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_payer_rates_lookup", "payer_rates", ["payer_key", "effective_from"], unique=False)
+
+    op.bulk_insert(
+        payer_rates,
+        [
+            {"payer_key": key, "rate_per_visit": rate, "effective_from": date(2000, 1, 1)}
+            for key, rate in SEED_RATES
+        ],
+    )
+
+    op.add_column("visits", sa.Column("ar_amount", sa.Numeric(10, 2), nullable=True,
+                                      comment="AR at the payer_rates rate effective on note_date"))
+
+    # Rate changes only touch visits.ar_amount, so it has to mark dates too.
+    # Installed before the backfill so that UPDATE marks every date.
+    op.execute(_mark_visits_function(VISIT_STAT_COLUMNS))
+
+    # Backfill: ar_amount_expr() as of this revision. Only the any-CPT
+    # SEED_RATES exist yet, so every visit gets the any-CPT formula.
+    op.execute(r"""
+        UPDATE visits SET ar_amount = (
+            SELECT pr.rate_per_visit + COALESCE(pr.rate_per_unit, 0) * COALESCE(visits.total_units, 0)
+            FROM payer_rates pr
+            WHERE pr.payer_key IN (
+                      lower(btrim(regexp_replace(COALESCE(visits.primary_insurance, ''), '\s+', ' ', 'g'))),
+                      '*'
+                  )
+              AND pr.cpt_code IS NULL
+              AND pr.effective_from <= COALESCE(visits.note_date, CURRENT_DATE)
+              AND (pr.effective_to IS NULL OR pr.effective_to >= COALESCE(visits.note_date, CURRENT_DATE))
+            ORDER BY (pr.payer_key = '*'), pr.effective_from DESC, pr.id DESC
+            LIMIT 1
+        )
+    """)
+
+    # Cover ar_amount so the calendar AR sums are index-only scans
+    op.drop_index("ix_visits_unbilled_note_date_bucket", table_name="visits")
+    op.create_index(
+        "ix_visits_unbilled_note_date_bucket",
+        "visits",
+        ["note_date", "status_bucket"],
+        unique=False,
+        postgresql_include=["ar_amount"],
+        postgresql_where=sa.text("billed IS FALSE AND hold IS FALSE"),
+    )
+
+
+def downgrade() -> None:
+    op.execute(_mark_visits_function(OLD_VISIT_STAT_COLUMNS))
+    op.drop_index("ix_visits_unbilled_note_date_bucket", table_name="visits")
+    op.create_index(
+        "ix_visits_unbilled_note_date_bucket",
+        "visits",
+        ["note_date", "status_bucket"],
+        unique=False,
+        postgresql_where=sa.text("billed IS FALSE AND hold IS FALSE"),
+    )
+    op.drop_column("visits", "ar_amount")
+    op.drop_index("ix_payer_rates_lookup", table_name="payer_rates")
+    op.drop_table("payer_rates")
@@ -0,0 +1,55 @@
+"""add therapist_key / visit_period generated columns and GiST overlap index
+
+Revision ID: e6a1c9d47b20
+Revises: d9e2b5c3a710
+Create Date: 2026-10-19 22:31:47.208519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a1c9d47b20'
+down_revision: Union[str, Sequence[str], None] = 'd9e2b5c3a710'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # btree_gist lets the text therapist_key share a GiST index with the range
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+
+    # Same expressions as models/visits.py; adding them rewrites visits once
+    op.execute("""
+        ALTER TABLE visits
+            ADD COLUMN therapist_key varchar(150)
+                GENERATED ALWAYS AS (btrim(coalesce(visiting_therapist, ''))) STORED,
+            ADD COLUMN visit_period tsrange
+                GENERATED ALWAYS AS (
+                    CASE WHEN time_in < time_out THEN tsrange(time_in, time_out) END
+                ) STORED
+    """)
+    op.execute("""
+        COMMENT ON COLUMN visits.therapist_key IS
+            'Trimmed visiting_therapist, the overlap report''s match key'
+    """)
+    op.execute("""
+        COMMENT ON COLUMN visits.visit_period IS
+            '[time_in, time_out); NULL when either end is missing or out of order'
+    """)
+
+    op.execute("""
+        CREATE INDEX ix_visits_therapist_period ON visits
+        USING gist (therapist_key, visit_period)
+        WHERE visit_period IS NOT NULL AND hold IS NOT TRUE
+    """)
+    op.execute("ANALYZE visits")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_visits_therapist_period", table_name="visits")
+    op.drop_column("visits", "visit_period")
+    op.drop_column("visits", "therapist_key")
@@ -0,0 +1,134 @@
+"""add visit_invoice_matches and invoice columns on billing_day_stats
+
+Revision ID: f41b9d6e2c08
+Revises: e2a7c81d5b63
+Create Date: 2026-10-19 19:36:44.218530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f41b9d6e2c08'
+down_revision: Union[str, Sequence[str], None] = 'e2a7c81d5b63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INVOICE_STAT_COLUMNS = ("paid", "denied", "reconciled", "issues", "paid_amount")
+
+# Outcome of one millin_invoices row (alias m), copied from
+# crud/billingQueries/invoiceMatches.py as of this revision
+_PAID = "COALESCE(m.payment_summary, 0) > 0"
+_DENIED = (
+    f"NOT ({_PAID}) AND ("
+    "lower(COALESCE(m.final_invoice_status, '')) LIKE '%deni%' "
+    "OR lower(COALESCE(m.invoice_status_description, '')) LIKE '%deni%')"
+)
+_RECONCILED = f"({_PAID}) AND COALESCE(m.invoice_balance, 0) = 0"
+_HAS_ISSUE = "NULLIF(btrim(m.issue_tracker_status), '') IS NOT NULL"
+
+def upgrade() -> None:
+    op.create_table(
+        "visit_invoice_matches",
+        sa.Column("visit_id", sa.Integer(), nullable=False),
+        sa.Column("invoice_id", sa.Integer(), nullable=False),
+        sa.Column("patient_id", sa.BigInteger(), nullable=True),
+        sa.Column("note_date", sa.Date(), nullable=True),
+        sa.Column("paid", sa.Boolean(), server_default="false", nullable=False),
+        sa.Column("denied", sa.Boolean(), server_default="false", nullable=False),
+        sa.Column("reconciled", sa.Boolean(), server_default="false", nullable=False),
+        sa.Column("has_issue", sa.Boolean(), server_default="false", nullable=False),
+        sa.Column("paid_amount", sa.Numeric(12, 2), server_default="0", nullable=False),
+        sa.Column("matched_at", sa.TIMESTAMP(), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["visit_id"], ["visits.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["invoice_id"], ["millin_invoices.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("visit_id"),
+    )
+    op.create_index("ix_visit_invoice_matches_invoice_id", "visit_invoice_matches", ["invoice_id"], unique=False)
+    op.create_index("ix_visit_invoice_matches_note_date", "visit_invoice_matches", ["note_date"], unique=False)
+
+    # Join key for re-matching a patient's invoices
+    op.create_index(
+        "ix_millin_invoices_patient_dos",
+        "millin_invoices",
+        ["patient_id", "date_of_service"],
+        unique=False,
+    )
+
+    for col in INVOICE_STAT_COLUMNS:
+        col_type = sa.Numeric(12, 2) if col == "paid_amount" else sa.Integer()
+        op.add_column("billing_day_stats", sa.Column(col, col_type, server_default="0", nullable=False))
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION billing_day_stats_mark_invoice_matches() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO billing_day_stats_dirty (note_date)
+                SELECT DISTINCT n.note_date FROM new_rows n WHERE n.note_date IS NOT NULL
+                ON CONFLICT (note_date) DO NOTHING;
+            END IF;
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                INSERT INTO billing_day_stats_dirty (note_date)
+                SELECT DISTINCT o.note_date FROM old_rows o WHERE o.note_date IS NOT NULL
+                ON CONFLICT (note_date) DO NOTHING;
+            END IF;
+            RETURN NULL;
+        END;
+        $$;
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_invoice_matches_day_stats_ins AFTER INSERT ON visit_invoice_matches
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION billing_day_stats_mark_invoice_matches();
+
+        CREATE TRIGGER trg_invoice_matches_day_stats_upd AFTER UPDATE ON visit_invoice_matches
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION billing_day_stats_mark_invoice_matches();
+
+        CREATE TRIGGER trg_invoice_matches_day_stats_del AFTER DELETE ON visit_invoice_matches
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION billing_day_stats_mark_invoice_matches();
+    """)
+
+    # Backfill: refresh_invoice_matches() (full scope) as of this revision
+    op.execute(f"""
+        INSERT INTO visit_invoice_matches
+            (visit_id, invoice_id, patient_id, note_date,
+             paid, denied, reconciled, has_issue, paid_amount)
+        SELECT DISTINCT ON (v.id)
+            v.id, m.id, v.patient_id, v.note_date,
+            {_PAID}, {_DENIED}, {_RECONCILED}, {_HAS_ISSUE},
+            COALESCE(m.payment_summary, 0)
+        FROM visits v
+        JOIN millin_invoices m
+          ON m.patient_id = v.patient_id
+         AND m.date_of_service = v.note_date
+        ORDER BY v.id, m.invoice_date DESC NULLS LAST, m.id DESC
+    """)
+
+    # Every date needs the new columns, matched or not
+    op.execute("""
+        INSERT INTO billing_day_stats_dirty (note_date)
+        SELECT DISTINCT note_date FROM visits WHERE note_date IS NOT NULL
+        ON CONFLICT (note_date) DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        DROP TRIGGER IF EXISTS trg_invoice_matches_day_stats_del ON visit_invoice_matches;
+        DROP TRIGGER IF EXISTS trg_invoice_matches_day_stats_upd ON visit_invoice_matches;
+        DROP TRIGGER IF EXISTS trg_invoice_matches_day_stats_ins ON visit_invoice_matches;
+        DROP FUNCTION IF EXISTS billing_day_stats_mark_invoice_matches();
+    """)
+    for col in reversed(INVOICE_STAT_COLUMNS):
+        op.drop_column("billing_day_stats", col)
+    op.drop_index("ix_millin_invoices_patient_dos", table_name="millin_invoices")
+    op.drop_index("ix_visit_invoice_matches_note_date", table_name="visit_invoice_matches")
+    op.drop_index("ix_visit_invoice_matches_invoice_id", table_name="visit_invoice_matches")
+    op.drop_table("visit_invoice_matches")
@@ -0,0 +1,49 @@
+"""create report_runs
+
+Revision ID: f7c3d8a2e415
+Revises: e6a1c9d47b20
+Create Date: 2026-10-19 23:04:12.553861
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7c3d8a2e415'
+down_revision: Union[str, Sequence[str], None] = 'e6a1c9d47b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "report_runs",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("code", sa.String(length=100), nullable=False),
+        sa.Column("output_table", sa.String(length=255), nullable=False),
+        sa.Column("from_date", sa.Date(), nullable=False),
+        sa.Column("to_date", sa.Date(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False, comment="ok | ensure_failed | sql_missing | failed"),
+        sa.Column("started_at", sa.TIMESTAMP(), nullable=False),
+        sa.Column("finished_at", sa.TIMESTAMP(), nullable=False),
+        sa.Column("duration_ms", sa.Integer(), nullable=False),
+        sa.Column("rows_inserted", sa.Integer(), nullable=True),
+        sa.Column("ddl", sa.Boolean(), nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("query_plan", sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_report_runs_code_started_at",
+        "report_runs",
+        ["code", "started_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_report_runs_code_started_at", table_name="report_runs")
+    op.drop_table("report_runs")
@@ -0,0 +1,193 @@
+"""
+End-to-end HelloNote import benchmark (fetch → map → insert) against the
+local stub server, so it never touches emr.apiv2.hellonote.com.
+
+    python3 -m app.benchmarks.hellonote_import --sizes 1000 10000
+    python3 -m app.benchmarks.hellonote_import --sizes 5000 --latency-ms 150 --insert
+    python3 -m app.benchmarks.hellonote_import --sizes 5000 --latency-ms 150 --stream
+
+--stream runs the page-by-page pipeline (app.services.hellonote_pipeline)
+instead of the DataFrame path; it always inserts, so the same caveat applies.
+
+--insert writes into DATABASE_URL. Only use it against a scratch database:
+synthetic rows (noteId >= SYNTHETIC_NOTE_ID_BASE) are deleted afterwards,
+but visit_uid numbers for the current year are consumed while they exist.
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from app.helloNoteApi.stubServer import (
+    SYNTHETIC_NOTE_ID_BASE,
+    build_synthetic_items,
+    load_fixture,
+    start_stub_in_thread,
+)
+
+
+def _configure_env(base_url: str, token_file: str):
+    # Must run before any app.helloNoteApi / app.crud import reads the env.
+    os.environ["HELLONOTE_BASE_URL"] = base_url
+    os.environ["HELLONOTE_TOKEN_FILE"] = token_file
+    os.environ.setdefault("HELLONOTE_EMAIL", "bench@hellonote.local")
+    os.environ.setdefault("HELLONOTE_PASSWORD", "bench")
+    # Empty (not unset) so load_dotenv() can't bring the real webhook back
+    os.environ["POWER_AUTOMATE_MYSELF"] = ""
+
+
+def _rate(rows: int, seconds: float) -> str:
+    if seconds <= 0:
+        return "n/a"
+    return f"{rows / seconds:,.0f} rows/s"
+
+
+async def _insert(mapped: list[dict]) -> dict:
+    from app.database import SessionLocal
+    from app.crud.visits import insert_visit_rows
+
+    async with SessionLocal() as db:
+        return await insert_visit_rows(db, mapped, uploaded_by=None)
+
+
+async def _cleanup():
+    from sqlalchemy import delete
+    from app.database import SessionLocal
+    from app.models.visits import Visit
+
+    async with SessionLocal() as db:
+        await db.execute(delete(Visit).where(Visit.note_id >= SYNTHETIC_NOTE_ID_BASE))
+        await db.commit()
+
+
+async def _stream(date_from: str, date_to: str):
+    from app.database import SessionLocal
+    from app.services.hellonote_pipeline import run_hellonote_import_pipeline
+
+    async with SessionLocal() as db:
+        return await run_hellonote_import_pipeline(
+            db,
+            date_from=date_from,
+            date_to=date_to,
+            uploaded_by=None,
+            isAllStatus=True,
+            isFinalizedDate=False,
+            isAllStatusWithHold=True,
+        )
+
+
+def run_streaming(server, size: int, date_from: str, date_to: str) -> dict:
+    server.stats.clear()
+
+    result = asyncio.run(_stream(date_from, date_to))
+    asyncio.run(_cleanup())
+
+    # Stages overlap, so report busy time per stage plus the real wall clock
+    timings = {name: c.busy_seconds for name, c in result.stages.items()}
+    timings["wall"] = result.wall_seconds
+    return {
+        "size": size,
+        "rows": result.stages["map"].items,
+        "inserted": result.totals.get("inserted_count", 0),
+        "requests": sum(server.stats.values()),
+        "timings": timings,
+    }
+
+
+def run_once(server, size: int, date_from: str, date_to: str, do_insert: bool) -> dict:
+    from app.crud.visits_via_api import fetch_all_hellonote_visits
+    from app.helloNoteApi.visits_mapper import map_hellonote_list_to_visits
+
+    server.stats.clear()
+    timings: dict[str, float] = {}
+
+    t0 = time.perf_counter()
+    df = fetch_all_hellonote_visits(
+        date_from=date_from,
+        date_to=date_to,
+        isAllStatus=True,
+        isFinalizedDate=False,
+        isAllStatusWithHold=True,
+    )
+    timings["fetch"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    mapped = map_hellonote_list_to_visits(df.to_dict(orient="records"))
+    timings["map"] = time.perf_counter() - t0
+
+    inserted = 0
+    if do_insert and mapped:
+        t0 = time.perf_counter()
+        result = asyncio.run(_insert(mapped))
+        timings["insert"] = time.perf_counter() - t0
+        inserted = result["inserted_count"]
+        asyncio.run(_cleanup())
+
+    return {
+        "size": size,
+        "rows": len(mapped),
+        "inserted": inserted,
+        "requests": sum(server.stats.values()),
+        "timings": timings,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HelloNote import throughput benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--from", dest="date_from", default="01/01/2025")
+    parser.add_argument("--to", dest="date_to", default="01/31/2025")
+    parser.add_argument("--latency-ms", type=int, default=0, help="Simulated HelloNote latency per request")
+    parser.add_argument("--fixture", default=None, help="Serve a recorded fixture instead of synthetic items")
+    parser.add_argument("--insert", action="store_true", help="Also insert into DATABASE_URL (scratch DB only)")
+    parser.add_argument("--stream", action="store_true", help="Use the page-by-page pipeline (inserts; scratch DB only)")
+    args = parser.parse_args()
+
+    token_file = os.path.join(tempfile.mkdtemp(prefix="hellonote_bench_"), "token.json")
+
+    # One server for every size: the app modules read HELLONOTE_BASE_URL once at import
+    server, base_url = start_stub_in_thread([], latency_ms=args.latency_ms)
+    _configure_env(base_url, token_file)
+
+    from app.helloNoteApi.login_with_cache import hellonote_login
+
+    results = []
+    try:
+        hellonote_login()
+        for size in args.sizes:
+            server.items = load_fixture(args.fixture) if args.fixture else build_synthetic_items(
+                size, args.date_from, args.date_to
+            )
+            if args.stream:
+                results.append(run_streaming(server, len(server.items), args.date_from, args.date_to))
+            else:
+                results.append(run_once(server, len(server.items), args.date_from, args.date_to, args.insert))
+            if args.fixture:
+                break
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print("\n==================== HELLONOTE IMPORT BENCHMARK ====================")
+    mode = "stream" if args.stream else "dataframe"
+    print(f"mode={mode} latency/request={args.latency_ms}ms insert={'yes' if args.insert or args.stream else 'no'}")
+    for r in results:
+        t = r["timings"]
+        total = t.pop("wall", None) or sum(t.values())
+        print(f"\n▶ dataset={r['size']:,} items → {r['rows']:,} mapped rows, {r['requests']} HTTP requests")
+        for stage in ("fetch", "map", "insert"):
+            if stage in t:
+                print(f"   {stage:<7} {t[stage]:8.3f}s  {_rate(r['rows'], t[stage])}")
+        print(f"   {'total':<7} {total:8.3f}s  {_rate(r['rows'], total)}")
+        if args.insert or args.stream:
+            print(f"   inserted={r['inserted']:,}")
+
+
+if __name__ == "__main__":
+    main()
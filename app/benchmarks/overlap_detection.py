@@ -0,0 +1,176 @@
+"""
+Overlap report join: old trim()/time comparison vs generated-column GiST
+range probe, on a synthetic multi-year visits table.
+
+    python3 -m app.benchmarks.overlap_detection
+    python3 -m app.benchmarks.overlap_detection --years 5 --therapists 120 --days 7
+
+Everything runs in one transaction on TEMP tables and is rolled back at the
+end (btree_gist included), so DATABASE_URL is not changed. Each shape is
+timed against the most recent --days of finalized_date, the way the daily
+report and a backfill run it; row counts must match or the run aborts.
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+from datetime import date, timedelta
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from sqlalchemy import text
+
+from app.database import SessionLocal
+
+
+# Same column definitions as the e6a1c9d47b20 migration
+CREATE_SQL = """
+    CREATE TEMP TABLE overlap_bench (
+        id bigserial PRIMARY KEY,
+        visiting_therapist varchar(150),
+        time_in timestamp,
+        time_out timestamp,
+        hold boolean,
+        finalized_date date,
+        therapist_key varchar(150)
+            GENERATED ALWAYS AS (btrim(coalesce(visiting_therapist, ''))) STORED,
+        visit_period tsrange
+            GENERATED ALWAYS AS (
+                CASE WHEN time_in < time_out THEN tsrange(time_in, time_out) END
+            ) STORED
+    ) ON COMMIT DROP
+"""
+
+# Back-to-back ~50 minute slots with jitter, so a few percent overlap.
+# A trailing space on some names exercises the trim() match.
+POPULATE_SQL = """
+    INSERT INTO overlap_bench (visiting_therapist, time_in, time_out, hold, finalized_date)
+    SELECT
+        'Therapist ' || t || CASE WHEN random() < 0.05 THEN ' ' ELSE '' END,
+        CASE WHEN random() < 0.01 THEN NULL ELSE start_at END,
+        start_at + interval '40 minutes' + random() * interval '20 minutes',
+        random() < 0.02,
+        d::date + (random() * 3)::int
+    FROM generate_series(CAST(:first_day AS date), CAST(:last_day AS date), interval '1 day') AS d
+    CROSS JOIN generate_series(1, :therapists) AS t
+    CROSS JOIN generate_series(0, :visits_per_day - 1) AS s
+    CROSS JOIN LATERAL (
+        SELECT d + interval '8 hours' + s * interval '50 minutes' + random() * interval '15 minutes' AS start_at
+    ) AS slot
+"""
+
+INDEX_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS btree_gist",
+    "CREATE INDEX ON overlap_bench (finalized_date)",
+    """
+    CREATE INDEX ON overlap_bench USING gist (therapist_key, visit_period)
+    WHERE visit_period IS NOT NULL AND hold IS NOT TRUE
+    """,
+    "ANALYZE overlap_bench",
+]
+
+# Join shape of rpt_overlapping_visits_by_therapist.sql before the change
+OLD_SQL = """
+    SELECT count(*)
+    FROM overlap_bench a
+    JOIN overlap_bench b
+      ON trim(coalesce(a.visiting_therapist, '')) = trim(coalesce(b.visiting_therapist, ''))
+     AND a.id < b.id
+     AND COALESCE(b.hold, false) = false
+     AND a.time_in IS NOT NULL
+     AND a.time_out IS NOT NULL
+     AND b.time_in IS NOT NULL
+     AND b.time_out IS NOT NULL
+     AND a.time_in < b.time_out
+     AND b.time_in < a.time_out
+    WHERE a.finalized_date BETWEEN CAST(:from_date AS date) AND CAST(:to_date AS date)
+      AND COALESCE(a.hold, false) = false
+"""
+
+# ... and after
+NEW_SQL = """
+    SELECT count(*)
+    FROM overlap_bench a
+    JOIN overlap_bench b
+      ON b.therapist_key = a.therapist_key
+     AND b.visit_period && a.visit_period
+     AND b.visit_period IS NOT NULL
+     AND b.hold IS NOT TRUE
+     AND a.id < b.id
+    WHERE a.finalized_date BETWEEN CAST(:from_date AS date) AND CAST(:to_date AS date)
+      AND COALESCE(a.hold, false) = false
+      AND a.visit_period IS NOT NULL
+"""
+
+
+async def _time(db, sql: str, params: dict, runs: int) -> tuple[int, float]:
+    rows = 0
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        rows = int((await db.execute(text(sql), params)).scalar_one())
+        samples.append((time.perf_counter() - started) * 1000)
+    return rows, statistics.median(samples)
+
+
+async def main(years: int, therapists: int, visits_per_day: int, days: int, runs: int):
+    last_day = date.today() - timedelta(days=1)
+    first_day = last_day - timedelta(days=365 * years)
+    window = {"from_date": last_day - timedelta(days=days - 1), "to_date": last_day}
+
+    async with SessionLocal() as db:
+        try:
+            started = time.perf_counter()
+            await db.execute(text(CREATE_SQL))
+            await db.execute(
+                text(POPULATE_SQL),
+                {
+                    "first_day": first_day,
+                    "last_day": last_day,
+                    "therapists": therapists,
+                    "visits_per_day": visits_per_day,
+                },
+            )
+            for sql in INDEX_SQL:
+                await db.execute(text(sql))
+            total = int((await db.execute(text("SELECT count(*) FROM overlap_bench"))).scalar_one())
+            build_s = time.perf_counter() - started
+
+            # warm both plans once
+            await _time(db, OLD_SQL, window, 1)
+            await _time(db, NEW_SQL, window, 1)
+
+            old_rows, old_ms = await _time(db, OLD_SQL, window, runs)
+            new_rows, new_ms = await _time(db, NEW_SQL, window, runs)
+        finally:
+            await db.rollback()
+
+    print("\n==================== OVERLAP DETECTION BENCHMARK ====================")
+    print(
+        f"visits={total:,} ({first_day}..{last_day}, {therapists} therapists, "
+        f"{visits_per_day}/day) built in {build_s:.1f}s"
+    )
+    print(f"window={window['from_date']}..{window['to_date']} runs={runs}")
+    print(f"   trim/time join {old_ms:10.1f} ms   overlaps={old_rows:,}")
+    print(f"   gist && probe  {new_ms:10.1f} ms   overlaps={new_rows:,}")
+    if new_ms:
+        print(f"   speedup        {old_ms / new_ms:10.1f}x")
+
+    if old_rows != new_rows:
+        raise SystemExit(f"❌ overlap counts differ: old={old_rows} new={new_rows}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Overlap report join benchmark")
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--therapists", type=int, default=80)
+    parser.add_argument("--visits-per-day", type=int, default=8)
+    parser.add_argument("--days", type=int, default=1, help="finalized_date window size (1 = daily run)")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.years, args.therapists, args.visits_per_day, args.days, args.runs))
@@ -0,0 +1,97 @@
+"""
+Sequential vs fanned-out read queries against DATABASE_URL (read-only).
+
+    python3 -m app.benchmarks.query_fanout --runs 20
+    python3 -m app.benchmarks.query_fanout --start 2026-01-01 --end 2026-03-31
+
+For each route shape the same queries are timed awaited one after another
+on one session, then through run_concurrently(); medians are printed.
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+from datetime import date
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from sqlalchemy import select
+
+from app.database import SessionLocal
+from app.models.visits import Visit
+from app.models.patients import Patient
+from app.crud.billingQueries.unpreparedVisits import (
+    fetch_all_unprepared_visits,
+    count_unprepared_from_stats,
+)
+from app.services.query_fanout import run_concurrently
+
+
+async def _values(session, stmt):
+    return (await session.execute(stmt)).scalars().all()
+
+
+def build_cases(start: date | None, end: date | None) -> dict:
+    return {
+        "billing_unprepared": {
+            "rows": lambda s: fetch_all_unprepared_visits(
+                s, start_date=start, end_date=end, limit=500, include_total=False
+            ),
+            "total": lambda s: count_unprepared_from_stats(s, start, end),
+        },
+        "insurance_options": {
+            "primary": lambda s: _values(s, select(Visit.primary_insurance).distinct()),
+            "secondary": lambda s: _values(s, select(Visit.secondary_insurance).distinct()),
+        },
+        "primary_insurances": {
+            "visits": lambda s: _values(s, select(Visit.primary_insurance).distinct()),
+            "patients": lambda s: _values(s, select(Patient.primary_insurance).distinct()),
+        },
+    }
+
+
+async def time_sequential(queries: dict) -> float:
+    started = time.perf_counter()
+    async with SessionLocal() as session:
+        for q in queries.values():
+            await q(session)
+    return (time.perf_counter() - started) * 1000
+
+
+async def time_fanout(queries: dict, label: str) -> float:
+    fan = await run_concurrently(queries, label=label)
+    return fan.wall_ms
+
+
+async def main(runs: int, start: date | None, end: date | None):
+    cases = build_cases(start, end)
+
+    print("\n==================== QUERY FANOUT BENCHMARK ====================")
+    print(f"runs={runs} range={start or '-'}..{end or '-'}")
+    for label, queries in cases.items():
+        # warm the pool and caches once
+        await time_sequential(queries)
+
+        seq = [await time_sequential(queries) for _ in range(runs)]
+        fan = [await time_fanout(queries, label) for _ in range(runs)]
+
+        seq_ms = statistics.median(seq)
+        fan_ms = statistics.median(fan)
+        saved = (1 - fan_ms / seq_ms) * 100 if seq_ms else 0.0
+        print(f"\n▶ {label} ({len(queries)} queries)")
+        print(f"   sequential {seq_ms:8.1f} ms")
+        print(f"   fanout     {fan_ms:8.1f} ms   ({saved:.0f}% less)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sequential vs concurrent read query latency")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--start", type=date.fromisoformat, default=None)
+    parser.add_argument("--end", type=date.fromisoformat, default=None)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.runs, args.start, args.end))
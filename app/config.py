@@ -32,6 +32,17 @@ class Settings(BaseSettings):
     STRIPE_SUCCESS_URL: Optional[str] = None  # must include {LEAD_ID}
     STRIPE_CANCEL_URL: Optional[str] = None
 
+    # Billing calendar response cache (0 disables). Without REDIS_URL it is per-process,
+    # so writes from cron jobs only show up after the TTL.
+    CALENDAR_CACHE_TTL_SECONDS: int = 300
+    REDIS_URL: Optional[str] = None
+
+    # In-memory /typeahead index reload interval (ingest in this process reloads sooner)
+    TYPEAHEAD_TTL_SECONDS: int = 600
+
+    # dailyReports: reports whose last run took this long run under EXPLAIN (ANALYZE, BUFFERS) next time (0 disables)
+    REPORT_EXPLAIN_THRESHOLD_SECONDS: float = 60
+
     class Config:
         env_file = ".env"
         extra = "ignore"  # IMPORTANT: prevents crash if you add unrelated env vars
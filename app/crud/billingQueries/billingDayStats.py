@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from calendar import monthrange
+import asyncio
+
+from sqlalchemy import select, func, extract, text, delete, exists
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import SessionLocal
+from app.models.billing_day_stats import BillingDayStats, BillingDayStatsDirty
+from app.crud.billingQueries.calendarSummary import SUMMARY_KEYS, stat_value, summarize_note_dates
+
+
+REFRESH_BATCH_DAYS = 500
+
+
+def _empty() -> dict[str, int]:
+    return {k: 0 for k in SUMMARY_KEYS}
+
+
+# ----------------------------
+# OUTBOX CONSUMER
+# ----------------------------
+async def refresh_dirty_billing_day_stats(db: AsyncSession, batch_days: int = REFRESH_BATCH_DAYS) -> int:
+    """
+    Drain billing_day_stats_dirty: claim up to batch_days dates (SKIP LOCKED,
+    so concurrent callers don't block each other), recompute them with the
+    fused calendar query and replace their billing_day_stats rows.
+    Commits per batch. Returns the number of dates refreshed.
+    """
+    refreshed = 0
+    while True:
+        claimed = await db.execute(
+            text("""
+                DELETE FROM billing_day_stats_dirty
+                WHERE note_date IN (
+                    SELECT note_date
+                    FROM billing_day_stats_dirty
+                    ORDER BY note_date
+                    LIMIT :batch_days
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING note_date
+            """),
+            {"batch_days": batch_days},
+        )
+        dates = [r[0] for r in claimed.all()]
+        if not dates:
+            await db.commit()
+            return refreshed
+
+        stats = await summarize_note_dates(db, dates)
+
+        await db.execute(delete(BillingDayStats).where(BillingDayStats.note_date.in_(dates)))
+        if stats:
+            now = datetime.now()
+            await db.execute(
+                insert(BillingDayStats).values(
+                    [{"note_date": d, **counts, "refreshed_at": now} for d, counts in stats.items()]
+                )
+            )
+        await db.commit()
+
+        refreshed += len(dates)
+        if len(dates) < batch_days:
+            return refreshed
+
+
+async def has_dirty_dates(db: AsyncSession, start_date: date, end_date: date) -> bool:
+    """
+    True while any note_date in [start_date, end_date) is still in the
+    outbox: claimed by a concurrent drain (SKIP LOCKED) that has not
+    committed yet, or marked after our own drain. Stats read for that
+    range right after may be stale, so callers skip caching them.
+    """
+    stmt = select(
+        exists().where(
+            BillingDayStatsDirty.note_date >= start_date,
+            BillingDayStatsDirty.note_date < end_date,
+        )
+    )
+    return bool((await db.execute(stmt)).scalar())
+
+
+# ----------------------------
+# READERS (same shapes as calendarSummary)
+# ----------------------------
+def _sum_columns():
+    return [func.coalesce(func.sum(getattr(BillingDayStats, k)), 0).label(k) for k in SUMMARY_KEYS]
+
+
+async def read_year_by_month(db: AsyncSession, year: int) -> dict[int, dict[str, int]]:
+    month_expr = extract("month", BillingDayStats.note_date).label("month")
+    stmt = (
+        select(month_expr, *_sum_columns())
+        .where(
+            BillingDayStats.note_date >= date(year, 1, 1),
+            BillingDayStats.note_date < date(year + 1, 1, 1),
+        )
+        .group_by(month_expr)
+    )
+    rows = (await db.execute(stmt)).mappings().all()
+
+    out = {m: _empty() for m in range(1, 13)}
+    for r in rows:
+        out[int(r["month"])] = {k: stat_value(k, r[k]) for k in SUMMARY_KEYS}
+    return out
+
+
+async def read_month_by_day(db: AsyncSession, year: int, month: int) -> dict[int, dict[str, int]]:
+    start_date = date(year, month, 1)
+    end_date = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+
+    rows = (
+        await db.execute(
+            select(BillingDayStats).where(
+                BillingDayStats.note_date >= start_date,
+                BillingDayStats.note_date < end_date,
+            )
+        )
+    ).scalars().all()
+
+    out = {d: _empty() for d in range(1, monthrange(year, month)[1] + 1)}
+    for r in rows:
+        out[r.note_date.day] = {k: stat_value(k, getattr(r, k)) for k in SUMMARY_KEYS}
+    return out
+
+
+# ----------------------------
+# __main__
+# ----------------------------
+if __name__ == "__main__":
+    async def _run():
+        async with SessionLocal() as db:
+            n = await refresh_dirty_billing_day_stats(db)
+        print(f"✅ Refreshed billing_day_stats for {n} dates")
+
+    asyncio.run(_run())
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from calendar import monthrange
+import asyncio
+
+from sqlalchemy import select, func, extract
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import SessionLocal
+from app.models.visits import Visit
+from app.models.billing_status import BillingStatus
+from app.models.visit_invoice_matches import VisitInvoiceMatch
+from app.crud.billingQueries.sentToBillingVisits import SENT_TO_BILLING_STATUS, BILLED_STATUS
+
+
+SUMMARY_KEYS = (
+    "unprepared",
+    "held_for_deductible",
+    "ready_to_bill",
+    "sent_to_billing",
+    "billed",
+    "ar",
+    # from visit_invoice_matches (Millin invoices)
+    "paid",
+    "denied",
+    "reconciled",
+    "issues",
+    "paid_amount",
+)
+
+# Dollar sums, kept to the cent; routes round them when building responses
+AMOUNT_KEYS = ("ar", "paid_amount")
+
+
+def _empty() -> dict[str, int]:
+    return {k: 0 for k in SUMMARY_KEYS}
+
+
+def stat_value(key: str, value):
+    """Counts as int, AMOUNT_KEYS as Decimal (NULL sums -> 0)."""
+    if key in AMOUNT_KEYS:
+        return Decimal(value or 0)
+    return int(value or 0)
+
+
+def _summary_stmt(group_expr):
+    """
+    SELECT group_expr, <SUMMARY_KEYS aggregates> over hold=false visits:
+
+      - unprepared / held_for_deductible / ready_to_bill: billed=false, by stored visits.status_bucket
+      - sent_to_billing / billed: billed=true, by billing_status.status
+      - ar: SUM(visits.ar_amount) over billed=false
+      - paid / denied / reconciled / issues / paid_amount: matched Millin invoice outcome
+    """
+    bucket = Visit.status_bucket
+    unbilled = Visit.billed.is_(False)
+    billed = Visit.billed.is_(True)
+    inv = VisitInvoiceMatch
+
+    return (
+        select(
+            group_expr,
+            func.count().filter(unbilled, bucket == "unprepared").label("unprepared"),
+            func.count().filter(unbilled, bucket == "held_for_deductible").label("held_for_deductible"),
+            func.count().filter(unbilled, bucket == "ready_to_bill").label("ready_to_bill"),
+            func.count().filter(billed, BillingStatus.status == SENT_TO_BILLING_STATUS).label("sent_to_billing"),
+            func.count().filter(billed, BillingStatus.status == BILLED_STATUS).label("billed"),
+            func.sum(Visit.ar_amount).filter(unbilled).label("ar"),
+            func.count().filter(inv.paid.is_(True)).label("paid"),
+            func.count().filter(inv.denied.is_(True)).label("denied"),
+            func.count().filter(inv.reconciled.is_(True)).label("reconciled"),
+            func.count().filter(inv.has_issue.is_(True)).label("issues"),
+            func.sum(inv.paid_amount).label("paid_amount"),
+        )
+        .select_from(Visit)
+        .outerjoin(BillingStatus, Visit.billing_id == BillingStatus.id)
+        .outerjoin(inv, inv.visit_id == Visit.id)
+        .where(Visit.hold.is_(False))
+        .group_by(group_expr)
+    )
+
+
+async def summarize_calendar(
+    db: AsyncSession,
+    start_date: date,
+    end_date: date,
+    period: str,
+) -> dict[int, dict[str, int]]:
+    """
+    One pass over visits in [start_date, end_date) grouped by `period`
+    ("month" or "day" of note_date). Replaces the separate bucket,
+    sent-to-billing, billed and AR queries.
+    """
+    period_expr = extract(period, Visit.note_date).label(period)
+    stmt = _summary_stmt(period_expr).where(
+        Visit.note_date >= start_date,
+        Visit.note_date < end_date,
+    )
+
+    rows = (await db.execute(stmt)).mappings().all()
+
+    out: dict[int, dict[str, int]] = {}
+    for r in rows:
+        out[int(r[period])] = {k: stat_value(k, r[k]) for k in SUMMARY_KEYS}
+    return out
+
+
+async def summarize_note_dates(db: AsyncSession, dates: list[date]) -> dict[date, dict[str, int]]:
+    """Same aggregates keyed by exact note_date (used to refresh billing_day_stats)."""
+    if not dates:
+        return {}
+    stmt = _summary_stmt(Visit.note_date).where(Visit.note_date.in_(dates))
+    rows = (await db.execute(stmt)).mappings().all()
+    return {r["note_date"]: {k: stat_value(k, r[k]) for k in SUMMARY_KEYS} for r in rows}
+
+
+async def summarize_year_by_month(db: AsyncSession, year: int) -> dict[int, dict[str, int]]:
+    found = await summarize_calendar(db, date(year, 1, 1), date(year + 1, 1, 1), "month")
+    return {m: found.get(m, _empty()) for m in range(1, 13)}
+
+
+async def summarize_month_by_day(db: AsyncSession, year: int, month: int) -> dict[int, dict[str, int]]:
+    start_date = date(year, month, 1)
+    end_date = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    found = await summarize_calendar(db, start_date, end_date, "day")
+    return {d: found.get(d, _empty()) for d in range(1, monthrange(year, month)[1] + 1)}
+
+
+if __name__ == "__main__":
+    async def _test():
+        async with SessionLocal() as db:
+            print(await summarize_year_by_month(db, 2026))
+            print(await summarize_month_by_day(db, 2026, 1))
+
+    asyncio.run(_test())
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from typing import List
+import asyncio
+
+from sqlalchemy import select, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import SessionLocal
+from app.models.visits import Visit
+from app.models.patients import Patient
+from app.models.billing_status import BillingStatus
+from app.crud.billingQueries.calendarSummary import SUMMARY_KEYS
+from app.crud.billingQueries.invoiceMatches import invoice_counts_for_day
+from app.crud.billingQueries.sentToBillingVisits import SENT_TO_BILLING_STATUS, BILLED_STATUS
+
+
+# billing_status.status -> (summary key, statusBucket in the visit rows)
+BILLED_BUCKETS = {
+    SENT_TO_BILLING_STATUS: ("sent_to_billing", "sentToBilling"),
+    BILLED_STATUS: ("billed", "billed"),
+}
+
+
+async def fetch_day_summary(db: AsyncSession, dt: date) -> tuple[dict[str, int], List[dict]]:
+    """
+    Counts + visit rows for exactly one note_date, from ONE query.
+
+    Rows are every hold=false visit on dt that is either unbilled (three
+    buckets) or billed with a sent-to-billing/billed status. Counts and AR
+    are summed from those same rows, so they always agree with the list.
+    Row shapes match fetch_visits_for_day_three_buckets /
+    fetch_visits_for_day_by_status, in that order. Invoice outcome counts
+    come from a second, note_date-indexed lookup on visit_invoice_matches.
+    """
+    stmt = (
+        select(
+            Visit.id.label("id"),
+            Visit.note_date.label("note_date"),
+            Visit.note_id.label("note_id"),
+            Visit.note.label("note"),
+            Visit.patient_id.label("patient_id"),
+            Visit.case_id.label("case_id"),
+            Visit.case_description.label("case_description"),
+            Visit.primary_insurance.label("primary_insurance"),
+            Visit.secondary_insurance.label("secondary_insurance"),
+            Visit.diagnosis.label("diagnosis"),
+            Visit.visiting_therapist.label("visiting_therapist"),
+            Visit.first_name.label("first_name"),
+            Visit.last_name.label("last_name"),
+            Visit.visit_uid.label("visit_uid"),
+            Visit.billed.label("billed"),
+            Visit.status_bucket.label("status_bucket"),
+            Patient.met_deductible.label("met_deductible"),
+            BillingStatus.status.label("billing_status"),
+            Visit.ar_amount.label("ar_amount"),
+        )
+        .select_from(Visit)
+        .outerjoin(Patient, Patient.id == Visit.patient_id)
+        .outerjoin(BillingStatus, Visit.billing_id == BillingStatus.id)
+        .where(
+            Visit.hold.is_(False),
+            Visit.note_date == dt,
+            or_(
+                Visit.billed.is_(False),
+                and_(Visit.billed.is_(True), BillingStatus.status.in_(list(BILLED_BUCKETS))),
+            ),
+        )
+        .order_by(Visit.patient_id.asc(), Visit.note_id.asc())
+    )
+
+    rows = (await db.execute(stmt)).mappings().all()
+
+    counts = {k: 0 for k in SUMMARY_KEYS}
+    ar_total = Decimal(0)
+    unbilled: List[dict] = []
+    by_status: dict[str, List[dict]] = {s: [] for s in BILLED_BUCKETS}
+
+    for r in rows:
+        first = (r.get("first_name") or "").strip()
+        last = (r.get("last_name") or "").strip()
+
+        if r.get("billed") is False:
+            bucket = r.get("status_bucket")
+            if bucket in counts:
+                counts[bucket] += 1
+            ar_total += r.get("ar_amount") or 0
+            unbilled.append(
+                {
+                    "id": r.get("id"),
+                    "note_date": r.get("note_date"),
+                    "note_id": r.get("note_id"),
+                    "note": r.get("note") or "",
+                    "patient_id": r.get("patient_id"),
+                    "case_id": r.get("case_id"),
+                    "case_description": r.get("case_description") or "",
+                    "primary_insurance": r.get("primary_insurance") or "",
+                    "secondary_insurance": r.get("secondary_insurance") or "",
+                    "diagnosis": r.get("diagnosis") or "",
+                    "visiting_therapist": r.get("visiting_therapist") or "",
+                    "full_name": f"{first} {last}".strip(),
+                    "visit_uid": r.get("visit_uid") or "",
+                    "met_deductible": (
+                        bool(r.get("met_deductible")) if r.get("met_deductible") is not None else None
+                    ),
+                    "statusBucket": bucket,
+                    "arBucket": "ar",
+                }
+            )
+            continue
+
+        status = r.get("billing_status")
+        count_key, status_bucket = BILLED_BUCKETS[status]
+        counts[count_key] += 1
+        by_status[status].append(
+            {
+                "id": r.get("id"),
+                "note_date": r.get("note_date"),
+                "note_id": r.get("note_id"),
+                "patient_id": r.get("patient_id"),
+                "primary_insurance": r.get("primary_insurance") or "",
+                "visiting_therapist": r.get("visiting_therapist") or "",
+                "full_name": f"{first}, {last}".strip(", "),
+                "visit_uid": r.get("visit_uid") or "",
+                "statusBucket": status_bucket,
+                "arBucket": "ar",
+            }
+        )
+
+    counts["ar"] = ar_total
+
+    # Paid/denied/... are per matched invoice, not per listed row
+    counts.update(await invoice_counts_for_day(db, dt))
+
+    visits = unbilled
+    for status in BILLED_BUCKETS:
+        visits += by_status[status]
+
+    return counts, visits
+
+
+if __name__ == "__main__":
+    async def _test():
+        async with SessionLocal() as db:
+            counts, visits = await fetch_day_summary(db, date(2026, 1, 5))
+        print(counts)
+        print(f"rows={len(visits)}")
+
+    asyncio.run(_test())
@@ -2,10 +2,11 @@ from __future__ import annotations
 
 from datetime import date
 from calendar import monthrange
-from typing import Dict
+from typing import Dict, Optional
 import asyncio
+import re
 
-from sqlalchemy import select, func, extract, case
+from sqlalchemy import select, func, extract, literal_column, Numeric
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import SessionLocal
@@ -13,22 +14,91 @@ from app.models.visits import Visit
 
 
 # ----------------------------
-# AR RATE RULES
+# AR RATE RULES (payer_rates)
 # ----------------------------
-def ar_rate_case():
+DEFAULT_PAYER_KEY = "*"
+
+
+def normalize_payer_key(name: Optional[str]) -> str:
+    """Python twin of payer_key_expr(): lower-case, trimmed, single spaces."""
+    return re.sub(r"\s+", " ", (name or "").strip()).lower()
+
+
+def payer_key_expr(col=None):
+    """lower(btrim(regexp_replace(primary_insurance, '\\s+', ' ', 'g')))"""
+    col = Visit.primary_insurance if col is None else col
+    return func.lower(func.btrim(func.regexp_replace(func.coalesce(col, ""), r"\s+", " ", "g")))
+
+
+# visits.cpt_code holds "code(units)" entries, e.g. "97110(2), 97112(1)";
+# a bare code counts as one unit.
+_ENTRIES_SQL = r"""
+    SELECT substring(btrim(part) from '^([A-Za-z0-9]+)') AS code,
+           COALESCE(CAST(substring(btrim(part) from '\((\d+)\)$') AS integer), 1) AS units
+    FROM regexp_split_to_table(visits.cpt_code, ',') AS part
+    WHERE btrim(part) <> ''
+"""
+
+# Rate rows in effect on the visit's note_date for its payer or "*"
+_RATES_IN_EFFECT_SQL = r"""
+    SELECT pr.cpt_code, pr.rate_per_visit, pr.rate_per_unit
+    FROM payer_rates pr
+    WHERE pr.payer_key IN (
+              lower(btrim(regexp_replace(COALESCE(visits.primary_insurance, ''), '\s+', ' ', 'g'))),
+              '*'
+          )
+      AND pr.effective_from <= COALESCE(visits.note_date, CURRENT_DATE)
+      AND (pr.effective_to IS NULL OR pr.effective_to >= COALESCE(visits.note_date, CURRENT_DATE))
+"""
+
+# Exact payer over "*", exact CPT over any-CPT, latest start, newest row
+_RATE_ORDER_SQL = """
+    ORDER BY (pr.payer_key = '*'), (pr.cpt_code IS NULL), pr.effective_from DESC, pr.id DESC
+    LIMIT 1
+"""
+
+_AR_AMOUNT_SQL = f"""(
+    SELECT CASE
+        WHEN priced.any_cpt THEN priced.amount
+        ELSE base.rate_per_visit + COALESCE(base.rate_per_unit, 0) * COALESCE(visits.total_units, 0)
+    END
+    FROM (
+        SELECT bool_or(r.cpt_code IS NOT NULL) AS any_cpt,
+               sum(
+                   CASE WHEN r.cpt_code IS NOT NULL THEN r.rate_per_visit ELSE 0 END
+                   + COALESCE(r.rate_per_unit, 0) * e.units
+               ) AS amount
+        FROM ({_ENTRIES_SQL}) AS e
+        LEFT JOIN LATERAL (
+            {_RATES_IN_EFFECT_SQL}
+              AND (pr.cpt_code IS NULL OR pr.cpt_code = e.code)
+            {_RATE_ORDER_SQL}
+        ) AS r ON true
+    ) AS priced
+    LEFT JOIN LATERAL (
+        {_RATES_IN_EFFECT_SQL}
+          AND pr.cpt_code IS NULL
+        {_RATE_ORDER_SQL}
+    ) AS base ON true
+)"""
+
+
+def ar_amount_expr():
     """
-    primary_insurance:
-      americare = 110
-      'royal care', 'extendedcare', 'able health' = 105
-      any other (including NULL/blank) = 104
+    Correlated lookup of the visit's AR in payer_rates, at the rates
+    effective on its note_date. Each code(units) entry of visits.cpt_code
+    takes its most specific row (exact payer over "*", its own CPT over
+    any-CPT, latest effective_from, then newest row):
+
+      - entry with its own CPT row: rate_per_visit + rate_per_unit x entry units
+      - otherwise: the any-CPT row's rate_per_unit x entry units
+
+    When no entry has a CPT row, the visit gets the any-CPT row as a whole:
+    rate_per_visit + rate_per_unit x total_units. Written to
+    visits.ar_amount by refresh_visit_derived_fields, so aggregates never
+    evaluate it per read. Only valid inside statements on visits.
     """
-    ins = func.lower(func.trim(Visit.primary_insurance))
-
-    return case(
-        (ins == "americare", 110),
-        (ins.in_(["royal care", "extendedcare", "able health"]), 105),
-        else_=104,
-    )
+    return literal_column(_AR_AMOUNT_SQL, Numeric(10, 2))
 
 
 # ----------------------------
@@ -41,12 +111,11 @@ async def calculate_ar_by_month(
     end_date = date(year + 1, 1, 1)
 
     month_expr = extract("month", Visit.note_date)
-    ar_expr = ar_rate_case()
 
     stmt = (
         select(
             month_expr.label("month"),
-            func.sum(ar_expr).label("ar"),
+            func.sum(Visit.ar_amount).label("ar"),
         )
         .where(
             Visit.billed.is_(False),
@@ -63,7 +132,7 @@ async def calculate_ar_by_month(
 
     monthly_ar: Dict[int, int] = {m: 0 for m in range(1, 13)}
     for month, ar in rows:
-        monthly_ar[int(month)] = int(ar or 0)
+        monthly_ar[int(month)] = int(round(ar or 0))
 
     return monthly_ar
 
@@ -75,12 +144,11 @@ async def calculate_ar_by_day(
     end_date = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
 
     day_expr = extract("day", Visit.note_date)
-    ar_expr = ar_rate_case()
 
     stmt = (
         select(
             day_expr.label("day"),
-            func.sum(ar_expr).label("ar"),
+            func.sum(Visit.ar_amount).label("ar"),
         )
         .where(
             Visit.billed.is_(False),
@@ -98,7 +166,7 @@ async def calculate_ar_by_day(
     days_in_month = monthrange(year, month)[1]
     daily_ar: Dict[int, int] = {d: 0 for d in range(1, days_in_month + 1)}
     for day, ar in rows:
-        daily_ar[int(day)] = int(ar or 0)
+        daily_ar[int(day)] = int(round(ar or 0))
 
     return daily_ar
 
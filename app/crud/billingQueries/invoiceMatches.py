@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Iterable, Optional
+import asyncio
+
+from sqlalchemy import select, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import SessionLocal
+from app.models.visits import Visit
+from app.models.visit_invoice_matches import VisitInvoiceMatch
+from app.crud.billingQueries.calendarSummary import stat_value
+
+
+INVOICE_SUMMARY_KEYS = ("paid", "denied", "reconciled", "issues", "paid_amount")
+
+# Outcome of one millin_invoices row (alias m)
+_PAID = "COALESCE(m.payment_summary, 0) > 0"
+_DENIED = (
+    f"NOT ({_PAID}) AND ("
+    "lower(COALESCE(m.final_invoice_status, '')) LIKE '%deni%' "
+    "OR lower(COALESCE(m.invoice_status_description, '')) LIKE '%deni%')"
+)
+_RECONCILED = f"({_PAID}) AND COALESCE(m.invoice_balance, 0) = 0"
+_HAS_ISSUE = "NULLIF(btrim(m.issue_tracker_status), '') IS NOT NULL"
+
+
+def _scope_sql(patient_ids: Optional[list[int]], note_ids: Optional[list[int]]) -> str:
+    if note_ids is not None:
+        return "v.note_id = ANY(:note_ids)"
+    if patient_ids is not None:
+        return "v.patient_id = ANY(:patient_ids)"
+    return "TRUE"
+
+
+async def refresh_invoice_matches(
+    db: AsyncSession,
+    patient_ids: Optional[Iterable[int]] = None,
+    note_ids: Optional[Iterable[int]] = None,
+) -> dict:
+    """
+    Re-match visits to millin_invoices on patient_id + date_of_service.
+
+      - note_ids: visits just inserted
+      - patient_ids: patients whose invoices were just uploaded
+      - neither: every visit
+
+    When several invoices cover one visit the latest invoice_date wins.
+    Only rows whose match or outcome changes are written, so the
+    billing_day_stats trigger only marks dates that really moved.
+    Does not commit. Returns counts plus the touched note_dates.
+    """
+    params: dict = {}
+    if note_ids is not None:
+        params["note_ids"] = sorted({int(n) for n in note_ids if n is not None})
+        if not params["note_ids"]:
+            return {"matched": 0, "removed": 0, "note_dates": []}
+        note_ids = params["note_ids"]
+    elif patient_ids is not None:
+        params["patient_ids"] = sorted({int(p) for p in patient_ids if p is not None})
+        if not params["patient_ids"]:
+            return {"matched": 0, "removed": 0, "note_dates": []}
+        patient_ids = params["patient_ids"]
+
+    scope = _scope_sql(patient_ids, note_ids)
+
+    upserted = await db.execute(
+        text(f"""
+            INSERT INTO visit_invoice_matches AS x
+                (visit_id, invoice_id, patient_id, note_date,
+                 paid, denied, reconciled, has_issue, paid_amount, matched_at)
+            SELECT DISTINCT ON (v.id)
+                v.id, m.id, v.patient_id, v.note_date,
+                {_PAID}, {_DENIED}, {_RECONCILED}, {_HAS_ISSUE},
+                COALESCE(m.payment_summary, 0), now()
+            FROM visits v
+            JOIN millin_invoices m
+              ON m.patient_id = v.patient_id
+             AND m.date_of_service = v.note_date
+            WHERE {scope}
+            ORDER BY v.id, m.invoice_date DESC NULLS LAST, m.id DESC
+            ON CONFLICT (visit_id) DO UPDATE SET
+                invoice_id = EXCLUDED.invoice_id,
+                patient_id = EXCLUDED.patient_id,
+                note_date = EXCLUDED.note_date,
+                paid = EXCLUDED.paid,
+                denied = EXCLUDED.denied,
+                reconciled = EXCLUDED.reconciled,
+                has_issue = EXCLUDED.has_issue,
+                paid_amount = EXCLUDED.paid_amount,
+                matched_at = EXCLUDED.matched_at
+            WHERE (x.invoice_id, x.patient_id, x.note_date, x.paid, x.denied,
+                   x.reconciled, x.has_issue, x.paid_amount)
+               IS DISTINCT FROM
+                  (EXCLUDED.invoice_id, EXCLUDED.patient_id, EXCLUDED.note_date, EXCLUDED.paid,
+                   EXCLUDED.denied, EXCLUDED.reconciled, EXCLUDED.has_issue, EXCLUDED.paid_amount)
+            RETURNING x.note_date
+        """),
+        params,
+    )
+    matched_dates = [r[0] for r in upserted.all()]
+
+    # Visits in scope that no longer have any invoice on their date
+    removed = await db.execute(
+        text(f"""
+            DELETE FROM visit_invoice_matches x
+            USING visits v
+            WHERE x.visit_id = v.id
+              AND {scope}
+              AND NOT EXISTS (
+                  SELECT 1 FROM millin_invoices m
+                  WHERE m.patient_id = v.patient_id
+                    AND m.date_of_service = v.note_date
+              )
+            RETURNING x.note_date
+        """),
+        params,
+    )
+    removed_dates = [r[0] for r in removed.all()]
+
+    return {
+        "matched": len(matched_dates),
+        "removed": len(removed_dates),
+        "note_dates": sorted({d for d in matched_dates + removed_dates if d is not None}),
+    }
+
+
+async def invoice_counts_for_day(db: AsyncSession, dt: date) -> dict[str, int]:
+    """INVOICE_SUMMARY_KEYS for hold=false visits on one note_date."""
+    M = VisitInvoiceMatch
+    row = (
+        await db.execute(
+            select(
+                func.count().filter(M.paid.is_(True)).label("paid"),
+                func.count().filter(M.denied.is_(True)).label("denied"),
+                func.count().filter(M.reconciled.is_(True)).label("reconciled"),
+                func.count().filter(M.has_issue.is_(True)).label("issues"),
+                func.sum(M.paid_amount).label("paid_amount"),
+            )
+            .select_from(M)
+            .join(Visit, Visit.id == M.visit_id)
+            .where(M.note_date == dt, Visit.hold.is_(False))
+        )
+    ).mappings().one()
+    return {k: stat_value(k, row[k]) for k in INVOICE_SUMMARY_KEYS}
+
+
+if __name__ == "__main__":
+    async def _run():
+        async with SessionLocal() as db:
+            result = await refresh_invoice_matches(db)
+            await db.commit()
+        print(f"✅ Invoice matches: matched={result['matched']} removed={result['removed']} "
+              f"dates={len(result['note_dates'])}")
+
+    asyncio.run(_run())
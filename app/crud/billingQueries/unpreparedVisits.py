@@ -1,20 +1,43 @@
 from __future__ import annotations
 
 import asyncio
+import base64
+import json
 import re
-from calendar import monthrange
 from datetime import date
 from typing import List
 
-from sqlalchemy import and_, case, extract, func, or_, select, false, not_
+from sqlalchemy import and_, case, cast, extract, func, literal_column, or_, select, false, not_, null, String
+from sqlalchemy.dialects.postgresql import ARRAY, array
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import SessionLocal
 from app.models.patients import Patient
 from app.models.visits import Visit
+from app.models.billing_day_stats import BillingDayStats
 
 BUCKETS = ("unprepared", "held_for_deductible", "ready_to_bill")
 
+# /billing/unprepared keyset: NULL keys sort where Postgres puts NULLs by
+# default (dates first under DESC, ids last under ASC). Same literals as
+# ix_visits_unprepared_keyset.
+KEYSET_NULL_DATE = date(9999, 12, 31)
+KEYSET_NULL_ID = 9223372036854775807
+
+
+def unprepared_keyset_columns():
+    """
+    (note_date, patient_id, note_id) with NULLs replaced by the sentinels.
+    Inlined literals, not binds, so the expressions match the index.
+    """
+    null_date = literal_column(f"DATE '{KEYSET_NULL_DATE.isoformat()}'")
+    null_id = literal_column(str(KEYSET_NULL_ID))
+    return (
+        func.coalesce(Visit.note_date, null_date),
+        func.coalesce(Visit.patient_id, null_id),
+        func.coalesce(Visit.note_id, null_id),
+    )
+
 
 # Put your actual disallowed diagnosis values here (exact matches)
 DISALLOWED_DIAGNOSES = [
@@ -126,13 +149,38 @@ def passes_abc_expr():
 
     return and_(primary_ok, secondary_ok, diagnosis_ok)
 
-def status_bucket_expr():
+def issue_keys_expr():
+    """SQL twin of detect_visit_issue_keys(): text[] of failing ISSUE_LABELS keys."""
+    primary = func.trim(func.coalesce(Visit.primary_insurance, ""))
+    secondary = func.trim(func.coalesce(Visit.secondary_insurance, ""))
+    diag = func.trim(func.coalesce(Visit.diagnosis, ""))
+    medical_diag = func.trim(func.coalesce(Visit.medical_diagnosis, ""))
+
+    keys = array([
+        case((or_(primary == "", not_(primary.contains("|"))), "primary_insurance")),
+        case((and_(secondary != "", not_(secondary.contains("|"))), "secondary_insurance")),
+        case(
+            (diag == "", "diagnosis"),
+            (diagnosis_has_any_blocked_code_expr(), "diagnosis_blocked_code"),
+        ),
+        case((medical_diag == "", "medical_diagnosis")),
+    ])
+    return cast(func.array_remove(keys, null()), ARRAY(String(50)))
+
+
+def status_bucket_case(met_deductible=None):
     """
     Buckets:
       - unprepared: fails A/B/C
       - ready_to_bill: passes A/B/C AND (note_date year < 2026 OR patient.met_deductible = true)
       - held_for_deductible: passes A/B/C AND note_date year >= 2026 AND patient.met_deductible is not true
+
+    met_deductible defaults to Patient.met_deductible (caller joins patients);
+    pass a scalar subquery where a join isn't possible (UPDATE).
     """
+    if met_deductible is None:
+        met_deductible = Patient.met_deductible
+
     passes_abc = passes_abc_expr()
     note_year = extract("year", Visit.note_date)
 
@@ -144,93 +192,12 @@ def status_bucket_expr():
         (note_year < 2026, "ready_to_bill"),
 
         # passes A/B/C AND note_date year >= 2026 AND met_deductible true
-        (Patient.met_deductible.is_(True), "ready_to_bill"),
+        (met_deductible.is_(True), "ready_to_bill"),
 
         # otherwise (passes A/B/C, year >= 2026, not met) => held
         else_="held_for_deductible",
-    ).label("status_bucket")
-
-
-async def count_visits_by_month_three_buckets(db: AsyncSession, year: int) -> dict[int, dict[str, int]]:
-    start_date = date(year, 1, 1)
-    end_date = date(year + 1, 1, 1)
-
-    month_expr = extract("month", Visit.note_date).label("month")
-    bucket = status_bucket_expr()
-
-    stmt = (
-        select(
-            month_expr,
-            bucket,
-            func.count().label("count"),
-        )
-        .select_from(Visit)
-        .outerjoin(Patient, Patient.id == Visit.patient_id)
-        .where(
-            Visit.billed.is_(False),
-            Visit.hold.is_(False),
-            Visit.note_date >= start_date,
-            Visit.note_date < end_date,
-        )
-        .group_by(month_expr, bucket)
-        .order_by(month_expr, bucket)
     )
 
-    result = await db.execute(stmt)
-    rows = result.all()
-
-    out: dict[int, dict[str, int]] = {
-        m: {b: 0 for b in BUCKETS} for m in range(1, 13)
-    }
-
-    for month, bucket_name, count in rows:
-        out[int(month)][str(bucket_name)] = int(count)
-
-    return out
-
-
-
-async def count_visits_by_day_three_buckets(
-    db: AsyncSession,
-    year: int,
-    month: int,
-) -> dict[int, dict[str, int]]:
-    start_date = date(year, month, 1)
-    end_date = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
-
-    day_expr = extract("day", Visit.note_date).label("day")
-    bucket = status_bucket_expr()
-
-    stmt = (
-        select(
-            day_expr,
-            bucket,
-            func.count().label("count"),
-        )
-        .select_from(Visit)
-        .outerjoin(Patient, Patient.id == Visit.patient_id)
-        .where(
-            Visit.billed.is_(False),
-            Visit.hold.is_(False),
-            Visit.note_date >= start_date,
-            Visit.note_date < end_date,
-        )
-        .group_by(day_expr, bucket)
-        .order_by(day_expr, bucket)
-    )
-
-    result = await db.execute(stmt)
-    rows = result.all()
-
-    dim = monthrange(year, month)[1]
-    out: dict[int, dict[str, int]] = {
-        d: {b: 0 for b in BUCKETS} for d in range(1, dim + 1)
-    }
-
-    for day, bucket_name, count in rows:
-        out[int(day)][str(bucket_name)] = int(count)
-
-    return out
 
 async def fetch_visits_for_day_three_buckets(db: AsyncSession, dt: date) -> List[dict]:
     """
@@ -239,7 +206,7 @@ async def fetch_visits_for_day_three_buckets(db: AsyncSession, dt: date) -> List
     - ready_to_bill: passes A/B/C AND (year(note_date) < 2026 OR patient.met_deductible = true)
     - held_for_deductible: passes A/B/C AND year(note_date) >= 2026 AND patient.met_deductible is not true
     """
-    bucket_expr = status_bucket_expr()
+    bucket_expr = Visit.status_bucket.label("status_bucket")
 
     stmt = (
         select(
@@ -313,35 +280,111 @@ async def fetch_visits_for_day_three_buckets(db: AsyncSession, dt: date) -> List
     return out
 
 
+def encode_unprepared_cursor(note_date: date, patient_id: int, note_id: int) -> str:
+    raw = json.dumps({"d": note_date.isoformat(), "p": int(patient_id), "n": int(note_id)})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_unprepared_cursor(cursor: str) -> tuple[date, int, int]:
+    """Raises ValueError on a malformed token."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        return date.fromisoformat(data["d"]), int(data["p"]), int(data["n"])
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+async def count_unprepared_from_stats(
+    db: AsyncSession,
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> int:
+    """
+    Unprepared total summed from billing_day_stats (a few hundred rows, not
+    visits). billing_day_stats is keyed by note_date, so undated unprepared
+    visits are counted separately when no date range is given (the list
+    includes them then).
+
+    Read-only (safe inside run_concurrently): drain the dirty outbox with
+    refresh_dirty_billing_day_stats first for an up-to-date total.
+    """
+    stmt = select(func.coalesce(func.sum(BillingDayStats.unprepared), 0))
+    if start_date is not None:
+        stmt = stmt.where(BillingDayStats.note_date >= start_date)
+    if end_date is not None:
+        stmt = stmt.where(BillingDayStats.note_date <= end_date)
+    total = int((await db.execute(stmt)).scalar_one() or 0)
+
+    if start_date is None and end_date is None:
+        undated = (
+            select(func.count())
+            .select_from(Visit)
+            .where(
+                Visit.billed.is_(False),
+                Visit.hold.is_(False),
+                Visit.status_bucket == "unprepared",
+                Visit.note_date.is_(None),
+            )
+        )
+        total += int((await db.execute(undated)).scalar_one() or 0)
+    return total
+
+
 async def fetch_all_unprepared_visits(
     db: AsyncSession,
     start_date: date | None = None,
     end_date: date | None = None,
     limit: int = 500,
     offset: int = 0,
-) -> tuple[List[dict], int]:
+    cursor: str | None = None,
+    include_total: bool = True,
+) -> tuple[List[dict], int | None, str | None]:
     """
     Fetch all visits currently in the "unprepared" bucket (fails A/B/C),
     optionally filtered by date range.
+
+    Paging is keyset on (note_date desc, patient_id, note_id): pass the
+    returned next_cursor back to get the following page, so deep pages cost
+    the same as the first. Missing keys are compared as the KEYSET_NULL_*
+    sentinels, so visits without a date, patient or note id are still
+    listed. A non-zero offset without a cursor still uses OFFSET/LIMIT for
+    older clients.
+
+    The total comes from billing_day_stats, not a count over visits, and is
+    skipped (None) when include_total is False. Does not drain the stats
+    outbox (that commits); callers wanting an up-to-date total run
+    refresh_dirty_billing_day_stats first.
     """
-    bucket_expr = status_bucket_expr()
     filters = [
         Visit.billed.is_(False),
         Visit.hold.is_(False),
-        bucket_expr == "unprepared",
+        Visit.status_bucket == "unprepared",
     ]
     if start_date is not None:
         filters.append(Visit.note_date >= start_date)
     if end_date is not None:
         filters.append(Visit.note_date <= end_date)
 
-    count_stmt = (
-        select(func.count())
-        .select_from(Visit)
-        .outerjoin(Patient, Patient.id == Visit.patient_id)
-        .where(*filters)
-    )
-    total = int((await db.execute(count_stmt)).scalar_one())
+    key_date, key_patient, key_note = unprepared_keyset_columns()
+    if cursor:
+        c_date, c_patient, c_note = decode_unprepared_cursor(cursor)
+        filters.append(
+            or_(
+                key_date < c_date,
+                and_(
+                    key_date == c_date,
+                    or_(
+                        key_patient > c_patient,
+                        and_(key_patient == c_patient, key_note > c_note),
+                    ),
+                ),
+            )
+        )
+
+    total = None
+    if include_total:
+        total = await count_unprepared_from_stats(db, start_date, end_date)
 
     data_stmt = (
         select(
@@ -368,29 +411,42 @@ async def fetch_all_unprepared_visits(
             Visit.last_name.label("last_name"),
             Visit.visit_uid.label("visit_uid"),
             Patient.met_deductible.label("met_deductible"),
-            bucket_expr,
+            Visit.issue_keys.label("issue_keys"),
+            key_date.label("key_date"),
+            key_patient.label("key_patient"),
+            key_note.label("key_note"),
         )
         .select_from(Visit)
         .outerjoin(Patient, Patient.id == Visit.patient_id)
         .where(*filters)
-        .order_by(Visit.note_date.desc(), Visit.patient_id.asc(), Visit.note_id.asc())
-        .offset(offset)
-        .limit(limit)
+        .order_by(key_date.desc(), key_patient.asc(), key_note.asc())
+        .limit(limit + 1)
     )
+    if offset and not cursor:
+        data_stmt = data_stmt.offset(offset)
 
     rows = (await db.execute(data_stmt)).mappings().all()
 
+    # One extra row tells us whether there is a next page
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_unprepared_cursor(last["key_date"], last["key_patient"], last["key_note"])
+
     out: List[dict] = []
     for r in rows:
         first = (r.get("first_name") or "").strip()
         last = (r.get("last_name") or "").strip()
         full_name = f"{first} {last}".strip()
-        issue_keys = detect_visit_issue_keys(
-            primary_insurance=r.get("primary_insurance"),
-            secondary_insurance=r.get("secondary_insurance"),
-            diagnosis=r.get("diagnosis"),
-            medical_diagnosis=r.get("medical_diagnosis"),
-        )
+        issue_keys = r.get("issue_keys")
+        if issue_keys is None:
+            issue_keys = detect_visit_issue_keys(
+                primary_insurance=r.get("primary_insurance"),
+                secondary_insurance=r.get("secondary_insurance"),
+                diagnosis=r.get("diagnosis"),
+                medical_diagnosis=r.get("medical_diagnosis"),
+            )
         issue_labels = [ISSUE_LABELS[k] for k in issue_keys if k in ISSUE_LABELS]
         out.append(
             {
@@ -425,14 +481,16 @@ async def fetch_all_unprepared_visits(
             }
         )
 
-    return out, total
+    return out, total, next_cursor
 
 
 async def main():
+    from app.crud.billingQueries.billingDayStats import read_year_by_month
+
     year = 2026
 
     async with SessionLocal() as db:
-        monthly = await count_visits_by_month_three_buckets(db, year)
+        monthly = await read_year_by_month(db, year)
 
         dt = date(2025, 11, 15)
         visits = await fetch_visits_for_day_three_buckets(db, dt)
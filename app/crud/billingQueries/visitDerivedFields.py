@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from typing import Iterable, Optional
+import asyncio
+
+from sqlalchemy import select, update, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import SessionLocal
+from app.models.patients import Patient
+from app.models.visits import Visit
+from app.crud.billingQueries.unpreparedVisits import (
+    passes_abc_expr,
+    issue_keys_expr,
+    status_bucket_case,
+)
+from app.crud.billingQueries.getUnproccessedAR import ar_amount_expr
+
+
+async def refresh_visit_derived_fields(
+    db: AsyncSession,
+    note_ids: Optional[Iterable[int]] = None,
+    patient_ids: Optional[Iterable[int]] = None,
+) -> int:
+    """
+    Recompute visits.passes_abc / issue_keys / status_bucket / ar_amount in SQL.
+
+      - note_ids: visits just inserted or edited
+      - patient_ids: visits of patients whose met_deductible (or row) changed
+      - neither: every visit that has never been computed (status_bucket IS NULL)
+
+    Only rows whose values actually change are written. Does not commit.
+    """
+    met_deductible = (
+        select(Patient.met_deductible)
+        .where(Patient.id == Visit.patient_id)
+        .scalar_subquery()
+    )
+    passes_abc = passes_abc_expr()
+    issue_keys = issue_keys_expr()
+    bucket = status_bucket_case(met_deductible)
+    ar_amount = ar_amount_expr()
+
+    stmt = update(Visit).values(
+        passes_abc=passes_abc,
+        issue_keys=issue_keys,
+        status_bucket=bucket,
+        ar_amount=ar_amount,
+    )
+
+    if note_ids is not None:
+        ids = [int(n) for n in note_ids if n is not None]
+        if not ids:
+            return 0
+        stmt = stmt.where(Visit.note_id.in_(ids))
+    elif patient_ids is not None:
+        ids = [int(p) for p in patient_ids if p is not None]
+        if not ids:
+            return 0
+        stmt = stmt.where(Visit.patient_id.in_(ids))
+    else:
+        stmt = stmt.where(Visit.status_bucket.is_(None))
+
+    stmt = stmt.where(
+        or_(
+            Visit.passes_abc.is_distinct_from(passes_abc),
+            Visit.issue_keys.is_distinct_from(issue_keys),
+            Visit.status_bucket.is_distinct_from(bucket),
+            Visit.ar_amount.is_distinct_from(ar_amount),
+        )
+    ).execution_options(synchronize_session=False)
+
+    result = await db.execute(stmt)
+    return int(result.rowcount or 0)
+
+
+if __name__ == "__main__":
+    async def _run():
+        async with SessionLocal() as db:
+            n = await refresh_visit_derived_fields(db)
+            await db.commit()
+        print(f"✅ Computed derived fields for {n} visits")
+
+    asyncio.run(_run())
@@ -0,0 +1,66 @@
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.hellonote_backfill import HelloNoteBackfillShard
+
+
+async def get_done_shards(db: AsyncSession, job_name: str) -> set[tuple[date, date]]:
+    """(shard_start, shard_end) pairs already completed for this job."""
+    result = await db.execute(
+        select(HelloNoteBackfillShard.shard_start, HelloNoteBackfillShard.shard_end).where(
+            HelloNoteBackfillShard.job_name == job_name,
+            HelloNoteBackfillShard.status == "done",
+        )
+    )
+    return {(r[0], r[1]) for r in result.all()}
+
+
+async def mark_shard(
+    db: AsyncSession,
+    job_name: str,
+    shard_start: date,
+    shard_end: date,
+    status: str,
+    started_at: Optional[datetime] = None,
+    fetched_count: int = 0,
+    inserted_count: int = 0,
+    skipped_count: int = 0,
+    error: Optional[str] = None,
+) -> None:
+    """
+    Upsert the checkpoint row for one shard. attempts counts every finished
+    try (done or failed). Does not commit.
+    """
+    values = {
+        "job_name": job_name,
+        "shard_start": shard_start,
+        "shard_end": shard_end,
+        "status": status,
+        "attempts": 1,
+        "fetched_count": fetched_count,
+        "inserted_count": inserted_count,
+        "skipped_count": skipped_count,
+        "error": error,
+        "started_at": started_at,
+        "finished_at": datetime.now(),
+    }
+    stmt = insert(HelloNoteBackfillShard).values(values)
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_hellonote_backfill_shard",
+        set_={
+            "status": stmt.excluded.status,
+            "attempts": HelloNoteBackfillShard.attempts + 1,
+            "fetched_count": stmt.excluded.fetched_count,
+            "inserted_count": stmt.excluded.inserted_count,
+            "skipped_count": stmt.excluded.skipped_count,
+            "error": stmt.excluded.error,
+            "started_at": stmt.excluded.started_at,
+            "finished_at": stmt.excluded.finished_at,
+            "updated_at": datetime.now(),
+        },
+    )
+    await db.execute(stmt)
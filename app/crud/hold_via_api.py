@@ -1,147 +1,128 @@
 import os
 import json
-import math
-import requests
-import pandas as pd
-import psycopg2
-from dotenv import load_dotenv
-from app.helloNoteApi.transaction_report_request import fetch_hellonote_visits_raw, send_webhook
+import asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.helloNoteApi.transaction_report_request import send_webhook
 
 
-# -----------------------------------------------------------
-# DB CONFIG
-# -----------------------------------------------------------
-DB_HOST = "localhost"
-DB_PORT = 5432
-DB_NAME = "payroll_tool"
-DB_USER = "postgres"
-DB_PASS = "Anchor2025"
-
 SCRIPT_NAME = os.path.basename(__file__)
 
-# Load webhook
-env_path = os.path.join(os.path.dirname(__file__), "../../.env")
-load_dotenv(dotenv_path=env_path)
-POWER_AUTOMATE_URL = os.getenv("POWER_AUTOMATE_URL")
-
 
 # -----------------------------------------------------------
-# Fetch ONLY HOLD visits, but keep all original arguments
+# Hold states from an isAllStatusWithHold crawl
 # -----------------------------------------------------------
-def fetch_hold_visits(
-    date_from: str,
-    date_to: str,
-    isFinalizedDate: bool = False,
-    isNoteDate: bool = False,
-    isAllStatus: bool = False,
-    isAllStatusWithHold: bool = False,
-) -> pd.DataFrame:
-
-    stage = "fetch_hold_visits"
-
-    try:
-        print(f"📄 Getting HOLD count for {date_from} - {date_to}...")
-
-        # Always force HOLD = True (your requirement)
-        preview = fetch_hellonote_visits_raw(
-            dateFrom=date_from,
-            dateTo=date_to,
-            skipCount=0,
-            amount=1,
-            isHold=True,                 # 🔥 forced TRUE
-            isFinalizedDate=isFinalizedDate,
-            isNoteDate=isNoteDate,
-            isAllStatus=isAllStatus,
-            isAllStatusWithHold=isAllStatusWithHold,
-        )
-
-        total_count = preview.get("result", {}).get("totalCount", 0)
-        if total_count == 0:
-            print("⚠️ No HOLD records found.")
-            send_webhook("success", stage, f"No HOLD records found for {date_from}-{date_to}.")
-            return pd.DataFrame()
-
-        print(f"✅ Found {total_count} HOLD visits.")
-        send_webhook("success", stage, f"Found {total_count} HOLD visits to download.")
-
-        master_list = []
-        per_page = 25
-        pages = math.ceil(total_count / per_page)
-
-        for page in range(pages):
-            skip = page * per_page
-            print(f"➡️ Fetching page {page + 1}/{pages} (skip={skip})...")
-
-            chunk = fetch_hellonote_visits_raw(
-                dateFrom=date_from,
-                dateTo=date_to,
-                skipCount=skip,
-                amount=per_page,
-                isHold=True,                 # 🔥 forced TRUE on every page
-                isFinalizedDate=isFinalizedDate,
-                isNoteDate=isNoteDate,
-                isAllStatus=isAllStatus,
-                isAllStatusWithHold=isAllStatusWithHold,
-            )
-
-            items = chunk.get("result", {}).get("items", [])
-            master_list.extend(items)
-
-        df = pd.DataFrame(master_list)
-        print(f"🧾 Final DataFrame shape: {df.shape}")
-        send_webhook("success", stage, f"Downloaded {len(df)} HOLD visits.")
-
-        return df
-
-    except Exception as e:
-        msg = f"Failed during {stage}: {e}"
-        print(f"❌ {msg}")
-        send_webhook("error", stage, msg)
-        raise
+def hold_states_from_items(items: list[dict]) -> dict[int, bool]:
+    """
+    {note_id: hold} for every item in a crawl. Because the crawl includes
+    held AND un-held notes, a False here means the hold was cleared.
+    """
+    states: dict[int, bool] = {}
+    for it in items:
+        note_id = it.get("noteId")
+        if note_id is None:
+            continue
+        try:
+            # str() so numpy bools / NaN from a DataFrame round-trip behave
+            states[int(note_id)] = str(it.get("hold")).strip().lower() in ("true", "1")
+        except (TypeError, ValueError):
+            continue
+    return states
 
 
 # -----------------------------------------------------------
-# Update DB: mark hold = TRUE by note_id
+# Set-based reconcile: temp table + one UPDATE each way
 # -----------------------------------------------------------
-def update_hold_flags(df: pd.DataFrame):
-    if df.empty:
-        print("No HOLD visits to update.")
-        return
-
-    print("🔧 Updating database HOLD flags...")
-
-    conn = psycopg2.connect(
-        host=DB_HOST, port=DB_PORT, dbname=DB_NAME,
-        user=DB_USER, password=DB_PASS
+async def reconcile_hold_flags(db: AsyncSession, states: dict[int, bool]) -> dict:
+    """
+    Load the crawl's {note_id: hold} into a temp table, then set and clear
+    visits.hold in two statements. Only rows whose flag actually changes are
+    written. Does not commit (the temp table is dropped on commit).
+    """
+    if not states:
+        return {"seen": 0, "held_in_hellonote": 0, "newly_held": 0, "released": 0, "missing": 0}
+
+    payload = [{"note_id": nid, "hold": held} for nid, held in states.items()]
+
+    await db.execute(text("DROP TABLE IF EXISTS hold_sync"))
+    await db.execute(text("""
+        CREATE TEMP TABLE hold_sync (
+            note_id bigint PRIMARY KEY,
+            hold boolean NOT NULL
+        ) ON COMMIT DROP
+    """))
+    await db.execute(
+        text("""
+            INSERT INTO hold_sync (note_id, hold)
+            SELECT src.note_id, src.hold
+            FROM jsonb_to_recordset(CAST(:payload AS jsonb)) AS src(note_id bigint, hold boolean)
+            ON CONFLICT (note_id) DO NOTHING
+        """),
+        {"payload": json.dumps(payload)},
     )
-    cur = conn.cursor()
 
-    sql = """
-        UPDATE visits
+    newly_held = await db.execute(text("""
+        UPDATE visits v
         SET hold = TRUE
-        WHERE note_id = %s
-    """
-
-    updated = 0
-    missing = 0
-
-    for _, row in df.iterrows():
-        note_id = row.get("noteId")
-        if note_id is None:
-            continue
-
-        cur.execute(sql, (note_id,))
-        if cur.rowcount > 0:
-            updated += cur.rowcount
-        else:
-            missing += 1
+        FROM hold_sync h
+        WHERE v.note_id = h.note_id
+          AND h.hold
+          AND v.hold IS NOT TRUE
+    """))
+
+    released = await db.execute(text("""
+        UPDATE visits v
+        SET hold = FALSE
+        FROM hold_sync h
+        WHERE v.note_id = h.note_id
+          AND NOT h.hold
+          AND v.hold IS TRUE
+    """))
+
+    missing = await db.execute(text("""
+        SELECT count(*)
+        FROM hold_sync h
+        WHERE h.hold
+          AND NOT EXISTS (SELECT 1 FROM visits v WHERE v.note_id = h.note_id)
+    """))
+
+    return {
+        "seen": len(states),
+        "held_in_hellonote": sum(1 for held in states.values() if held),
+        "newly_held": int(newly_held.rowcount or 0),
+        "released": int(released.rowcount or 0),
+        "missing": int(missing.scalar_one() or 0),
+    }
+
+
+async def sync_hold_flags(date_from: str, date_to: str) -> dict:
+    """Crawl HelloNote (held notes included) and reconcile visits.hold."""
+    from app.database import SessionLocal
+    from app.crud.visits_via_api import fetch_all_hellonote_visits
+
+    stage = "sync_hold_flags"
+
+    df = fetch_all_hellonote_visits(
+        date_from=date_from,
+        date_to=date_to,
+        isAllStatus=True,
+        isFinalizedDate=True,
+        isAllStatusWithHold=True,
+    )
+    states = hold_states_from_items(df.to_dict(orient="records")) if not df.empty else {}
 
-    conn.commit()
-    conn.close()
+    async with SessionLocal() as db:
+        result = await reconcile_hold_flags(db, states)
+        await db.commit()
 
-    print(f"✅ Updated {updated} visits.")
-    if missing:
-        print(f"⚠️ Missing {missing} visits (not found in hellonote_visits).")
+    msg = (
+        f"HOLD sync {date_from} - {date_to}: seen={result['seen']}, "
+        f"held={result['held_in_hellonote']}, newly_held={result['newly_held']}, "
+        f"released={result['released']}, missing={result['missing']}"
+    )
+    print(f"✅ {msg}")
+    send_webhook("success", stage, msg)
+    return result
 
 
 # -----------------------------------------------------------
@@ -164,13 +145,4 @@ if __name__ == "__main__":
 
     print(f"Running HOLD sync for {date_from} - {date_to}")
 
-    df = fetch_hold_visits(
-        date_from=date_from,
-        date_to=date_to,
-        isFinalizedDate=False,
-        isNoteDate=False,
-        isAllStatus=False,
-        isAllStatusWithHold=False,
-    )
-
-    update_hold_flags(df)
+    asyncio.run(sync_hold_flags(date_from, date_to))
@@ -4,10 +4,13 @@ from io import BytesIO
 from typing import Any, Dict, List
 
 import pandas as pd
-from sqlalchemy import update
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.patients import Patient
+from app.models.visits import Visit
+from app.crud.billingQueries.visitDerivedFields import refresh_visit_derived_fields
+from app.services.calendar_cache import invalidate_note_dates
 
 
 REQUIRED_COLUMNS = {"patient_id", "Deductible", "QMB"}
@@ -62,7 +65,24 @@ async def import_met_deductible_from_excel_bytes(
     )
 
     result = await db.execute(stmt)
+
+    # Deductible met => their unbilled visits move from held to ready
+    await refresh_visit_derived_fields(db, patient_ids=eligible_ids)
+
+    # Dates whose held/ready split may have moved (only unbilled visits care)
+    touched = await db.execute(
+        select(Visit.note_date)
+        .where(
+            Visit.patient_id.in_(eligible_ids),
+            Visit.billed.is_(False),
+            Visit.note_date.is_not(None),
+        )
+        .distinct()
+    )
+    touched_note_dates = touched.scalars().all()
+
     await db.commit()
+    invalidate_note_dates(touched_note_dates)
 
     updated = int(getattr(result, "rowcount", 0) or 0)
 
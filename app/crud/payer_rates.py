@@ -0,0 +1,144 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Optional
+import asyncio
+
+from sqlalchemy import select, update, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import SessionLocal
+from app.models.payer_rates import PayerRate
+from app.models.visits import Visit
+from app.crud.billingQueries.getUnproccessedAR import (
+    DEFAULT_PAYER_KEY,
+    ar_amount_expr,
+    normalize_payer_key,
+    payer_key_expr,
+)
+from app.services.calendar_cache import calendar_cache
+
+
+async def list_payer_rates(db: AsyncSession, on_date: Optional[date] = None) -> list[PayerRate]:
+    """All rate rows, or only those in effect on on_date."""
+    stmt = select(PayerRate).order_by(PayerRate.payer_key, PayerRate.cpt_code, PayerRate.effective_from)
+    if on_date is not None:
+        stmt = stmt.where(
+            PayerRate.effective_from <= on_date,
+            or_(PayerRate.effective_to.is_(None), PayerRate.effective_to >= on_date),
+        )
+    return list((await db.execute(stmt)).scalars().all())
+
+
+async def set_payer_rate(
+    db: AsyncSession,
+    payer: str,
+    rate_per_visit: Decimal,
+    effective_from: date,
+    cpt_code: Optional[str] = None,
+    rate_per_unit: Optional[Decimal] = None,
+) -> dict:
+    """
+    Start a new rate for payer (+ optional CPT) on effective_from.
+
+    The open-ended row it supersedes is closed the day before, so visits
+    dated earlier keep the AR they were computed with. An open row that
+    already starts on effective_from (e.g. fixing a typo) is updated in
+    place instead of getting a second row with the same start. Only
+    unbilled visits on or after effective_from are recomputed. Commits.
+    """
+    payer_key = DEFAULT_PAYER_KEY if payer.strip() == DEFAULT_PAYER_KEY else normalize_payer_key(payer)
+    same_scope = and_(
+        PayerRate.payer_key == payer_key,
+        PayerRate.cpt_code.is_(None) if cpt_code is None else PayerRate.cpt_code == cpt_code,
+    )
+
+    closed = await db.execute(
+        update(PayerRate)
+        .where(
+            same_scope,
+            PayerRate.effective_from < effective_from,
+            PayerRate.effective_to.is_(None),
+        )
+        .values(effective_to=effective_from - timedelta(days=1))
+    )
+
+    replaced = await db.execute(
+        update(PayerRate)
+        .where(
+            same_scope,
+            PayerRate.effective_from == effective_from,
+            PayerRate.effective_to.is_(None),
+        )
+        .values(rate_per_visit=rate_per_visit, rate_per_unit=rate_per_unit)
+        .returning(PayerRate.id)
+        .execution_options(synchronize_session=False)
+    )
+    replaced_ids = [r[0] for r in replaced.all()]
+
+    if not replaced_ids:
+        db.add(
+            PayerRate(
+                payer_key=payer_key,
+                cpt_code=cpt_code,
+                rate_per_visit=rate_per_visit,
+                rate_per_unit=rate_per_unit,
+                effective_from=effective_from,
+            )
+        )
+    await db.flush()
+
+    # "*" can be the winning row for any payer, so it touches every visit
+    ar_amount = ar_amount_expr()
+    stmt = (
+        update(Visit)
+        .where(
+            Visit.billed.is_(False),
+            Visit.note_date >= effective_from,
+            Visit.ar_amount.is_distinct_from(ar_amount),
+        )
+        .values(ar_amount=ar_amount)
+        .returning(Visit.note_date)
+        .execution_options(synchronize_session=False)
+    )
+    if payer_key != DEFAULT_PAYER_KEY:
+        stmt = stmt.where(payer_key_expr() == payer_key)
+
+    touched = [r[0] for r in (await db.execute(stmt)).all()]
+    await db.commit()
+
+    calendar_cache.invalidate_note_dates(set(touched))
+
+    return {
+        "payer_key": payer_key,
+        "closed_rows": int(closed.rowcount or 0),
+        "replaced_rows": len(replaced_ids),
+        "visits_recomputed": len(touched),
+        "note_dates_touched": len(set(touched)),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    from datetime import datetime
+
+    parser = argparse.ArgumentParser(description="Start a new payer rate and recompute affected AR")
+    parser.add_argument("payer", help='Primary insurance name, or "*" for the default rate')
+    parser.add_argument("rate", type=Decimal, help="Rate per visit")
+    parser.add_argument("--from", dest="effective_from", required=True, help="YYYY-MM-DD")
+    parser.add_argument("--cpt", default=None)
+    parser.add_argument("--per-unit", type=Decimal, default=None)
+    args = parser.parse_args()
+
+    async def _run():
+        async with SessionLocal() as db:
+            result = await set_payer_rate(
+                db,
+                args.payer,
+                args.rate,
+                datetime.strptime(args.effective_from, "%Y-%m-%d").date(),
+                cpt_code=args.cpt,
+                rate_per_unit=args.per_unit,
+            )
+        print(f"✅ {result}")
+
+    asyncio.run(_run())
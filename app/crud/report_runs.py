@@ -0,0 +1,204 @@
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import select, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.report_runs import ReportRun
+
+
+async def record_report_runs(db: AsyncSession, outcomes, from_date: date, to_date: date) -> int:
+    """
+    Add one report_runs row per dailyReports.ReportOutcome. Outcomes that
+    never started (no started_at) are skipped. Does not commit.
+    """
+    rows = [
+        ReportRun(
+            code=o.code,
+            output_table=o.table,
+            from_date=from_date,
+            to_date=to_date,
+            status=o.status,
+            started_at=o.started_at,
+            finished_at=o.finished_at or o.started_at,
+            duration_ms=int(round(o.seconds * 1000)),
+            rows_inserted=o.rows,
+            ddl=o.ddl,
+            error=o.error,
+            query_plan=o.plan,
+        )
+        for o in outcomes
+        if o.started_at is not None
+    ]
+    db.add_all(rows)
+    await db.flush()
+    return len(rows)
+
+
+async def slow_report_codes(db: AsyncSession, threshold_seconds: float) -> set[str]:
+    """Codes whose latest successful run took threshold_seconds or longer."""
+    result = await db.execute(
+        text("""
+            SELECT code
+            FROM (
+                SELECT DISTINCT ON (code) code, duration_ms
+                FROM report_runs
+                WHERE status = 'ok'
+                ORDER BY code, started_at DESC, id DESC
+            ) latest
+            WHERE duration_ms >= :threshold_ms
+        """),
+        {"threshold_ms": int(threshold_seconds * 1000)},
+    )
+    return {r[0] for r in result.all()}
+
+
+def _run_dict(r: ReportRun, include_plan: bool = False) -> dict:
+    item = {
+        "id": r.id,
+        "code": r.code,
+        "output_table": r.output_table,
+        "from_date": str(r.from_date),
+        "to_date": str(r.to_date),
+        "status": r.status,
+        "started_at": r.started_at.isoformat() if r.started_at else None,
+        "finished_at": r.finished_at.isoformat() if r.finished_at else None,
+        "duration_ms": r.duration_ms,
+        "rows_inserted": r.rows_inserted,
+        "ddl": r.ddl,
+        "error": r.error,
+        "has_plan": r.query_plan is not None,
+    }
+    if include_plan:
+        item["query_plan"] = r.query_plan
+    return item
+
+
+async def list_report_runs(
+    db: AsyncSession,
+    code: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = 100,
+    offset: int = 0,
+) -> dict:
+    stmt = select(ReportRun)
+    count_stmt = select(func.count()).select_from(ReportRun)
+
+    filters = []
+    if code:
+        filters.append(ReportRun.code == code)
+    if status:
+        filters.append(ReportRun.status == status)
+
+    if filters:
+        stmt = stmt.where(*filters)
+        count_stmt = count_stmt.where(*filters)
+
+    stmt = stmt.order_by(ReportRun.started_at.desc(), ReportRun.id.desc()).offset(offset).limit(limit)
+
+    total = (await db.execute(count_stmt)).scalar_one()
+    rows = (await db.execute(stmt)).scalars().all()
+
+    return {"total": int(total or 0), "items": [_run_dict(r) for r in rows]}
+
+
+async def get_report_run(db: AsyncSession, run_id: int) -> Optional[dict]:
+    run = await db.get(ReportRun, run_id)
+    return _run_dict(run, include_plan=True) if run else None
+
+
+# Per report: median duration of ok runs in the last `recent_days` vs the
+# rest of the window. Backfills (multi-day windows) are left out by default
+# because their duration scales with the range, not with the report.
+_TREND_SUMMARY_SQL = """
+    SELECT
+        code,
+        count(*) AS runs,
+        count(*) FILTER (WHERE status <> 'ok') AS failed,
+        percentile_cont(0.5) WITHIN GROUP (ORDER BY duration_ms)
+            FILTER (WHERE status = 'ok' AND started_at >= :recent_since) AS recent_median_ms,
+        percentile_cont(0.5) WITHIN GROUP (ORDER BY duration_ms)
+            FILTER (WHERE status = 'ok' AND started_at < :recent_since) AS baseline_median_ms,
+        max(started_at) AS last_run_at,
+        (array_agg(status ORDER BY started_at DESC))[1] AS last_status
+    FROM report_runs
+    WHERE {where}
+    GROUP BY code
+"""
+
+_TREND_SERIES_SQL = """
+    SELECT
+        code,
+        started_at::date AS day,
+        count(*) AS runs,
+        round(avg(duration_ms) FILTER (WHERE status = 'ok')) AS avg_ms,
+        max(duration_ms) FILTER (WHERE status = 'ok') AS max_ms,
+        sum(rows_inserted) AS rows_inserted
+    FROM report_runs
+    WHERE {where}
+    GROUP BY code, started_at::date
+    ORDER BY code, day
+"""
+
+
+def _as_ms(value) -> Optional[int]:
+    return int(round(float(value))) if value is not None else None
+
+
+async def report_duration_trends(
+    db: AsyncSession,
+    days: int = 30,
+    recent_days: int = 7,
+    code: Optional[str] = None,
+    include_backfills: bool = False,
+) -> dict:
+    """
+    Daily duration series per report plus recent-vs-baseline medians.
+    Reports are sorted by change_pct (biggest slowdown first).
+    """
+    now = datetime.now()
+    params = {
+        "since": now - timedelta(days=days),
+        "recent_since": now - timedelta(days=recent_days),
+    }
+
+    where = ["started_at >= :since"]
+    if code:
+        where.append("code = :code")
+        params["code"] = code
+    if not include_backfills:
+        where.append("from_date = to_date")
+    where_sql = " AND ".join(where)
+
+    summary = (await db.execute(text(_TREND_SUMMARY_SQL.format(where=where_sql)), params)).all()
+    series = (await db.execute(text(_TREND_SERIES_SQL.format(where=where_sql)), params)).all()
+
+    by_code: dict[str, list[dict]] = {}
+    for s in series:
+        by_code.setdefault(s.code, []).append({
+            "day": str(s.day),
+            "runs": int(s.runs),
+            "avg_ms": _as_ms(s.avg_ms),
+            "max_ms": _as_ms(s.max_ms),
+            "rows_inserted": int(s.rows_inserted) if s.rows_inserted is not None else None,
+        })
+
+    reports = []
+    for r in summary:
+        recent = _as_ms(r.recent_median_ms)
+        baseline = _as_ms(r.baseline_median_ms)
+        change = round((recent - baseline) / baseline * 100, 1) if recent is not None and baseline else None
+        reports.append({
+            "code": r.code,
+            "runs": int(r.runs),
+            "failed": int(r.failed),
+            "recent_median_ms": recent,
+            "baseline_median_ms": baseline,
+            "change_pct": change,
+            "last_run_at": r.last_run_at.isoformat() if r.last_run_at else None,
+            "last_status": r.last_status,
+            "series": by_code.get(r.code, []),
+        })
+
+    reports.sort(key=lambda x: (x["change_pct"] is None, -(x["change_pct"] or 0), x["code"]))
+    return {"days": days, "recent_days": recent_days, "reports": reports}
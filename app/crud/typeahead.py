@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from typing import Iterable, Optional
+import asyncio
+
+from sqlalchemy import select, func, text, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import SessionLocal
+from app.models.typeahead_values import TypeaheadValue
+
+
+TYPEAHEAD_KINDS = ("primary_insurance", "secondary_insurance", "therapist", "patient")
+
+
+def _refresh_sql(visit_scope: str, patient_scope: str) -> str:
+    """INSERT ... SELECT of distinct values from visits (v) and patients (p) in scope."""
+    return f"""
+        INSERT INTO typeahead_values (kind, value, ref_id)
+        SELECT DISTINCT s.kind, s.value, s.ref_id
+        FROM (
+            SELECT x.kind, btrim(x.value) AS value, x.ref_id
+            FROM visits v
+            CROSS JOIN LATERAL (VALUES
+                ('primary_insurance', v.primary_insurance, 0::bigint),
+                ('secondary_insurance', v.secondary_insurance, 0::bigint),
+                ('therapist', v.visiting_therapist, 0::bigint),
+                ('therapist', v.supervising_therapist, 0::bigint),
+                ('patient', concat_ws(' ', v.first_name, v.last_name), COALESCE(v.patient_id, 0))
+            ) AS x(kind, value, ref_id)
+            WHERE {visit_scope}
+
+            UNION ALL
+
+            SELECT x.kind, btrim(x.value) AS value, x.ref_id
+            FROM patients p
+            CROSS JOIN LATERAL (VALUES
+                ('primary_insurance', p.primary_insurance, 0::bigint),
+                ('patient', concat_ws(' ', p.first_name, p.last_name), p.id)
+            ) AS x(kind, value, ref_id)
+            WHERE {patient_scope}
+        ) s
+        WHERE s.value IS NOT NULL
+          AND s.value <> ''
+        ON CONFLICT (kind, value, ref_id) DO NOTHING
+    """
+
+
+async def refresh_typeahead_values(
+    db: AsyncSession,
+    note_ids: Optional[Iterable[int]] = None,
+    patient_ids: Optional[Iterable[int]] = None,
+) -> int:
+    """
+    Add any new distinct values from visits / patients to typeahead_values.
+
+      - note_ids: visits just inserted or edited
+      - patient_ids: patients just uploaded
+      - neither: every visit and patient
+
+    Insert-only (ON CONFLICT DO NOTHING); rebuild_typeahead_values drops
+    values nothing uses any more. Does not commit. Returns rows added.
+    """
+    params: dict = {}
+    visit_scope = patient_scope = "TRUE"
+
+    if note_ids is not None:
+        params["note_ids"] = sorted({int(n) for n in note_ids if n is not None})
+        if not params["note_ids"]:
+            return 0
+        visit_scope, patient_scope = "v.note_id = ANY(:note_ids)", "FALSE"
+    elif patient_ids is not None:
+        params["patient_ids"] = sorted({int(p) for p in patient_ids if p is not None})
+        if not params["patient_ids"]:
+            return 0
+        visit_scope, patient_scope = "FALSE", "p.id = ANY(:patient_ids)"
+
+    result = await db.execute(
+        text(_refresh_sql(visit_scope, patient_scope)),
+        params,
+    )
+    return int(result.rowcount or 0)
+
+
+async def rebuild_typeahead_values(db: AsyncSession) -> int:
+    """Replace the whole table in one transaction (readers see the old rows until commit)."""
+    await db.execute(delete(TypeaheadValue))
+    added = await refresh_typeahead_values(db)
+    await db.commit()
+    return added
+
+
+async def load_typeahead_values(db: AsyncSession) -> list[tuple[str, str, int]]:
+    """(kind, value, ref_id) for every row; feeds the in-memory index."""
+    result = await db.execute(
+        select(TypeaheadValue.kind, TypeaheadValue.value, TypeaheadValue.ref_id)
+    )
+    return [(r[0], r[1], int(r[2])) for r in result.all()]
+
+
+async def search_typeahead_trgm(
+    db: AsyncSession,
+    kind: str,
+    query: str,
+    limit: int,
+) -> list[tuple[str, int]]:
+    """Substring / fuzzy matches via the trigram index, best first."""
+    score = func.similarity(TypeaheadValue.value, query)
+    like = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    stmt = (
+        select(TypeaheadValue.value, TypeaheadValue.ref_id)
+        .where(
+            TypeaheadValue.kind == kind,
+            TypeaheadValue.value.ilike(like, escape="\\") | TypeaheadValue.value.op("%")(query),
+        )
+        .order_by(score.desc(), TypeaheadValue.value)
+        .limit(limit)
+    )
+    return [(r[0], int(r[1])) for r in (await db.execute(stmt)).all()]
+
+
+if __name__ == "__main__":
+    async def _run():
+        async with SessionLocal() as db:
+            n = await rebuild_typeahead_values(db)
+        print(f"✅ Rebuilt typeahead_values ({n} rows)")
+
+    asyncio.run(_run())
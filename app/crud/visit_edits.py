@@ -0,0 +1,93 @@
+from datetime import date
+from typing import Iterable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+# Columns the note-details drawer may edit (all text columns on visits)
+ALLOWED_UPDATE_FIELDS = {
+    "primary_insurance",
+    "secondary_insurance",
+    "primary_ins_id",
+    "secondary_ins_id",
+    "ref_provider_npi",
+    "referring_provider",
+    "diagnosis",
+    "visiting_therapist",
+    "cpt_code",
+    "auth_number",
+    "medical_diagnosis",
+    "rendering_provider_npi",
+}
+
+
+def clean_visit_updates(updates: dict) -> dict:
+    """Keep allowed fields; the frontend sends "" for a cleared field, stored as NULL."""
+    return {
+        k: (None if v == "" else v)
+        for k, v in updates.items()
+        if k in ALLOWED_UPDATE_FIELDS
+    }
+
+
+async def apply_visit_updates(
+    db: AsyncSession,
+    note_ids: Iterable[int],
+    updates: dict,
+    source: str,
+    edited_by: Optional[int] = None,
+) -> list[tuple[int, Optional[date]]]:
+    """
+    Set `updates` on every visit in note_ids and audit the change, in ONE
+    statement: lock + snapshot old values, UPDATE ... RETURNING, and insert
+    old/new JSON into visit_edit_audit for rows whose values changed.
+
+    `updates` must already be cleaned (clean_visit_updates). Does not
+    commit. Returns (note_id, note_date) of every matched visit.
+    """
+    ids = sorted({int(n) for n in note_ids if n is not None})
+    if not ids or not updates:
+        return []
+
+    # Column names come from ALLOWED_UPDATE_FIELDS only; values are binds
+    fields = sorted(updates)
+    unknown = set(fields) - ALLOWED_UPDATE_FIELDS
+    if unknown:
+        raise ValueError(f"Fields not editable: {sorted(unknown)}")
+
+    set_sql = ", ".join(f"{f} = :v_{f}" for f in fields)
+
+    def _json(alias: str) -> str:
+        return "jsonb_build_object(" + ", ".join(f"'{f}', {alias}.{f}" for f in fields) + ")"
+
+    params = {f"v_{f}": updates[f] for f in fields}
+    params.update({"note_ids": ids, "source": source, "edited_by": edited_by})
+
+    result = await db.execute(
+        text(f"""
+            WITH old AS (
+                SELECT v.id, {_json("v")} AS old_values
+                FROM visits v
+                WHERE v.note_id = ANY(:note_ids)
+                FOR UPDATE
+            ),
+            upd AS (
+                UPDATE visits v
+                SET {set_sql}, updated_at = now()
+                FROM old
+                WHERE v.id = old.id
+                RETURNING v.id, v.note_id, v.note_date, {_json("v")} AS new_values
+            ),
+            audit AS (
+                INSERT INTO visit_edit_audit (visit_id, note_id, old_values, new_values, source, edited_by)
+                SELECT upd.id, upd.note_id, old.old_values, upd.new_values, :source, :edited_by
+                FROM upd
+                JOIN old ON old.id = upd.id
+                WHERE old.old_values IS DISTINCT FROM upd.new_values
+            )
+            SELECT note_id, note_date FROM upd
+        """),
+        params,
+    )
+    return [(int(r[0]), r[1]) for r in result.all()]
@@ -0,0 +1,144 @@
+import json
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import select, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.visit_reconciliation import VisitReconciliation
+
+
+async def reconcile_window(
+    db: AsyncSession,
+    window_start: date,
+    window_end: date,
+    found_ids: set[int],
+) -> dict:
+    """
+    Compare visits.note_id for note_date in [window_start, window_end] against
+    the IDs HelloNote returned for the same window, entirely in Postgres:
+
+      - found IDs go into a temp table
+      - visits with no match (anti-join) are upserted as 'missing'
+      - previously missing notes that HelloNote returned again are 'resolved'
+
+    Does not commit (the temp table is dropped on commit).
+    """
+    await db.execute(text("DROP TABLE IF EXISTS hn_found_ids"))
+    await db.execute(text("""
+        CREATE TEMP TABLE hn_found_ids (
+            note_id bigint PRIMARY KEY
+        ) ON COMMIT DROP
+    """))
+    await db.execute(
+        text("""
+            INSERT INTO hn_found_ids (note_id)
+            SELECT src.note_id
+            FROM jsonb_to_recordset(CAST(:payload AS jsonb)) AS src(note_id bigint)
+            ON CONFLICT (note_id) DO NOTHING
+        """),
+        {"payload": json.dumps([{"note_id": nid} for nid in found_ids])},
+    )
+    params = {"window_start": window_start, "window_end": window_end}
+
+    expected = await db.execute(
+        text("""
+            SELECT count(*)
+            FROM visits v
+            WHERE v.note_id IS NOT NULL
+              AND v.note_date BETWEEN :window_start AND :window_end
+        """),
+        params,
+    )
+
+    missing = await db.execute(
+        text("""
+            INSERT INTO visit_reconciliation
+                (note_id, visit_uid, patient_id, note_date, status, window_start, window_end)
+            SELECT v.note_id, v.visit_uid, v.patient_id, v.note_date, 'missing', :window_start, :window_end
+            FROM visits v
+            WHERE v.note_id IS NOT NULL
+              AND v.note_date BETWEEN :window_start AND :window_end
+              AND NOT EXISTS (SELECT 1 FROM hn_found_ids f WHERE f.note_id = v.note_id)
+            ON CONFLICT (note_id) DO UPDATE SET
+                status = 'missing',
+                resolved_at = NULL,
+                window_start = EXCLUDED.window_start,
+                window_end = EXCLUDED.window_end,
+                last_checked_at = now()
+            RETURNING (xmax = 0) AS is_new
+        """),
+        params,
+    )
+    missing_rows = missing.all()
+
+    resolved = await db.execute(
+        text("""
+            UPDATE visit_reconciliation r
+            SET status = 'resolved',
+                resolved_at = now(),
+                last_checked_at = now(),
+                window_start = :window_start,
+                window_end = :window_end
+            FROM hn_found_ids f
+            WHERE r.note_id = f.note_id
+              AND r.status = 'missing'
+        """),
+        params,
+    )
+
+    return {
+        "expected": int(expected.scalar_one() or 0),
+        "found": len(found_ids),
+        "missing": len(missing_rows),
+        "newly_missing": sum(1 for r in missing_rows if r.is_new),
+        "resolved": int(resolved.rowcount or 0),
+    }
+
+
+async def list_reconciliation(
+    db: AsyncSession,
+    status: Optional[str] = "missing",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    limit: int = 200,
+    offset: int = 0,
+) -> dict:
+    stmt = select(VisitReconciliation)
+    count_stmt = select(func.count()).select_from(VisitReconciliation)
+
+    filters = []
+    if status:
+        filters.append(VisitReconciliation.status == status)
+    if date_from:
+        filters.append(VisitReconciliation.note_date >= date_from)
+    if date_to:
+        filters.append(VisitReconciliation.note_date <= date_to)
+
+    if filters:
+        stmt = stmt.where(*filters)
+        count_stmt = count_stmt.where(*filters)
+
+    stmt = stmt.order_by(VisitReconciliation.note_date.desc(), VisitReconciliation.note_id).offset(offset).limit(limit)
+
+    total = (await db.execute(count_stmt)).scalar_one()
+    rows = (await db.execute(stmt)).scalars().all()
+
+    return {
+        "total": int(total or 0),
+        "items": [
+            {
+                "note_id": r.note_id,
+                "visit_uid": r.visit_uid,
+                "patient_id": r.patient_id,
+                "note_date": str(r.note_date) if r.note_date else None,
+                "status": r.status,
+                "window_start": str(r.window_start),
+                "window_end": str(r.window_end),
+                "first_detected_at": r.first_detected_at.isoformat() if r.first_detected_at else None,
+                "last_checked_at": r.last_checked_at.isoformat() if r.last_checked_at else None,
+                "resolved_at": r.resolved_at.isoformat() if r.resolved_at else None,
+            }
+            for r in rows
+        ],
+    }
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import base64
+import json
+import re
+from typing import Optional
+
+from sqlalchemy import select, or_, func, literal_column, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.visits import Visit
+
+
+# Must match ix_visits_full_name_trgm exactly (no bind params) or the
+# planner can't use the trigram index.
+FULL_NAME_SQL = "(coalesce(visits.first_name, '') || ' ' || coalesce(visits.last_name, ''))"
+
+HISTORY_COLUMNS = (
+    Visit.id,
+    Visit.visit_uid,
+    Visit.note_id,
+    Visit.patient_id,
+    Visit.first_name,
+    Visit.last_name,
+    Visit.note,
+    Visit.note_date,
+    Visit.visit_type,
+    Visit.case_description,
+    Visit.note_number,
+    Visit.visiting_therapist,
+    Visit.supervising_therapist,
+)
+
+_NUMERIC = re.compile(r"^\d{1,18}$")
+
+
+def encode_history_cursor(score: Optional[float], visit_id: int) -> str:
+    raw = json.dumps({"s": score, "i": int(visit_id)})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_history_cursor(cursor: str) -> tuple[Optional[float], int]:
+    """Raises ValueError on a malformed token."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        score = data.get("s")
+        return (float(score) if score is not None else None), int(data["i"])
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+async def search_visit_history(
+    db: AsyncSession,
+    query: Optional[str],
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> tuple[list[dict], Optional[str]]:
+    """
+    One page of /payroll/history.
+
+      - no query: newest visits first (id DESC)
+      - all digits: exact patient_id / note_id / visit_uid match (btree), id DESC
+      - text: name ILIKE or trigram-similar (GIN), best similarity first
+
+    Keyset paged: pass the returned cursor back for the next page
+    (None on the last page).
+    """
+    q = (query or "").strip()
+    after = decode_history_cursor(cursor) if cursor else None
+
+    if q and not _NUMERIC.match(q):
+        full_name = literal_column(FULL_NAME_SQL)
+        score = func.similarity(full_name, q)
+        stmt = (
+            select(*HISTORY_COLUMNS, score.label("score"))
+            .where(
+                or_(
+                    full_name.ilike(f"%{_escape_like(q)}%", escape="\\"),
+                    full_name.op("%")(q),
+                )
+            )
+            .order_by(score.desc(), Visit.id.desc())
+        )
+        if after is not None:
+            stmt = stmt.where(tuple_(score, Visit.id) < tuple_(after[0] or 0.0, after[1]))
+    else:
+        stmt = select(*HISTORY_COLUMNS).order_by(Visit.id.desc())
+        if q:
+            n = int(q)
+            stmt = stmt.where(
+                or_(
+                    Visit.patient_id == n,
+                    Visit.note_id == n,
+                    Visit.visit_uid == q,
+                )
+            )
+        if after is not None:
+            stmt = stmt.where(Visit.id < after[1])
+
+    rows = (await db.execute(stmt.limit(limit + 1))).mappings().all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_history_cursor(last.get("score"), last["id"])
+
+    return [dict(r) for r in rows], next_cursor
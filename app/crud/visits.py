@@ -8,12 +8,28 @@ from app.crud.visit_uid import (
     check_same_note_date_conflict,
     get_current_year_max_uid_num,
 )
+from app.crud.billingQueries.visitDerivedFields import refresh_visit_derived_fields
+from app.crud.billingQueries.invoiceMatches import refresh_invoice_matches
+from app.crud.typeahead import refresh_typeahead_values
+from app.reports.ingestRules import run_ingest_rules
+from app.services.typeahead import typeahead_index
+from app.services.calendar_cache import invalidate_note_dates
 from app.powerAutomate.teamsMessageMyself import notify_teams
 
 logger = logging.getLogger(__name__)
 
-async def insert_visit_rows(db, rows: list[dict], uploaded_by: int, batch_size: int = 500):
-    """Insert visit rows safely, with Teams webhook error reporting."""
+async def insert_visit_rows(
+    db,
+    rows: list[dict],
+    uploaded_by: int,
+    batch_size: int = 500,
+    notify: bool = True,
+):
+    """
+    Insert visit rows safely, with Teams webhook error reporting.
+    notify=False skips the success summary (callers inserting page-by-page
+    send their own); errors are always reported.
+    """
     for row in rows:
         row["uploaded_by"] = uploaded_by
 
@@ -98,24 +114,39 @@ async def insert_visit_rows(db, rows: list[dict], uploaded_by: int, batch_size:
 
             raise
 
+    # --- Bucket / A-B-C flags for the new rows, same transaction ---
+    await refresh_visit_derived_fields(db, note_ids=[r["note_id"] for r in final_rows])
+    # Late-arriving visits whose Millin invoice is already loaded
+    await refresh_invoice_matches(db, note_ids=[r["note_id"] for r in final_rows])
+    await refresh_typeahead_values(db, note_ids=[r["note_id"] for r in final_rows])
+    # Single-visit report checks now; the nightly report SQL re-checks them
+    rules = await run_ingest_rules(db, note_ids=[r["note_id"] for r in final_rows])
+
     await db.commit()
+    invalidate_note_dates(r.get("note_date") for r in final_rows)
+    typeahead_index.mark_stale()
 
     # ✅ Send summary to Teams
-    notify_teams(
-        status="success",
-        stage="insert_visit_rows",
-        message=(
-            f"✅ Visits Imported Successfully\n"
-            f"- Inserted: {inserted_count}\n"
-            f"- Skipped: {len(skipped_rows)}\n"
-            f"- UIDs Created: {uid_count}"
-        ),
-        script_name="insert_visit_rows"
-    )
+    if notify:
+        notify_teams(
+            status="success",
+            stage="insert_visit_rows",
+            message=(
+                f"✅ Visits Imported Successfully\n"
+                f"- Inserted: {inserted_count}\n"
+                f"- Skipped: {len(skipped_rows)}\n"
+                f"- UIDs Created: {uid_count}\n"
+                f"- Report findings: {rules['rule_findings']}"
+                + (f" ({rules['rule_errors']} rules failed, see logs)" if rules["rule_errors"] else "")
+            ),
+            script_name="insert_visit_rows"
+        )
 
     return {
         "inserted_count": inserted_count,
         "skipped_count": len(skipped_rows),
         "skipped_notes": [r["note_id"] for r in skipped_rows],
         "visit_uids_created": uid_count,
+        "rule_findings": rules["rule_findings"],
+        "rule_errors": rules["rule_errors"],
     }
@@ -14,9 +14,7 @@ ENV_PATH = os.path.join(PROJECT_ROOT, ".env")
 load_dotenv(ENV_PATH)
 
 from app.database import SessionLocal
-from app.crud.visits_via_api import fetch_all_hellonote_visits
-from app.crud.visits import insert_visit_rows
-from app.helloNoteApi.visits_mapper import map_hellonote_list_to_visits
+from app.services.hellonote_pipeline import run_hellonote_import_pipeline
 from app.powerAutomate.teamsMessageMyself import notify_teams
 
 
@@ -33,35 +31,33 @@ async def run_daily_import():
     try:
         notify_teams("success", stage, f"Starting import for {date_from}", script_name)
 
-        # ✅ 1. Fetch from HelloNote
-        df = fetch_all_hellonote_visits(
-            date_from=date_from,
-            date_to=date_to,
-            isAllStatus=True,
-            isFinalizedDate=True,
-            isAllStatusWithHold=False,
-        )
+        # ✅ Fetch → map → insert, page by page
+        async with SessionLocal() as db:
+            result = await run_hellonote_import_pipeline(
+                db,
+                date_from=date_from,
+                date_to=date_to,
+                uploaded_by=4,
+                isAllStatus=True,
+                isFinalizedDate=True,
+                isAllStatusWithHold=False,
+            )
 
-        if df.empty:
+        if not result.total_count:
             notify_teams("success", stage, f"No visits found ({date_from})", script_name)
             return
 
-        # ✅ 2. Map DataFrame → rows
-        hellonote_items = df.to_dict(orient="records")
-        mapped_visits = map_hellonote_list_to_visits(hellonote_items)
-
-        # ✅ 3. Insert to DB
-        async with SessionLocal() as db:
-            result = await insert_visit_rows(db, mapped_visits, uploaded_by=4)
+        totals = result.totals
 
         notify_teams(
             "success",
             stage,
             (
                 f"✅ Daily Import Completed ({date_from})\n"
-                f"- Inserted: {result['inserted_count']}\n"
-                f"- Skipped: {result['skipped_count']}\n"
-                f"- UIDs Created: {result['visit_uids_created']}"
+                f"- Inserted: {totals.get('inserted_count', 0)}\n"
+                f"- Skipped: {totals.get('skipped_count', 0)}\n"
+                f"- UIDs Created: {totals.get('visit_uids_created', 0)}\n"
+                f"{result.summary()}"
             ),
             script_name,
         )
@@ -1,121 +1,284 @@
 from sqlalchemy import text
+from app.config import get_settings
 from app.database import SessionLocal
-from app.reports.dynamicTableCreator import ensure_report_table_exists
+from app.crud.report_runs import record_report_runs, slow_report_codes
+from app.reports.dynamicTableCreator import ensure_report_table_exists, load_report_table_hashes
 from app.powerAutomate.teamsMessageMyself import notify_teams
+from dataclasses import dataclass
+from typing import Optional
+import asyncio
 import pathlib
-from datetime import datetime
+import re
+import time
+from datetime import date, datetime, timedelta
 
-async def run_all_reports():
+REPORTS_DIR = pathlib.Path(__file__).resolve().parent.parent / "reports"
 
-    reports_dir = pathlib.Path(__file__).resolve().parent.parent / "reports"
+# Each report runs on its own pooled connection; keep this under the pool size
+DEFAULT_CONCURRENCY = 4
 
-    async with SessionLocal() as db:
 
-        q = await db.execute(text("SELECT * FROM report_definitions WHERE enabled = true"))
-        reports = q.mappings().all()
+@dataclass
+class ReportOutcome:
+    code: str
+    sql_file: str
+    table: str
+    status: str = "pending"  # ok | ensure_failed | sql_missing | failed
+    error: Optional[str] = None
+    seconds: float = 0.0
+    ddl: bool = False  # output table was created / altered this run
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    rows: Optional[int] = None  # rows the INSERT wrote (conflicts skipped)
+    plan: Optional[str] = None  # EXPLAIN (ANALYZE, BUFFERS), when run under explain
 
-        for r in reports:
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
 
-            report_code = r["code"]
-            sql_file = r["sql_file"]
-            table_name = r["output_table"]
-            sql_path = reports_dir / sql_file
 
-            # ✅ STEP A: ensure table exists / updated
-            try:
-                await ensure_report_table_exists(db, r)
-
-                notify_teams(
-                    status="success",
-                    stage="report",
-                    script_name=None,
-                    message=(
-                        f"✅ [{report_code}] ensure_table\n"
-                        f"Table `{table_name}` verified or updated.\n"
-                        f"SQL: {sql_file}\n"
-                        f"Time: {datetime.now()}"
-                    )
-                )
+async def load_report_definitions(only: Optional[list[str]] = None, explain_threshold: float = 0):
+    """
+    Enabled definitions, {output_table: stored schema hash} (one catalog
+    query) and the codes to run under EXPLAIN: those whose last successful
+    run took explain_threshold seconds or longer (0 = none).
+    """
+    async with SessionLocal() as db:
+        q = await db.execute(text("SELECT * FROM report_definitions WHERE enabled = true ORDER BY code"))
+        reports = q.all()
+        if only:
+            reports = [r for r in reports if r.code in only]
+        hashes = await load_report_table_hashes(db, [r.output_table for r in reports])
 
+        # Best-effort like the ledger itself: no history just means no plans
+        explain_codes: set[str] = set()
+        if explain_threshold:
+            try:
+                explain_codes = await slow_report_codes(db, explain_threshold)
             except Exception as e:
+                await db.rollback()
+                print(f"⚠️ report_runs not read, no plans this run: {e}")
+    return reports, hashes, explain_codes
 
-                notify_teams(
-                    status="error",
-                    stage="report",
-                    script_name=None,
-                    message=(
-                        f"❌ [{report_code}] ensure_table FAILED\n"
-                        f"Report table: `{table_name}`\n"
-                        f"SQL: {sql_file}\n"
-                        f"Error: {e}\n"
-                        f"Time: {datetime.now()}"
-                    )
-                )
-                continue
-
-            # ✅ STEP B: check SQL file exists
-            if not sql_path.exists():
-
-                notify_teams(
-                    status="error",
-                    stage="report",
-                    script_name=None,
-                    message=(
-                        f"❌ [{report_code}] SQL FILE NOT FOUND\n"
-                        f"Missing file: {sql_file}\n"
-                        f"Expected at: {sql_path}\n"
-                        f"Time: {datetime.now()}"
-                    )
-                )
-                continue
-
-            # ✅ STEP C: execute SQL
-            try:
-                sql_script = sql_path.read_text()
-
-                await db.execute(text(sql_script))
-                await db.commit()
-
-                notify_teams(
-                    status="success",
-                    stage="report",
-                    script_name=None,
-                    message=(
-                        f"✅ [{report_code}] executed\n"
-                        f"Ran SQL file: {sql_file}\n"
-                        f"Inserted/updated rows successfully.\n"
-                        f"Time: {datetime.now()}"
-                    )
-                )
 
-            except Exception as e:
+def _stop_clock(outcome: ReportOutcome, started: float) -> None:
+    if outcome.finished_at is None:
+        outcome.finished_at = datetime.now()
+        outcome.seconds = time.perf_counter() - started
+
+
+_TUPLES_INSERTED = re.compile(r"Tuples Inserted: (\d+)")
+
+
+def _plan_rows(plan: str) -> Optional[int]:
+    """Rows written, from the Insert node's ON CONFLICT counters."""
+    m = _TUPLES_INSERTED.search(plan)
+    return int(m.group(1)) if m else None
+
+
+def default_window() -> tuple[date, date]:
+    """The nightly run checks notes finalized yesterday."""
+    yesterday = date.today() - timedelta(days=1)
+    return yesterday, yesterday
+
+
+async def run_report(
+    definition,
+    sem: asyncio.Semaphore,
+    from_date: date,
+    to_date: date,
+    stored_hash: Optional[str] = None,
+    explain: bool = False,
+) -> ReportOutcome:
+    """
+    ensure_table → SQL for one report, on its own session. Never raises:
+    every failure is recorded on the outcome so the other reports carry on.
+
+    Report SQL filters finalized_date BETWEEN :from_date AND :to_date, so a
+    range of any length is one set-based pass (each report skips rows it
+    already holds, so re-running a range is safe). The table DDL only runs
+    when stored_hash doesn't match the definition's output_columns.
+
+    With explain the statement runs under EXPLAIN (ANALYZE, BUFFERS): it
+    still writes and commits, and the plan and inserted row count come from
+    that same pass (run_all_reports sets it for reports that were slow last
+    time).
+    """
+    outcome = ReportOutcome(
+        code=definition.code,
+        sql_file=definition.sql_file,
+        table=definition.output_table,
+    )
+    sql_path = REPORTS_DIR / definition.sql_file
+
+    async with sem:
+        started = time.perf_counter()
+        outcome.started_at = datetime.now()
+        try:
+            async with SessionLocal() as db:
+                # ✅ STEP A: ensure table exists / updated
+                try:
+                    outcome.ddl = await ensure_report_table_exists(db, definition, stored_hash)
+                except Exception as e:
+                    await db.rollback()
+                    outcome.status, outcome.error = "ensure_failed", str(e)
+                    return outcome
+
+                # ✅ STEP B: check SQL file exists
+                if not sql_path.exists():
+                    outcome.status, outcome.error = "sql_missing", f"Expected at: {sql_path}"
+                    return outcome
+
+                # ✅ STEP C: execute SQL
+                sql = sql_path.read_text()
+                params = {"from_date": from_date, "to_date": to_date}
+                try:
+                    if explain:
+                        result = await db.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}"), params)
+                        plan = "\n".join(row[0] for row in result.all())
+                        await db.commit()
+                        outcome.plan, outcome.rows = plan, _plan_rows(plan)
+                    else:
+                        result = await db.execute(text(sql), params)
+                        await db.commit()
+                        outcome.rows = result.rowcount if result.rowcount >= 0 else None
+                    outcome.status = "ok"
+                except Exception as e:
+                    await db.rollback()
+                    outcome.status, outcome.error = "failed", str(e)
+        except Exception as e:
+            # e.g. no connection available
+            outcome.status, outcome.error = "failed", str(e)
+        finally:
+            _stop_clock(outcome, started)
+
+    return outcome
 
-                notify_teams(
-                    status="error",
-                    stage="report",
-                    script_name=None,
-                    message=(
-                        f"❌ [{report_code}] EXECUTION FAILED\n"
-                        f"SQL file: {sql_file}\n"
-                        f"Error: {e}\n"
-                        f"Time: {datetime.now()}"
-                    )
-                )
-                continue
-
-    # ✅ Final message
+
+def _summary_message(
+    outcomes: list[ReportOutcome],
+    wall: float,
+    concurrency: int,
+    from_date: date,
+    to_date: date,
+    ledger_error: Optional[str] = None,
+) -> str:
+    serial = sum(o.seconds for o in outcomes)
+    failed = [o for o in outcomes if not o.ok]
+    window = f"{from_date}" if from_date == to_date else f"{from_date} → {to_date}"
+
+    lines = [
+        f"{'✅' if not failed else '⚠️'} Daily reports: {len(outcomes) - len(failed)}/{len(outcomes)} ok",
+        f"Finalized: {window}",
+        f"Wall: {wall:.1f}s (sum of reports {serial:.1f}s, concurrency {concurrency})",
+        "",
+    ]
+    for o in sorted(outcomes, key=lambda o: o.seconds, reverse=True):
+        mark = "✅" if o.ok else "❌"
+        ddl = " (schema updated)" if o.ddl else ""
+        rows = f", {o.rows} rows" if o.rows is not None else ""
+        plan = " (plan captured)" if o.plan else ""
+        lines.append(f"{mark} [{o.code}] {o.seconds:.1f}s{rows} → `{o.table}`{ddl}{plan}")
+        if o.error:
+            lines.append(f"    {o.status}: {o.error[:300]}")
+    if ledger_error:
+        lines.append(f"\n⚠️ report_runs not written: {ledger_error[:300]}")
+    lines.append(f"\nTime: {datetime.now()}")
+    return "\n".join(lines)
+
+
+async def run_all_reports(
+    concurrency: int = DEFAULT_CONCURRENCY,
+    only: Optional[list[str]] = None,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    explain_threshold: Optional[float] = None,
+) -> list[ReportOutcome]:
+    """
+    Run every enabled report concurrently (at most `concurrency` at a time).
+    Reports only read visits and each writes its own table, so they don't
+    depend on each other. One Teams summary at the end.
+
+    Without dates this is the nightly run (yesterday). With a range it is a
+    backfill over notes finalized in [from_date, to_date].
+
+    Every outcome is recorded in report_runs. Reports whose last successful
+    run took explain_threshold seconds or longer (default
+    REPORT_EXPLAIN_THRESHOLD_SECONDS) run under EXPLAIN this time, so their
+    plan is recorded too.
+    """
+    if from_date is None and to_date is None:
+        from_date, to_date = default_window()
+    else:
+        from_date, to_date = from_date or to_date, to_date or from_date
+    if from_date > to_date:
+        raise ValueError(f"from_date {from_date} is after to_date {to_date}")
+
+    if explain_threshold is None:
+        explain_threshold = get_settings().REPORT_EXPLAIN_THRESHOLD_SECONDS
+
+    reports, hashes, explain_codes = await load_report_definitions(only, explain_threshold)
+
+    sem = asyncio.Semaphore(max(1, concurrency))
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(
+        *(
+            run_report(
+                r, sem, from_date, to_date, hashes.get(r.output_table.lower()), r.code in explain_codes
+            )
+            for r in reports
+        )
+    )
+    wall = time.perf_counter() - started
+
+    # The ledger is best-effort: a failure here must not lose the summary
+    ledger_error = None
+    try:
+        async with SessionLocal() as db:
+            await record_report_runs(db, outcomes, from_date, to_date)
+            await db.commit()
+    except Exception as e:
+        ledger_error = str(e)
+
+    message = _summary_message(list(outcomes), wall, concurrency, from_date, to_date, ledger_error)
+    print(message)
     notify_teams(
-        status="success",
+        status="success" if all(o.ok for o in outcomes) else "error",
         stage="report",
         script_name=None,
-        message=(
-            "✅ Finished running ALL reports.\n"
-            f"Time: {datetime.now()}"
-        )
+        message=message,
     )
+    return list(outcomes)
 
 
 # Allow running standalone
 if __name__ == "__main__":
-    import asyncio
-    asyncio.run(run_all_reports())
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run enabled report_definitions")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--only", nargs="+", default=None, help="Report codes to run")
+    parser.add_argument("--from", dest="date_from", default=None, help="Backfill: finalized_date from (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="date_to", default=None, help="Backfill: finalized_date to (YYYY-MM-DD, default --from)")
+    parser.add_argument(
+        "--explain-over",
+        type=float,
+        default=None,
+        help="Run reports whose last run took at least this many seconds under EXPLAIN (ANALYZE, BUFFERS) (0 = off)",
+    )
+    args = parser.parse_args()
+
+    def _parse(value):
+        return datetime.strptime(value, "%Y-%m-%d").date() if value else None
+
+    # Per-report failures are in the Teams summary; like before, they don't
+    # fail the process, so master_daily.sh still runs the 7am summary
+    asyncio.run(
+        run_all_reports(
+            concurrency=args.concurrency,
+            only=args.only,
+            from_date=_parse(args.date_from),
+            to_date=_parse(args.date_to),
+            explain_threshold=args.explain_over,
+        )
+    )
@@ -0,0 +1,88 @@
+import os
+import sys
+import asyncio
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+
+# ✅ Fix Python path so imports work when run manually
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+# ✅ Load .env explicitly (important for cron + manual run)
+ENV_PATH = os.path.join(PROJECT_ROOT, ".env")
+load_dotenv(ENV_PATH)
+
+from app.database import SessionLocal
+from app.crud.hold_via_api import hold_states_from_items, reconcile_hold_flags
+from app.services.hellonote_pipeline import run_hellonote_import_pipeline
+from app.powerAutomate.teamsMessageMyself import notify_teams
+
+# Same look-back the old HOLD re-crawl used
+HOLD_WINDOW_DAYS = 45
+
+
+async def reconcile_page_holds(db, raw_items: list[dict], mapped_rows: list[dict]) -> dict:
+    # Runs after the page's insert, so newly inserted held notes are already correct
+    return await reconcile_hold_flags(db, hold_states_from_items(raw_items))
+
+
+async def run_daily_sync():
+    """
+    One isAllStatusWithHold crawl replaces dailyImportVisits.py + dailyImportVisitsHold.py:
+      - notes not in the DB yet are inserted (insert_visit_rows skips existing note_ids)
+      - hold flags are set AND cleared from the same items
+    """
+    stage = "daily_sync_hellonote_visits"
+    script_name = "dailySyncVisits.py"
+
+    today = datetime.now()
+    window_start = today - timedelta(days=HOLD_WINDOW_DAYS)
+    date_from = window_start.strftime("%m/%d/%Y")
+    date_to = today.strftime("%m/%d/%Y")
+
+    try:
+        notify_teams("success", stage, f"Starting sync for {date_from} - {date_to}", script_name)
+
+        # ✅ Single crawl, held notes included; each page is inserted and
+        #    hold-reconciled as soon as it arrives
+        async with SessionLocal() as db:
+            result = await run_hellonote_import_pipeline(
+                db,
+                date_from=date_from,
+                date_to=date_to,
+                uploaded_by=4,
+                on_batch=reconcile_page_holds,
+                isAllStatus=True,
+                isFinalizedDate=True,
+                isAllStatusWithHold=True,
+            )
+
+        totals = result.totals
+        if not result.total_count:
+            notify_teams("success", stage, f"No visits found ({date_from} - {date_to})", script_name)
+            return
+
+        notify_teams(
+            "success",
+            stage,
+            (
+                f"✅ Daily Sync Completed ({date_from} - {date_to})\n"
+                f"- Crawled: {result.total_count}\n"
+                f"- Inserted: {totals.get('inserted_count', 0)}\n"
+                f"- Skipped: {totals.get('skipped_count', 0)}\n"
+                f"- UIDs Created: {totals.get('visit_uids_created', 0)}\n"
+                f"- Newly held: {totals.get('newly_held', 0)}\n"
+                f"- Holds cleared: {totals.get('released', 0)}\n"
+                f"{result.summary()}"
+            ),
+            script_name,
+        )
+
+    except Exception as e:
+        notify_teams("error", stage, f"Daily sync failed: {e}", script_name)
+        raise
+
+
+if __name__ == "__main__":
+    asyncio.run(run_daily_sync())
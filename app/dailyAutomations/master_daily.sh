@@ -29,22 +29,25 @@ fi
 
 
 # ---------------------------------------------------------
-# 2. Run daily import (main visit import)
+# 2. Run daily sync (new visits + HOLD flags from one crawl)
+#    Replaces dailyImportVisits.py + dailyImportVisitsHold.py,
+#    which are kept for manual runs.
 # ---------------------------------------------------------
-echo "$(ts) --- Running dailyImportVisits.py ---" | tee -a "$LOG_DIR/master.log"
-if ! /usr/bin/python3 "$DIR/dailyImportVisits.py" >> "$LOG_DIR/import.log" 2>&1; then
-  echo "$(ts) ❌ dailyImportVisits.py FAILED — stopping" | tee -a "$LOG_DIR/master.log"
+echo "$(ts) --- Running dailySyncVisits.py ---" | tee -a "$LOG_DIR/master.log"
+if ! /usr/bin/python3 "$DIR/dailySyncVisits.py" >> "$LOG_DIR/import.log" 2>&1; then
+  echo "$(ts) ❌ dailySyncVisits.py FAILED — stopping" | tee -a "$LOG_DIR/master.log"
   exit 1
 fi
 
 
 # ---------------------------------------------------------
-# 3. Run HOLD update AFTER import, BEFORE reports
+# 3. Refresh billing_day_stats for dates the sync touched
+#    (calendar endpoints also refresh on read; not fatal)
 # ---------------------------------------------------------
-echo "$(ts) --- Running dailyImportVisitsHold.py ---" | tee -a "$LOG_DIR/master.log"
-if ! /usr/bin/python3 "$DIR/dailyImportVisitsHold.py" >> "$LOG_DIR/hold.log" 2>&1; then
-  echo "$(ts) ❌ dailyImportVisitsHold.py FAILED — stopping" | tee -a "$LOG_DIR/master.log"
-  exit 1
+cd "$PROJECT_ROOT"
+echo "$(ts) --- Refreshing billing_day_stats ---" | tee -a "$LOG_DIR/master.log"
+if ! /usr/bin/python3 -m app.crud.billingQueries.billingDayStats >> "$LOG_DIR/import.log" 2>&1; then
+  echo "$(ts) ⚠️ billing_day_stats refresh FAILED — continuing" | tee -a "$LOG_DIR/master.log"
 fi
 
 
@@ -52,7 +55,6 @@ fi
 # 4. Run daily reports
 # ---------------------------------------------------------
 echo "$(ts) --- Running dailyReports ---" | tee -a "$LOG_DIR/master.log"
-cd "$PROJECT_ROOT"
 
 echo "$(ts) --- Running dailyReports (module) ---" | tee -a "$LOG_DIR/master.log"
 if ! /usr/bin/python3 -m app.dailyAutomations.dailyReports >> "$LOG_DIR/reports.log" 2>&1; then
@@ -0,0 +1,185 @@
+"""
+Resumable HelloNote visits backfill.
+
+Splits a date range into day or week shards, fetches shards concurrently
+(bounded by --concurrency) and checkpoints each shard in
+hellonote_backfill_shards. Re-running the same job skips shards already
+marked done; failed shards are retried.
+
+    python3 -m app.helloNoteApi.backfillVisits --from 01/01/2025 --to 12/31/2025
+    python3 -m app.helloNoteApi.backfillVisits --from 01/01/2025 --to 01/31/2025 --shard day --concurrency 8
+
+Fetching is parallel; inserts are serialised because insert_visit_rows
+hands out visit_uid numbers from the current max. Each shard insert is
+idempotent (existing note_ids are skipped, ON CONFLICT (note_id) DO NOTHING).
+"""
+import os
+import sys
+import asyncio
+import argparse
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from dotenv import load_dotenv
+
+load_dotenv(os.path.join(PROJECT_ROOT, ".env"))
+
+from app.database import SessionLocal
+from app.crud.visits import insert_visit_rows
+from app.crud.hellonote_backfill import get_done_shards, mark_shard
+from app.helloNoteApi.visits_mapper import map_hellonote_list_to_visits
+from app.services.hellonote_pipeline import fetch_hellonote_pages
+from app.powerAutomate.teamsMessageMyself import notify_teams
+
+
+SCRIPT_NAME = os.path.basename(__file__)
+SHARD_DAYS = {"day": 1, "week": 7}
+
+
+def mmddyyyy_to_date(s: str) -> date:
+    return datetime.strptime(s, "%m/%d/%Y").date()
+
+
+def split_range(date_from: date, date_to: date, shard: str = "week") -> list[tuple[date, date]]:
+    """Inclusive, non-overlapping [start, end] shards covering date_from..date_to."""
+    step = SHARD_DAYS[shard]
+    shards = []
+    start = date_from
+    while start <= date_to:
+        end = min(start + timedelta(days=step - 1), date_to)
+        shards.append((start, end))
+        start = end + timedelta(days=1)
+    return shards
+
+
+def default_job_name(date_from: date, date_to: date, shard: str) -> str:
+    return f"visits-{date_from:%Y%m%d}-{date_to:%Y%m%d}-{shard}"
+
+
+async def _fetch_shard(start: date, end: date, page_size: int, flags: dict) -> list[dict]:
+    items: list[dict] = []
+    async for page in fetch_hellonote_pages(
+        start.strftime("%m/%d/%Y"),
+        end.strftime("%m/%d/%Y"),
+        page_size=page_size,
+        **flags,
+    ):
+        items.extend(page)
+    return items
+
+
+async def run_backfill(
+    date_from: date,
+    date_to: date,
+    shard: str = "week",
+    concurrency: int = 4,
+    job_name: Optional[str] = None,
+    uploaded_by: Optional[int] = None,
+    page_size: int = 500,
+    **flags,
+) -> dict:
+    stage = "backfill_hellonote_visits"
+    job_name = job_name or default_job_name(date_from, date_to, shard)
+
+    shards = split_range(date_from, date_to, shard)
+    async with SessionLocal() as db:
+        done = await get_done_shards(db, job_name)
+    pending = [s for s in shards if s not in done]
+
+    print(f"▶ {job_name}: {len(shards)} shards, {len(done)} already done, {len(pending)} to run")
+
+    fetch_slots = asyncio.Semaphore(concurrency)
+    insert_lock = asyncio.Lock()
+    totals = {"done": 0, "failed": 0, "fetched": 0, "inserted": 0, "skipped": 0}
+    failures: list[str] = []
+
+    async def run_shard(start: date, end: date):
+        started_at = datetime.now()
+        try:
+            async with fetch_slots:
+                items = await _fetch_shard(start, end, page_size, flags)
+
+            mapped = map_hellonote_list_to_visits(items) if items else []
+
+            async with insert_lock:
+                async with SessionLocal() as db:
+                    result = {"inserted_count": 0, "skipped_count": 0}
+                    if mapped:
+                        result = await insert_visit_rows(db, mapped, uploaded_by=uploaded_by, notify=False)
+                    await mark_shard(
+                        db, job_name, start, end, "done",
+                        started_at=started_at,
+                        fetched_count=len(items),
+                        inserted_count=result["inserted_count"],
+                        skipped_count=result["skipped_count"],
+                    )
+                    await db.commit()
+
+            totals["done"] += 1
+            totals["fetched"] += len(items)
+            totals["inserted"] += result["inserted_count"]
+            totals["skipped"] += result["skipped_count"]
+            print(f"✅ {start}..{end}: fetched={len(items)} inserted={result['inserted_count']}")
+
+        except Exception as e:
+            # One bad shard doesn't stop the others; it stays retryable
+            totals["failed"] += 1
+            failures.append(f"{start}..{end}: {e}")
+            print(f"❌ {start}..{end}: {e}")
+            async with SessionLocal() as db:
+                await mark_shard(db, job_name, start, end, "failed", started_at=started_at, error=str(e))
+                await db.commit()
+
+    await asyncio.gather(*(run_shard(s, e) for s, e in pending))
+
+    msg = (
+        f"Backfill {job_name}\n"
+        f"- Shards: {len(shards)} (previously done {len(done)})\n"
+        f"- Done: {totals['done']}, Failed: {totals['failed']}\n"
+        f"- Fetched: {totals['fetched']}, Inserted: {totals['inserted']}, Skipped: {totals['skipped']}"
+    )
+    if failures:
+        msg += "\n- Failed shards (rerun to retry):\n  " + "\n  ".join(failures[:20])
+    notify_teams("error" if failures else "success", stage, msg, SCRIPT_NAME)
+
+    return {"job_name": job_name, "shards": len(shards), "previously_done": len(done), **totals}
+
+
+# -----------------------------------------------------------
+# MAIN
+# -----------------------------------------------------------
+if __name__ == "__main__":
+    from app.helloNoteApi.login_with_cache import hellonote_login
+
+    parser = argparse.ArgumentParser(description="Resumable sharded HelloNote visits backfill")
+    parser.add_argument("--from", dest="date_from", required=True, help="MM/DD/YYYY")
+    parser.add_argument("--to", dest="date_to", required=True, help="MM/DD/YYYY")
+    parser.add_argument("--shard", choices=sorted(SHARD_DAYS), default="week")
+    parser.add_argument("--concurrency", type=int, default=4, help="Max shards fetching at once")
+    parser.add_argument("--job", default=None, help="Checkpoint job name (default derived from the range)")
+    parser.add_argument("--uploaded-by", type=int, default=4)
+    parser.add_argument("--with-hold", action="store_true", help="Include held notes (isAllStatusWithHold)")
+    parser.add_argument("--note-date", action="store_true", help="Filter by note date instead of finalized date")
+    args = parser.parse_args()
+
+    # Refresh the cached token once up front instead of from every worker thread
+    hellonote_login()
+
+    asyncio.run(
+        run_backfill(
+            mmddyyyy_to_date(args.date_from),
+            mmddyyyy_to_date(args.date_to),
+            shard=args.shard,
+            concurrency=args.concurrency,
+            job_name=args.job,
+            uploaded_by=args.uploaded_by,
+            isAllStatus=True,
+            isAllStatusWithHold=args.with_hold,
+            isFinalizedDate=not args.note_date,
+            isNoteDate=args.note_date,
+        )
+    )
@@ -1,40 +1,47 @@
+"""
+DB-vs-HelloNote deletion reconciliation.
+
+Walks a date range in rolling windows. For each window the note IDs HelloNote
+still returns are loaded into a temp table and anti-joined against visits
+(note_date in the window) in Postgres; the result is persisted in
+visit_reconciliation (see GET /api/visits/reconciliation).
+
+    python3 -m app.helloNoteApi.checkDeletedItems --from 01/01/2026 --to 03/31/2026
+    python3 -m app.helloNoteApi.checkDeletedItems            # last 30 days, 7-day windows
+"""
 import os
+import sys
 import json
+import asyncio
+import argparse
 import requests
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from dotenv import load_dotenv
-from urllib.parse import urlparse
-
-from sqlalchemy import false
 
 # -----------------------------------------------------------
 # CONFIG
 # -----------------------------------------------------------
 SCRIPT_NAME = os.path.basename(__file__)
 BASE_DIR = os.path.dirname(__file__)
-
-TOKEN_FILE = os.path.join(BASE_DIR, ".hellonote_token.json")
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
 
 # Load .env (webhook + DB)
 env_path = os.path.join(BASE_DIR, "../../.env")
 load_dotenv(dotenv_path=env_path)
 
+HELLONOTE_BASE_URL = os.getenv("HELLONOTE_BASE_URL", "https://emr.apiv2.hellonote.com/api").rstrip("/")
+TOKEN_FILE = os.getenv("HELLONOTE_TOKEN_FILE", os.path.join(BASE_DIR, ".hellonote_token.json"))
+
 POWER_AUTOMATE_MYSELF = os.getenv("POWER_AUTOMATE_MYSELF")
-DATABASE_URL = os.getenv("DATABASE_URL")  # REQUIRED for DB mode
 
 # Compare key in HelloNote items
 # Common candidates: "noteId", "id", "visitId"
 HELLO_NOTE_ID_KEY = "noteId"
 
-# Your DB column for the HelloNote visit identifier
-DB_VISIT_ID_COLUMN = "note_id"
-
-# Your DB date column to filter by (likely note_date)
-DB_DATE_COLUMN = "note_date"
-
-# Date range to pull from HelloNote + DB (MM/DD/YYYY)
-DATE_FROM = "01/01/2026"
-DATE_TO = "01/10/2026"
+# Default range when none is given: the last DEFAULT_LOOKBACK_DAYS, in WINDOW_DAYS windows
+DEFAULT_LOOKBACK_DAYS = 30
+WINDOW_DAYS = 7
 
 # Paging
 PAGE_SIZE = 10000
@@ -112,7 +119,7 @@ def fetch_hellonote_visits_raw(
         tokens = load_token_from_file()
         access_token = tokens["accessToken"]
 
-        url = "https://emr.apiv2.hellonote.com/api/services/app/BillingTransactions/GetAll"
+        url = f"{HELLONOTE_BASE_URL}/services/app/BillingTransactions/GetAll"
         headers = {
             "Authorization": f"Bearer {access_token}",
             "Content-Type": "application/json-patch+json",
@@ -216,61 +223,21 @@ def fetch_all_hellonote_visits_items(
 
 
 # -----------------------------------------------------------
-# DB: expected IDs ONLY within DATE_FROM..DATE_TO using note_date
+# DATES
 # -----------------------------------------------------------
-def mmddyyyy_to_date(s: str):
+def mmddyyyy_to_date(s: str) -> date:
     return datetime.strptime(s, "%m/%d/%Y").date()
 
 
-def load_expected_ids_from_db_in_range(database_url: str, date_from_mmddyyyy: str, date_to_mmddyyyy: str) -> list[int]:
-    """
-    Pull expected visit IDs from visits table only for note_date within [DATE_FROM, DATE_TO].
-    Implements:
-      note_date >= DATE_FROM
-      note_date <  (DATE_TO + 1 day)
-    so DATE_TO is inclusive.
-    """
-    stage = "load_expected_ids_db"
-    if not database_url:
-        raise ValueError("DATABASE_URL missing.")
-
-    try:
-        import psycopg2  # type: ignore
-    except Exception as ie:
-        raise ImportError("psycopg2 is not installed. Install it.") from ie
-
-    d_from = mmddyyyy_to_date(date_from_mmddyyyy)
-    d_to = mmddyyyy_to_date(date_to_mmddyyyy)
-
-    u = urlparse(database_url)
-    conn = psycopg2.connect(
-        dbname=u.path.lstrip("/"),
-        user=u.username,
-        password=u.password,
-        host=u.hostname,
-        port=u.port or 5432,
-    )
-
-    try:
-        with conn.cursor() as cur:
-            # Use DATE_TO inclusive by doing < (DATE_TO + interval '1 day')
-            sql = f"""
-                SELECT DISTINCT {DB_VISIT_ID_COLUMN}
-                FROM visits
-                WHERE {DB_VISIT_ID_COLUMN} IS NOT NULL
-                  AND {DB_DATE_COLUMN} >= %s
-                  AND {DB_DATE_COLUMN} < (%s::date + INTERVAL '1 day');
-            """
-            cur.execute(sql, (d_from, d_to))
-            rows = cur.fetchall()
-            ids = [int(r[0]) for r in rows if r and r[0] is not None]
-
-        msg = f"Loaded {len(ids)} expected IDs from DB within {d_from}..{d_to} (inclusive)."
-        print(f"✅ {msg}")
-        send_webhook("success", stage, msg)
-        return ids
-    finally:
-        conn.close()
+def rolling_windows(date_from: date, date_to: date, window_days: int = WINDOW_DAYS) -> list[tuple[date, date]]:
+    """Inclusive, non-overlapping windows covering date_from..date_to."""
+    windows = []
+    start = date_from
+    while start <= date_to:
+        end = min(start + timedelta(days=window_days - 1), date_to)
+        windows.append((start, end))
+        start = end + timedelta(days=1)
+    return windows
 
 
 # -----------------------------------------------------------
@@ -292,25 +259,22 @@ def extract_found_ids_from_hn_items(items: list[dict], id_key: str) -> set[int]:
     return out
 
 
-def find_missing_ids(expected_ids: list[int], found_ids: set[int]) -> list[int]:
-    expected_set = {int(x) for x in expected_ids if x is not None}
-    return sorted(expected_set - found_ids)
-
-
 # -----------------------------------------------------------
-# MAIN
+# RECONCILE
 # -----------------------------------------------------------
-if __name__ == "__main__":
-    try:
-        # 1) Load expected IDs from DB for the SAME date range
-        expected_ids = load_expected_ids_from_db_in_range(DATABASE_URL, DATE_FROM, DATE_TO)
-        if not expected_ids:
-            raise ValueError("No expected IDs loaded for this date range; nothing to compare.")
-
-        # 2) Fetch all HelloNote items for date range
-        hn_items = fetch_all_hellonote_visits_items(
-            dateFrom=DATE_FROM,
-            dateTo=DATE_TO,
+async def reconcile_range(date_from: date, date_to: date, window_days: int = WINDOW_DAYS) -> dict:
+    """Fetch + reconcile each window; every window commits on its own."""
+    from app.database import SessionLocal
+    from app.crud.visit_reconciliation import reconcile_window
+
+    totals = {"windows": 0, "skipped_windows": 0, "expected": 0, "found": 0,
+              "missing": 0, "newly_missing": 0, "resolved": 0}
+
+    for start, end in rolling_windows(date_from, date_to, window_days):
+        hn_items = await asyncio.to_thread(
+            fetch_all_hellonote_visits_items,
+            dateFrom=start.strftime("%m/%d/%Y"),
+            dateTo=end.strftime("%m/%d/%Y"),
             page_size=PAGE_SIZE,
             max_pages=MAX_PAGES,
             isFinalizedDate=IS_FINALIZED_DATE,
@@ -319,35 +283,56 @@ if __name__ == "__main__":
             isAllStatusWithHold=IS_ALL_STATUS_WITH_HOLD,
             isHold=IS_HOLD,
         )
+        found_ids = extract_found_ids_from_hn_items(hn_items, HELLO_NOTE_ID_KEY)
 
-        print(f"✅ Total HelloNote items fetched: {len(hn_items)}")
+        # An empty answer is far more likely an API problem than a fully
+        # deleted week; don't flag the whole window as missing.
+        if not found_ids:
+            totals["skipped_windows"] += 1
+            print(f"⚠️ {start}..{end}: HelloNote returned nothing, window skipped")
+            continue
 
-        # 3) Extract found IDs from HelloNote payload
-        found_ids = extract_found_ids_from_hn_items(hn_items, HELLO_NOTE_ID_KEY)
+        async with SessionLocal() as db:
+            result = await reconcile_window(db, start, end, found_ids)
+            await db.commit()
+
+        totals["windows"] += 1
+        for key in ("expected", "found", "missing", "newly_missing", "resolved"):
+            totals[key] += result[key]
+        print(
+            f"{'✅' if not result['missing'] else '❌'} {start}..{end}: expected={result['expected']} "
+            f"found={result['found']} missing={result['missing']} (new {result['newly_missing']}) "
+            f"resolved={result['resolved']}"
+        )
+
+    return totals
+
+
+# -----------------------------------------------------------
+# MAIN
+# -----------------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconcile visits against HelloNote in rolling windows")
+    parser.add_argument("--from", dest="date_from", default=None, help="MM/DD/YYYY (default: 30 days ago)")
+    parser.add_argument("--to", dest="date_to", default=None, help="MM/DD/YYYY (default: yesterday)")
+    parser.add_argument("--window-days", type=int, default=WINDOW_DAYS)
+    args = parser.parse_args()
 
-        # 4) Compare
-        missing = find_missing_ids(expected_ids, found_ids)
-
-        # 5) Report
-        if not missing:
-            msg = (
-                f"Cross-check OK. Expected={len(expected_ids)} IDs (DB {DB_DATE_COLUMN} in {DATE_FROM}..{DATE_TO}); "
-                f"Found={len(found_ids)} unique IDs in HelloNote; Missing=0. "
-                f"Key='{HELLO_NOTE_ID_KEY}'."
-            )
-            print(f"✅ {msg}")
-            send_webhook("success", "compare_ids", msg)
-        else:
-            msg = (
-                f"Cross-check FAILED. Expected={len(expected_ids)} IDs (DB {DB_DATE_COLUMN} in {DATE_FROM}..{DATE_TO}); "
-                f"Found={len(found_ids)} unique IDs in HelloNote; Missing={len(missing)}. "
-                f"Key='{HELLO_NOTE_ID_KEY}'. First50={missing[:50]}"
-            )
-            print(f"❌ {msg}")
-            print("\n=== MISSING VISIT IDS (full) ===")
-            for mid in missing:
-                print(mid)
-            send_webhook("error", "compare_ids", msg)
+    yesterday = date.today() - timedelta(days=1)
+    d_to = mmddyyyy_to_date(args.date_to) if args.date_to else yesterday
+    d_from = mmddyyyy_to_date(args.date_from) if args.date_from else d_to - timedelta(days=DEFAULT_LOOKBACK_DAYS - 1)
+
+    try:
+        totals = asyncio.run(reconcile_range(d_from, d_to, args.window_days))
+
+        msg = (
+            f"Reconciliation {d_from}..{d_to} ({totals['windows']} windows, "
+            f"{totals['skipped_windows']} skipped): expected={totals['expected']}, found={totals['found']}, "
+            f"missing={totals['missing']} (new {totals['newly_missing']}), resolved={totals['resolved']}. "
+            f"Details in visit_reconciliation."
+        )
+        print(f"{'✅' if not totals['missing'] else '❌'} {msg}")
+        send_webhook("error" if totals["missing"] or totals["skipped_windows"] else "success", "compare_ids", msg)
 
     except Exception as e:
         msg = f"Unhandled error: {e}"
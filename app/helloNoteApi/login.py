@@ -1,6 +1,7 @@
 import os
 import json
 import requests
+from urllib.parse import urlparse
 from dotenv import load_dotenv
 
 def hellonote_login() -> dict:
@@ -27,7 +28,7 @@ def hellonote_login() -> dict:
     # -----------------------------------------------------------------
     # 2️⃣ Build request body and headers
     # -----------------------------------------------------------------
-    BASE_URL = "https://emr.apiv2.hellonote.com/api"
+    BASE_URL = os.getenv("HELLONOTE_BASE_URL", "https://emr.apiv2.hellonote.com/api").rstrip("/")
     LOGIN_URL = f"{BASE_URL}/TokenAuth/Authenticate"
 
     payload = {
@@ -42,7 +43,7 @@ def hellonote_login() -> dict:
     body = json.dumps(payload).encode("utf-8")
 
     headers = {
-        "Host": "emr.apiv2.hellonote.com",
+        "Host": urlparse(LOGIN_URL).netloc,
         "Content-Type": "application/json",
         "Content-Length": str(len(body)),
     }
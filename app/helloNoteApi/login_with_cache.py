@@ -2,9 +2,17 @@ import os
 import json
 import time
 import requests
+from urllib.parse import urlparse
 from dotenv import load_dotenv
 
-CACHE_FILE = os.path.join(os.path.dirname(__file__), ".hellonote_token.json")
+env_path = os.path.join(os.path.dirname(__file__), "../../.env")
+load_dotenv(dotenv_path=env_path)
+
+HELLONOTE_BASE_URL = os.getenv("HELLONOTE_BASE_URL", "https://emr.apiv2.hellonote.com/api").rstrip("/")
+CACHE_FILE = os.getenv(
+    "HELLONOTE_TOKEN_FILE",
+    os.path.join(os.path.dirname(__file__), ".hellonote_token.json"),
+)
 
 
 def load_cached_token():
@@ -44,9 +52,6 @@ def hellonote_login() -> dict:
         return cached
 
     # 2️⃣ Load env variables
-    env_path = os.path.join(os.path.dirname(__file__), "../../.env")
-    load_dotenv(dotenv_path=env_path)
-
     EMAIL = os.getenv("HELLONOTE_EMAIL")
     PASSWORD = os.getenv("HELLONOTE_PASSWORD")
     POWER_AUTOMATE_MYSELF = os.getenv("POWER_AUTOMATE_MYSELF")
@@ -55,7 +60,7 @@ def hellonote_login() -> dict:
         raise Exception(f"Missing HELLONOTE_EMAIL or HELLONOTE_PASSWORD in {env_path}")
 
     # 3️⃣ Build request
-    LOGIN_URL = "https://emr.apiv2.hellonote.com/api/TokenAuth/Authenticate"
+    LOGIN_URL = f"{HELLONOTE_BASE_URL}/TokenAuth/Authenticate"
     payload = {
         "userNameOrEmailAddress": EMAIL,
         "password": PASSWORD,
@@ -67,7 +72,7 @@ def hellonote_login() -> dict:
 
     body = json.dumps(payload).encode("utf-8")
     headers = {
-        "Host": "emr.apiv2.hellonote.com",
+        "Host": urlparse(LOGIN_URL).netloc,
         "Content-Type": "application/json",
         "Content-Length": str(len(body)),
     }
@@ -0,0 +1,361 @@
+import json
+import time
+import random
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# -----------------------------------------------------------
+# Local stand-in for emr.apiv2.hellonote.com
+#
+# Implements just the two endpoints the sync code uses:
+#   POST /api/TokenAuth/Authenticate
+#   POST /api/services/app/BillingTransactions/GetAll
+#
+# Point the app at it with:
+#   HELLONOTE_BASE_URL=http://127.0.0.1:8765/api
+#   HELLONOTE_TOKEN_FILE=/tmp/hellonote_stub_token.json
+# -----------------------------------------------------------
+STUB_ACCESS_TOKEN = "stub-access-token"
+STUB_USER_NAME = "stub.user@hellonote.local"
+
+# Synthetic noteIds start here so they can never collide with real notes
+SYNTHETIC_NOTE_ID_BASE = 9_000_000_000
+
+SYNTHETIC_PAYERS = [
+    "Americare | CHHA",
+    "Royal Care | CHHA",
+    "New York Empire Medicare | Medicare",
+    "Fidelis Care | Medicaid Managed Care",
+    "Healthfirst | Medicare Advantage",
+    "Extendedcare",
+]
+
+SYNTHETIC_CASES = [
+    ("PT - Home Care", ["97110", "97112", "97116", "97140"]),
+    ("OT - Home Care", ["97530", "97535", "97110"]),
+    ("ST - Home Care", ["92507", "92526"]),
+]
+
+SYNTHETIC_FIRST_NAMES = ["Maria", "John", "Chaya", "David", "Esther", "Luis", "Rivka", "Ahmed", "Grace", "Moshe"]
+SYNTHETIC_LAST_NAMES = ["Cohen", "Rodriguez", "Smith", "Friedman", "Nguyen", "Katz", "Williams", "Levy", "Brown", "Singh"]
+SYNTHETIC_THERAPISTS = [
+    "Rachel Green, PT",
+    "Daniel Weiss, DPT",
+    "Sarah Klein, OTR/L",
+    "Michael Stone, PTA",
+    "Leah Adler, CCC-SLP",
+]
+
+
+# -----------------------------------------------------------
+# Datasets
+# -----------------------------------------------------------
+def _iso(dt: datetime) -> str:
+    return dt.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def build_synthetic_items(
+    count: int,
+    date_from: str,
+    date_to: str,
+    hold_ratio: float = 0.05,
+    seed: int = 42,
+) -> list[dict]:
+    """
+    Build `count` HelloNote BillingTransactions items spread evenly across
+    date_from..date_to (MM/DD/YYYY, inclusive). Same seed → same dataset.
+    """
+    rng = random.Random(seed)
+    start = datetime.strptime(date_from, "%m/%d/%Y")
+    end = datetime.strptime(date_to, "%m/%d/%Y")
+    span_days = max((end - start).days, 0) + 1
+
+    patients = max(count // 12, 1)
+
+    items: list[dict] = []
+    for i in range(count):
+        note_day = start + timedelta(days=i % span_days)
+        patient_idx = rng.randrange(patients)
+        case_title, cpts = SYNTHETIC_CASES[patient_idx % len(SYNTHETIC_CASES)]
+
+        picked = rng.sample(cpts, k=min(len(cpts), rng.randint(1, 3)))
+        units = {c: rng.randint(1, 3) for c in picked}
+        cpt_str = ", ".join(f"{c}({u})" for c, u in units.items())
+
+        time_in = note_day + timedelta(hours=8, minutes=15 * rng.randrange(40))
+        time_out = time_in + timedelta(minutes=rng.choice([30, 45, 60]))
+
+        items.append(
+            {
+                "noteId": SYNTHETIC_NOTE_ID_BASE + i,
+                "patientDisplayId": str(700000 + patient_idx),
+                "patientFirstName": SYNTHETIC_FIRST_NAMES[patient_idx % len(SYNTHETIC_FIRST_NAMES)],
+                "patientLastName": SYNTHETIC_LAST_NAMES[(patient_idx // 10) % len(SYNTHETIC_LAST_NAMES)],
+                "gender": rng.choice(["Male", "Female"]),
+                "noteTitle": f"Daily Note - {rng.randint(1, 40)}",
+                "caseTitle": case_title,
+                "caseId": 500000 + patient_idx,
+                "caseDate": _iso(start - timedelta(days=30)),
+                "caseType": "Home Care",
+                "caseOrganizationUnitName": "Brooklyn",
+                "primaryInsuranceId": f"PI{patient_idx:07d}",
+                "primaryInsuranceName": SYNTHETIC_PAYERS[patient_idx % len(SYNTHETIC_PAYERS)],
+                "secondaryInsuranceId": None,
+                "secondaryInsuranceName": None,
+                "noteDate": _iso(note_day),
+                "finalizedDate": _iso(note_day + timedelta(days=rng.randint(0, 2))),
+                "referringPhysician": "Dr. Stub Referrer",
+                "npi": "1234567890",
+                "diagnosis": "M62.81, R26.89",
+                "medicalDiagnosis": "I10",
+                "placeOfService": "12",
+                "visitType": "Treatment",
+                "attendance": "Present",
+                "paymentTypeComment": None,
+                "therapists": SYNTHETIC_THERAPISTS[patient_idx % len(SYNTHETIC_THERAPISTS)],
+                "cptGCode": cpt_str,
+                "totalCptUnit": sum(units.values()),
+                "billedDate": None,
+                "billedComments": None,
+                "patientBirthday": _iso(datetime(1940, 1, 1) + timedelta(days=patient_idx * 37 % 18000)),
+                "patientStreet1Address": f"{100 + patient_idx} Ocean Pkwy",
+                "patientStreet2Address": None,
+                "patientCityAddress": "Brooklyn",
+                "patientStateAddress": "NY",
+                "patientZipAddress": "11218",
+                "hold": rng.random() < hold_ratio,
+                "billed": False,
+                "paid": False,
+                "authNumber": None,
+                "medicalRecordId": 880000 + patient_idx,
+                "renderingProviderNPI": "1987654321",
+                "timeIn": _iso(time_in),
+                "timeOut": _iso(time_out),
+            }
+        )
+
+    return items
+
+
+def load_fixture(path: str) -> list[dict]:
+    """
+    Load a recorded fixture. Accepts either a bare list of items or a raw
+    GetAll response ({"result": {"items": [...]}}).
+    """
+    with open(path, "r") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = (data.get("result") or {}).get("items") or []
+    return list(data)
+
+
+def record_fixture(path: str, date_from: str, date_to: str, page_size: int = 500, **flags) -> int:
+    """
+    Record real HelloNote items for a date range into a fixture file
+    (uses the cached token, same as the daily import).
+    """
+    from app.helloNoteApi.transaction_report_request import fetch_hellonote_visits_raw
+
+    items: list[dict] = []
+    skip = 0
+    while True:
+        raw = fetch_hellonote_visits_raw(
+            dateFrom=date_from,
+            dateTo=date_to,
+            skipCount=skip,
+            amount=page_size,
+            **flags,
+        )
+        page = (raw.get("result") or {}).get("items") or []
+        items.extend(page)
+        if len(page) < page_size:
+            break
+        skip += page_size
+
+    with open(path, "w") as f:
+        json.dump(items, f)
+
+    print(f"✅ Recorded {len(items)} items to {path}")
+    return len(items)
+
+
+# -----------------------------------------------------------
+# Filtering / paging (mirrors the GetAll payload flags)
+# -----------------------------------------------------------
+def _parse_mmddyyyy(value: str | None):
+    if not value:
+        return None
+    return datetime.strptime(value, "%m/%d/%Y").date()
+
+
+def filter_items(items: list[dict], payload: dict) -> list[dict]:
+    date_from = _parse_mmddyyyy(payload.get("dateFrom"))
+    date_to = _parse_mmddyyyy(payload.get("dateTo"))
+    date_key = "finalizedDate" if payload.get("isFinalizedDate") else "noteDate"
+
+    only_hold = bool(payload.get("isHold"))
+    with_hold = bool(payload.get("isAllStatusWithHold"))
+
+    out = []
+    for it in items:
+        held = bool(it.get("hold"))
+        if only_hold and not held:
+            continue
+        if not only_hold and not with_hold and held:
+            continue
+
+        raw_date = it.get(date_key)
+        if raw_date and (date_from or date_to):
+            d = datetime.fromisoformat(str(raw_date).replace("Z", "+00:00")).date()
+            if date_from and d < date_from:
+                continue
+            if date_to and d > date_to:
+                continue
+
+        out.append(it)
+    return out
+
+
+class HelloNoteStubHandler(BaseHTTPRequestHandler):
+    # Set on the server instance by make_stub_server()
+    server_version = "HelloNoteStub/1.0"
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose:
+            super().log_message(fmt, *args)
+
+    def _send_json(self, status: int, body: dict):
+        raw = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def do_POST(self):
+        if self.server.latency_ms:
+            time.sleep(self.server.latency_ms / 1000)
+
+        with self.server.stats_lock:
+            self.server.stats[self.path] = self.server.stats.get(self.path, 0) + 1
+
+        if self.path == "/api/TokenAuth/Authenticate":
+            self._send_json(
+                200,
+                {
+                    "success": True,
+                    "result": {
+                        "userName": STUB_USER_NAME,
+                        "accessToken": STUB_ACCESS_TOKEN,
+                        "refreshToken": "stub-refresh-token",
+                        "expireInSeconds": 86400,
+                    },
+                },
+            )
+            return
+
+        if self.path == "/api/services/app/BillingTransactions/GetAll":
+            if self.headers.get("Authorization") != f"Bearer {STUB_ACCESS_TOKEN}":
+                self._send_json(401, {"success": False, "error": {"message": "Unauthorized"}})
+                return
+
+            payload = self._read_json()
+            matched = filter_items(self.server.items, payload)
+
+            skip = int(payload.get("skipCount") or 0)
+            take = int(payload.get("maxResultCount") or 10)
+
+            self._send_json(
+                200,
+                {
+                    "success": True,
+                    "result": {
+                        "totalCount": len(matched),
+                        "items": matched[skip : skip + take],
+                    },
+                },
+            )
+            return
+
+        self._send_json(404, {"success": False, "error": {"message": f"Unknown path {self.path}"}})
+
+
+def make_stub_server(
+    items: list[dict],
+    host: str = "127.0.0.1",
+    port: int = 0,
+    latency_ms: int = 0,
+    verbose: bool = False,
+) -> ThreadingHTTPServer:
+    """Build (but do not start) a stub server. port=0 picks a free port."""
+    server = ThreadingHTTPServer((host, port), HelloNoteStubHandler)
+    server.items = items
+    server.latency_ms = latency_ms
+    server.verbose = verbose
+    server.stats = {}
+    server.stats_lock = threading.Lock()
+    return server
+
+
+def start_stub_in_thread(items: list[dict], **kwargs) -> tuple[ThreadingHTTPServer, str]:
+    """Start a stub server on a background thread; returns (server, base_url)."""
+    server = make_stub_server(items, **kwargs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}/api"
+
+
+# -----------------------------------------------------------
+# Standalone mode
+#   python3 -m app.helloNoteApi.stubServer --count 20000
+#   python3 -m app.helloNoteApi.stubServer --fixture visits.json
+#   python3 -m app.helloNoteApi.stubServer --record visits.json --from 11/01/2025 --to 11/04/2025
+# -----------------------------------------------------------
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local HelloNote stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--count", type=int, default=5000, help="Synthetic items to serve")
+    parser.add_argument("--from", dest="date_from", default=None, help="MM/DD/YYYY")
+    parser.add_argument("--to", dest="date_to", default=None, help="MM/DD/YYYY")
+    parser.add_argument("--hold-ratio", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--latency-ms", type=int, default=0, help="Artificial delay per request")
+    parser.add_argument("--fixture", default=None, help="Serve a recorded fixture instead of synthetic data")
+    parser.add_argument("--record", default=None, help="Record real HelloNote items into this file and exit")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    today = datetime.now()
+    date_from = args.date_from or (today - timedelta(days=30)).strftime("%m/%d/%Y")
+    date_to = args.date_to or today.strftime("%m/%d/%Y")
+
+    if args.record:
+        record_fixture(args.record, date_from, date_to, isAllStatusWithHold=True, isFinalizedDate=True)
+        raise SystemExit(0)
+
+    if args.fixture:
+        items = load_fixture(args.fixture)
+        print(f"📂 Loaded {len(items)} items from {args.fixture}")
+    else:
+        items = build_synthetic_items(args.count, date_from, date_to, args.hold_ratio, args.seed)
+        print(f"🧪 Built {len(items)} synthetic items for {date_from} - {date_to}")
+
+    server = make_stub_server(items, args.host, args.port, args.latency_ms, args.verbose)
+    print(f"🚀 HelloNote stub listening on http://{args.host}:{args.port}/api")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
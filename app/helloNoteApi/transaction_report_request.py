@@ -6,13 +6,18 @@ from dotenv import load_dotenv
 # -----------------------------------------------------------
 # Configuration
 # -----------------------------------------------------------
-TOKEN_FILE = os.path.join(os.path.dirname(__file__), ".hellonote_token.json")
-
 # Load .env (for webhook)
 env_path = os.path.join(os.path.dirname(__file__), "../../.env")
 load_dotenv(dotenv_path=env_path)
 POWER_AUTOMATE_MYSELF = os.getenv("POWER_AUTOMATE_MYSELF")
 
+# Overridable so the sync code can run against the local stub (stubServer.py)
+HELLONOTE_BASE_URL = os.getenv("HELLONOTE_BASE_URL", "https://emr.apiv2.hellonote.com/api").rstrip("/")
+TOKEN_FILE = os.getenv(
+    "HELLONOTE_TOKEN_FILE",
+    os.path.join(os.path.dirname(__file__), ".hellonote_token.json"),
+)
+
 # Get current script name
 SCRIPT_NAME = os.path.basename(__file__)
 
@@ -91,7 +96,7 @@ def fetch_hellonote_visits_raw(
         tokens = load_token_from_file()
         access_token = tokens["accessToken"]
 
-        url = "https://emr.apiv2.hellonote.com/api/services/app/BillingTransactions/GetAll"
+        url = f"{HELLONOTE_BASE_URL}/services/app/BillingTransactions/GetAll"
         headers = {
             "Authorization": f"Bearer {access_token}",
             "Content-Type": "application/json-patch+json",
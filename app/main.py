@@ -22,6 +22,9 @@ from app.routes import (
     billing_import_manual,  # /api/billing/import-billed-excel
     deductibleFile,        # /api/patients/import-deductible-flags
     upload_millen_invoices,  # /api/upload/millen-invoices
+    visit_reconciliation,  # /api/visits/reconciliation
+    typeahead,             # /api/typeahead
+    report_runs,           # /api/reports/runs
     # visits, invoices, etc. can be added later
 )
 
@@ -60,6 +63,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # /payroll/history paging
 )
 
 
@@ -95,6 +99,9 @@ protected.include_router(note_details.router, tags=["notes"])
 protected.include_router(billing_import_manual.router, tags=["billing"])
 protected.include_router(deductibleFile.router, tags=["patients"])
 protected.include_router(upload_millen_invoices.router, tags=["millen"])
+protected.include_router(visit_reconciliation.router, tags=["notes"])
+protected.include_router(typeahead.router, tags=["typeahead"])
+protected.include_router(report_runs.router, tags=["reports"])
 
 # protected.include_router(visits.router, tags=["visits"])
 # protected.include_router(invoices.router, tags=["invoices"])
@@ -6,4 +6,12 @@ from .patient_coverages import PatientCoverage
 from .self_pay_customer import SelfPayCustomer
 from .self_pay_charges import SelfPayCharge
 from .billing_status import BillingStatus
-from .millin_invoices import MillinInvoice
\ No newline at end of file
+from .millin_invoices import MillinInvoice
+from .hellonote_backfill import HelloNoteBackfillShard
+from .visit_reconciliation import VisitReconciliation
+from .billing_day_stats import BillingDayStats, BillingDayStatsDirty
+from .payer_rates import PayerRate
+from .visit_invoice_matches import VisitInvoiceMatch
+from .typeahead_values import TypeaheadValue
+from .visit_edit_audit import VisitEditAudit
+from .report_runs import ReportRun
@@ -0,0 +1,43 @@
+from datetime import datetime, date
+from decimal import Decimal
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Integer, Numeric, Date, TIMESTAMP, func
+
+from app.database import Base
+
+
+class BillingDayStats(Base):
+    """
+    Per-note_date calendar counts and dollar sums (hold=false only), kept current by
+    crud/billingQueries/billingDayStats.py from billing_day_stats_dirty.
+    """
+    __tablename__ = "billing_day_stats"
+
+    note_date: Mapped[date] = mapped_column(Date, primary_key=True)
+
+    unprepared: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    held_for_deductible: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    ready_to_bill: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    sent_to_billing: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    billed: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    ar: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False, server_default="0")
+    paid: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    denied: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    reconciled: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    issues: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    paid_amount: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False, server_default="0")
+
+    refreshed_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.now(), nullable=False)
+
+
+class BillingDayStatsDirty(Base):
+    """
+    Outbox of note_dates whose stats are stale. Filled by statement-level
+    triggers on visits, billing_status, patients and visit_invoice_matches
+    (see migrations).
+    """
+    __tablename__ = "billing_day_stats_dirty"
+
+    note_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    marked_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.now(), nullable=False)
@@ -0,0 +1,47 @@
+from typing import Optional
+from datetime import datetime, date
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Integer, String, Date, Text, TIMESTAMP, func, UniqueConstraint
+
+from app.database import Base
+
+
+class HelloNoteBackfillShard(Base):
+    __tablename__ = "hellonote_backfill_shards"
+    __table_args__ = (
+        UniqueConstraint("job_name", "shard_start", "shard_end", name="uq_hellonote_backfill_shard"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+
+    job_name: Mapped[str] = mapped_column(
+        String(100),
+        nullable=False,
+        index=True,
+        comment="Backfill run identifier; reruns with the same job resume from here",
+    )
+    shard_start: Mapped[date] = mapped_column(Date, nullable=False)
+    shard_end: Mapped[date] = mapped_column(Date, nullable=False)
+
+    status: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        server_default="pending",
+        comment="pending, done or failed",
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+
+    fetched_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    inserted_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    skipped_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    started_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False
+    )
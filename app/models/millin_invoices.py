@@ -9,12 +9,17 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     func,
+    Index,
 )
 from app.database import Base
 
 
 class MillinInvoice(Base):
     __tablename__ = "millin_invoices"
+    __table_args__ = (
+        # visit_invoice_matches join key
+        Index("ix_millin_invoices_patient_dos", "patient_id", "date_of_service"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
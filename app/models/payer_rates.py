@@ -0,0 +1,31 @@
+from datetime import datetime, date
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Integer, String, Date, Numeric, TIMESTAMP, func, Index
+
+from app.database import Base
+
+
+class PayerRate(Base):
+    """
+    AR rate per payer, optionally per CPT code, valid for note dates in
+    [effective_from, effective_to]. payer_key is the normalized primary
+    insurance (see normalize_payer_key); "*" is the fallback for any payer.
+    cpt_code is a single code, priced per code(units) entry of
+    visits.cpt_code (see ar_amount_expr).
+    """
+    __tablename__ = "payer_rates"
+    __table_args__ = (
+        Index("ix_payer_rates_lookup", "payer_key", "effective_from"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    payer_key: Mapped[str] = mapped_column(String(100), nullable=False)
+    cpt_code: Mapped[Optional[str]] = mapped_column(String(150), nullable=True, comment="NULL = any CPT")
+    rate_per_visit: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False, server_default="0")
+    rate_per_unit: Mapped[Optional[Decimal]] = mapped_column(Numeric(10, 2), nullable=True, comment="Added per visits.total_units")
+    effective_from: Mapped[date] = mapped_column(Date, nullable=False)
+    effective_to: Mapped[Optional[date]] = mapped_column(Date, nullable=True, comment="Inclusive; NULL = open-ended")
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.now(), nullable=False)
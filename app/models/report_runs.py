@@ -0,0 +1,37 @@
+from typing import Optional
+from datetime import datetime, date
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Integer, BigInteger, Boolean, Date, Text, TIMESTAMP, Index
+
+from app.database import Base
+
+
+class ReportRun(Base):
+    """
+    One row per report per dailyReports run (nightly or backfill), written
+    by the runner after all reports finish (crud/report_runs.py).
+    """
+    __tablename__ = "report_runs"
+    __table_args__ = (
+        Index("ix_report_runs_code_started_at", "code", "started_at"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    code: Mapped[str] = mapped_column(String(100), nullable=False)
+    output_table: Mapped[str] = mapped_column(String(255), nullable=False)
+
+    # finalized_date window the SQL was bound to
+    from_date: Mapped[date] = mapped_column(Date, nullable=False)
+    to_date: Mapped[date] = mapped_column(Date, nullable=False)
+
+    status: Mapped[str] = mapped_column(String(20), nullable=False, comment="ok | ensure_failed | sql_missing | failed")
+    started_at: Mapped[datetime] = mapped_column(TIMESTAMP, nullable=False)
+    finished_at: Mapped[datetime] = mapped_column(TIMESTAMP, nullable=False)
+    duration_ms: Mapped[int] = mapped_column(Integer, nullable=False)
+    rows_inserted: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    ddl: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    # EXPLAIN (ANALYZE, BUFFERS) text, only for runs over REPORT_EXPLAIN_THRESHOLD_SECONDS
+    query_plan: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Integer, BigInteger, String, TIMESTAMP, UniqueConstraint, Index, func
+
+from app.database import Base
+
+
+class TypeaheadValue(Base):
+    """
+    Distinct dropdown values (payers, therapists, patients), kept current at
+    ingest by crud/typeahead.py so /typeahead and the insurance dropdowns
+    never SELECT DISTINCT over visits. ref_id is the patient id for
+    kind='patient', 0 otherwise.
+    """
+    __tablename__ = "typeahead_values"
+    __table_args__ = (
+        UniqueConstraint("kind", "value", "ref_id", name="uq_typeahead_values_kind_value_ref"),
+        Index(
+            "ix_typeahead_values_value_trgm",
+            "value",
+            postgresql_using="gin",
+            postgresql_ops={"value": "gin_trgm_ops"},
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    kind: Mapped[str] = mapped_column(String(30), nullable=False)
+    value: Mapped[str] = mapped_column(String(255), nullable=False)
+    ref_id: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.now(), nullable=False)
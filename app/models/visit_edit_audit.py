@@ -0,0 +1,33 @@
+from typing import Optional
+from datetime import datetime
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Integer, BigInteger, TIMESTAMP, ForeignKey, Index, func
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.database import Base
+
+
+class VisitEditAudit(Base):
+    """
+    One row per visit actually changed by a note-details edit, written in
+    the same statement as the UPDATE (crud/visit_edits.py).
+    """
+    __tablename__ = "visit_edit_audit"
+    __table_args__ = (
+        Index("ix_visit_edit_audit_note_id_edited_at", "note_id", "edited_at"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    visit_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    note_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    # Only the edited fields: {"primary_insurance": "...", ...}
+    old_values: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    new_values: Mapped[dict] = mapped_column(JSONB, nullable=False)
+
+    source: Mapped[str] = mapped_column(String(30), nullable=False, comment="note_details | bulk_update")
+    edited_by: Mapped[Optional[int]] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True
+    )
+    edited_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.now(), nullable=False)
@@ -0,0 +1,34 @@
+from datetime import datetime, date
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Integer, BigInteger, Boolean, Date, Numeric, TIMESTAMP, ForeignKey, func
+
+from app.database import Base
+
+
+class VisitInvoiceMatch(Base):
+    """
+    Visit ↔ Millin invoice on (patient_id, note_date = date_of_service), with
+    the invoice outcome flattened to flags. Maintained by
+    crud/billingQueries/invoiceMatches.py at invoice upload and visit insert.
+    """
+    __tablename__ = "visit_invoice_matches"
+
+    visit_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("visits.id", ondelete="CASCADE"), primary_key=True
+    )
+    invoice_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("millin_invoices.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    patient_id: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    note_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True, index=True)
+
+    paid: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="false")
+    denied: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="false")
+    reconciled: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="false")
+    has_issue: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="false")
+    paid_amount: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False, server_default="0")
+
+    matched_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.now(), nullable=False)
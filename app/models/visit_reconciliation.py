@@ -0,0 +1,35 @@
+from typing import Optional
+from datetime import datetime, date
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Date, BigInteger, TIMESTAMP, func
+
+from app.database import Base
+
+
+class VisitReconciliation(Base):
+    __tablename__ = "visit_reconciliation"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+
+    # One row per note that has ever gone missing from HelloNote
+    note_id: Mapped[int] = mapped_column(BigInteger, unique=True, nullable=False)
+    visit_uid: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
+    patient_id: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    note_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True, index=True)
+
+    status: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        server_default="missing",
+        index=True,
+        comment="missing = in visits but not returned by HelloNote; resolved = seen again in a later check",
+    )
+
+    # Window of the check that last touched this row
+    window_start: Mapped[date] = mapped_column(Date, nullable=False)
+    window_end: Mapped[date] = mapped_column(Date, nullable=False)
+
+    first_detected_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.now(), nullable=False)
+    last_checked_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.now(), nullable=False)
+    resolved_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, nullable=True)
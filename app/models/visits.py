@@ -1,16 +1,28 @@
 from typing import Optional
+from decimal import Decimal
 from datetime import datetime, date
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import Integer, String, Date, Boolean, Text, BigInteger, TIMESTAMP, func, ForeignKey, UUID
+from sqlalchemy import Integer, String, Date, Boolean, Text, BigInteger, TIMESTAMP, Numeric, func, ForeignKey, UUID, Index, text, Computed
+from sqlalchemy.dialects.postgresql import ARRAY, TSRANGE, Range
 from app.database import Base
 
 class Visit(Base):
     __tablename__ = "visits"
+    __table_args__ = (
+        # Calendar + /billing/unprepared: unbilled, un-held visits by date and bucket
+        Index(
+            "ix_visits_unbilled_note_date_bucket",
+            "note_date",
+            "status_bucket",
+            postgresql_include=["ar_amount"],
+            postgresql_where=text("billed IS FALSE AND hold IS FALSE"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     visit_uid: Mapped[str] = mapped_column(String(20), nullable=True, index=True, comment="Stable visit identifier across related notes (not unique, reused)")
     note_id: Mapped[Optional[int]] = mapped_column(BigInteger, unique=True, nullable=True)
-    patient_id: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    patient_id: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True, index=True)
     first_name: Mapped[Optional[str]] = mapped_column(String(100))
     last_name: Mapped[Optional[str]] = mapped_column(String(100))
     note: Mapped[Optional[str]] = mapped_column(String(255))
@@ -61,6 +73,20 @@ class Visit(Base):
     case_id: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
     time_in: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, nullable=True)
     time_out: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, nullable=True)
+    # Generated by Postgres for rpt_overlapping_visits_by_therapist; never written
+    therapist_key: Mapped[str] = mapped_column(
+        String(150),
+        Computed("btrim(coalesce(visiting_therapist, ''))", persisted=True),
+        comment="Trimmed visiting_therapist, the overlap report's match key",
+    )
+    visit_period: Mapped[Optional[Range[datetime]]] = mapped_column(
+        TSRANGE,
+        Computed(
+            "CASE WHEN time_in < time_out THEN tsrange(time_in, time_out) END",
+            persisted=True,
+        ),
+        comment="[time_in, time_out); NULL when either end is missing or out of order",
+    )
     review_by: Mapped[Optional[int]] = mapped_column(
         BigInteger,
         ForeignKey("users.id", ondelete="SET NULL"),  # 👈 enforce FK to users table
@@ -87,4 +113,55 @@ class Visit(Base):
         index=True,
         nullable=True,
         comment="Links visit to billing_status row used for billing/invoicing"
-    )
\ No newline at end of file
+    )
+
+    # Derived billing readiness, written by crud/billingQueries/visitDerivedFields.py
+    passes_abc: Mapped[Optional[bool]] = mapped_column(
+        Boolean,
+        nullable=True,
+        comment="A/B/C check (insurance + diagnosis) result",
+    )
+    issue_keys: Mapped[Optional[list[str]]] = mapped_column(
+        ARRAY(String(50)),
+        nullable=True,
+        comment="Keys of ISSUE_LABELS that fail for this visit",
+    )
+    status_bucket: Mapped[Optional[str]] = mapped_column(
+        String(30),
+        nullable=True,
+        comment="unprepared | held_for_deductible | ready_to_bill",
+    )
+    ar_amount: Mapped[Optional[Decimal]] = mapped_column(
+        Numeric(10, 2),
+        nullable=True,
+        comment="AR at the payer_rates rate effective on note_date",
+    )
+
+
+# Keyset paging for /billing/unprepared: ORDER BY note_date DESC, patient_id, note_id
+# with NULLs as the sentinels in crud/billingQueries/unpreparedVisits.unprepared_keyset_columns
+Index(
+    "ix_visits_unprepared_keyset",
+    func.coalesce(Visit.note_date, text("DATE '9999-12-31'")).desc(),
+    func.coalesce(Visit.patient_id, text("9223372036854775807")),
+    func.coalesce(Visit.note_id, text("9223372036854775807")),
+    postgresql_where=text("billed IS FALSE AND hold IS FALSE AND status_bucket = 'unprepared'"),
+)
+
+# /payroll/history name search (ILIKE and similarity); see crud/visit_search.py
+Index(
+    "ix_visits_full_name_trgm",
+    (func.coalesce(Visit.first_name, "") + " " + func.coalesce(Visit.last_name, "")).label("full_name"),
+    postgresql_using="gin",
+    postgresql_ops={"full_name": "gin_trgm_ops"},
+)
+
+# Overlap report: per-therapist range probe (b.visit_period && a.visit_period).
+# Needs btree_gist for the text column.
+Index(
+    "ix_visits_therapist_period",
+    Visit.therapist_key,
+    Visit.visit_period,
+    postgresql_using="gist",
+    postgresql_where=text("visit_period IS NOT NULL AND hold IS NOT TRUE"),
+)
@@ -1,8 +1,75 @@
+import hashlib
+import json
+
 from sqlalchemy import text
 
-async def ensure_report_table_exists(db, definition):
+SCHEMA_COMMENT_PREFIX = "report_schema:"
+
+# Sentinel: caller didn't look the stored hash up, so always check the table
+UNKNOWN = object()
+
+
+def unique_key(definition) -> list:
+    """Natural key columns from output_columns["unique_key"] (may be empty)."""
+    return list(definition.output_columns.get("unique_key") or [])
+
+
+def unique_index_name(table: str) -> str:
+    return f"ux_{table.lower()}_natural_key"
+
+
+def schema_hash(definition) -> str:
+    """Stable hash of a definition's columns + unique_key (order-insensitive keys)."""
+    shape = {
+        "columns": definition.output_columns["columns"],
+        "unique_key": unique_key(definition),
+    }
+    raw = json.dumps(shape, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+async def load_report_table_hashes(db, table_names) -> dict:
+    """
+    {table: stored schema hash or None} for every table that exists, from ONE
+    pg_class query. Tables that don't exist yet are absent from the result.
+    """
+    names = sorted({t.lower() for t in table_names})
+    if not names:
+        return {}
+
+    result = await db.execute(
+        text("""
+            SELECT c.relname, obj_description(c.oid, 'pg_class')
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = current_schema()
+              AND c.relkind = 'r'
+              AND c.relname = ANY(:names)
+        """),
+        {"names": names},
+    )
+
+    out = {}
+    for relname, comment in result.all():
+        comment = comment or ""
+        out[relname] = comment[len(SCHEMA_COMMENT_PREFIX):] if comment.startswith(SCHEMA_COMMENT_PREFIX) else None
+    return out
+
+
+async def ensure_report_table_exists(db, definition, stored_hash=UNKNOWN) -> bool:
+    """
+    Create / add missing columns to the report's output table.
+
+    When stored_hash (from load_report_table_hashes) already matches the
+    definition, nothing runs. Otherwise the DDL runs and the new hash is
+    stored as the table comment. Returns True if DDL ran.
+    """
     table = definition.output_table
     cols = definition.output_columns["columns"]
+    wanted = schema_hash(definition)
+
+    if stored_hash is not UNKNOWN and stored_hash == wanted:
+        return False
 
     # 1. CREATE TABLE IF NOT EXISTS (basic skeleton)
     base_columns = """
@@ -17,7 +84,6 @@ async def ensure_report_table_exists(db, definition):
     """
 
     await db.execute(text(create_sql))
-    await db.commit()
 
     # 2. Get existing columns from database
     existing_cols_query = text("""
@@ -39,7 +105,22 @@ async def ensure_report_table_exists(db, definition):
             alter_sql = text(f"ALTER TABLE {table} ADD COLUMN {name} {col_type};")
             await db.execute(alter_sql)
 
+    # 4. Natural key for the report SQL's ON CONFLICT. Rows duplicated
+    #    before the key existed are collapsed to the oldest one first.
+    key = unique_key(definition)
+    index_name = unique_index_name(table)
+    await db.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+    if key:
+        key_sql = ", ".join(key)
+        same_key = " AND ".join(f"a.{c} = b.{c}" for c in key)
+        await db.execute(text(f"DELETE FROM {table} a USING {table} b WHERE a.id > b.id AND {same_key}"))
+        await db.execute(text(f"CREATE UNIQUE INDEX {index_name} ON {table} ({key_sql})"))
+
+    # 5. Remember what this table was built from (hex digest: safe to inline)
+    await db.execute(text(f"COMMENT ON TABLE {table} IS '{SCHEMA_COMMENT_PREFIX}{wanted}'"))
+
     await db.commit()
+    return True
 
 if __name__ == "__main__":
     import asyncio
@@ -51,13 +132,16 @@ if __name__ == "__main__":
         async with SessionLocal() as db:
             # Load a test report
             q = await db.execute(text("SELECT * FROM report_definitions WHERE code = 'rpt_97750CPT'"))
-            definition = q.mappings().first()
+            definition = q.first()
 
             if not definition:
                 print("❌ test_report not found in report_definitions")
                 return
 
-            await ensure_report_table_exists(db, definition)
-            print("✅ Table synced:", definition["output_table"])
+            stored = await load_report_table_hashes(db, [definition.output_table])
+            ran = await ensure_report_table_exists(
+                db, definition, stored.get(definition.output_table.lower())
+            )
+            print("✅ Table synced:" if ran else "✅ Table up to date:", definition.output_table)
 
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
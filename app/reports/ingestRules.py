@@ -0,0 +1,378 @@
+"""
+Ingest-time versions of the single-visit report checks.
+
+Each IngestRule mirrors one rpt_*.sql file: a vectorized pandas mask over
+the visits just written, and the same INSERT ... ON CONFLICT DO NOTHING
+into the report's output table. insert_visit_rows runs them on every
+batch, so findings land in the report tables as soon as the notes arrive.
+
+The nightly SQL still runs over finalized_date and acts as the
+cross-check: with the rules in place its report_runs.rows_inserted should
+stay near 0 for these reports. Anything it does insert is a visit edited
+after ingest or a rule that has drifted from its SQL. To diff a window:
+
+    python3 -m app.reports.ingestRules --from 2026-01-01 --to 2026-01-31
+
+Multi-visit reports (overlaps, double notes, same-day visits) stay
+SQL-only; they need the rest of the table, not just the batch.
+"""
+import re
+import logging
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Callable, Optional
+
+import pandas as pd
+from sqlalchemy import text
+
+from app.reports.dynamicTableCreator import load_report_table_hashes, schema_hash, unique_key
+
+logger = logging.getLogger(__name__)
+
+
+# Columns the masks read; the report columns themselves are copied from visits in SQL
+RULE_INPUT_COLUMNS = ("id", "case_description", "primary_insurance", "total_units", "cpt_code")
+
+# LOWER(primary_insurance) NOT IN (...) in the unit-minimum reports
+UNIT_MINIMUM_EXEMPT_INSURANCES = ("americare", "royal care", "extendedcare", "able health")
+
+# Exact comma-separated entries flagged by rpt_low_cpt_code_use.sql
+LOW_CPT_ENTRIES = (
+    "97116(2)", "97116(3)", "97116(4)",
+    "97140(2)", "97140(3)", "97140(4)",
+    "97110(2)", "97110(3)",
+)
+
+# Shared column lists, in the order the SQL files insert them
+_PT_OT_ST_COLUMNS = (
+    "visit_row_id", "note_id", "case_id", "patient_id", "first_name", "last_name",
+    "case_description", "note_date", "note", "cpt_code", "total_units",
+    "visiting_therapist", "primary_insurance",
+)
+
+
+@dataclass(frozen=True)
+class IngestRule:
+    """
+    sql_file ties the rule to its report_definitions row (and output table).
+    match(df) returns one row per finding: visit_row_id plus any computed
+    columns listed in `computed` ({name: SQL type}). Every other column is
+    copied from visits.
+    """
+    sql_file: str
+    columns: tuple
+    match: Callable[[pd.DataFrame], pd.DataFrame]
+    computed: dict = field(default_factory=dict)
+
+
+# -----------------------------------------------------------
+# Vectorized predicates (NULLs behave like in the SQL: never match)
+# -----------------------------------------------------------
+def _starts_with_any(s: pd.Series, prefixes: tuple) -> pd.Series:
+    """ILIKE 'X%' OR ILIKE 'Y%' ..."""
+    pattern = "|".join(re.escape(p) for p in prefixes)
+    return s.fillna("").str.match(f"(?:{pattern})", case=False)
+
+
+def _contains(s: pd.Series, needle: str) -> pd.Series:
+    """ILIKE '%needle%' (needles here are digits, so case doesn't matter)"""
+    return s.fillna("").str.contains(needle, regex=False)
+
+
+def _unit_minimum_insurance(s: pd.Series) -> pd.Series:
+    # LOWER(NULL) NOT IN (...) is NULL in SQL, so a missing insurance never matches
+    return s.notna() & ~s.fillna("").str.lower().isin(UNIT_MINIMUM_EXEMPT_INSURANCES)
+
+
+def _units(df: pd.DataFrame) -> pd.Series:
+    return pd.to_numeric(df["total_units"], errors="coerce")
+
+
+def _ids(df: pd.DataFrame, mask: pd.Series) -> pd.DataFrame:
+    return pd.DataFrame({"visit_row_id": df.loc[mask, "id"].astype("int64")})
+
+
+# -----------------------------------------------------------
+# Rules
+# -----------------------------------------------------------
+def match_pt_ot_four_unit_minimum(df: pd.DataFrame) -> pd.DataFrame:
+    mask = (
+        _starts_with_any(df["case_description"], ("PT", "OT", "Physical", "Occupational"))
+        & _unit_minimum_insurance(df["primary_insurance"])
+        & (_units(df) < 4)
+    )
+    return _ids(df, mask)
+
+
+def match_st_two_unit_minimum(df: pd.DataFrame) -> pd.DataFrame:
+    mask = (
+        _starts_with_any(df["case_description"], ("ST", "SLP", "Speech"))
+        & _unit_minimum_insurance(df["primary_insurance"])
+        & (_units(df) == 1)
+    )
+    return _ids(df, mask)
+
+
+def match_97110_97112_same_visit(df: pd.DataFrame) -> pd.DataFrame:
+    return _ids(df, _contains(df["cpt_code"], "97110") & _contains(df["cpt_code"], "97112"))
+
+
+def match_97750(df: pd.DataFrame) -> pd.DataFrame:
+    return _ids(df, _contains(df["cpt_code"], "97750"))
+
+
+def match_low_cpt_code_use(df: pd.DataFrame) -> pd.DataFrame:
+    """One row per flagged entry: regexp_split_to_table(cpt_code, ',') + trim()."""
+    columns = ["visit_row_id", "problematic_cpt", "problematic_amount"]
+    parts = df.loc[df["cpt_code"].notna(), ["id", "cpt_code"]].copy()
+    if parts.empty:
+        return pd.DataFrame(columns=columns)
+    parts["entry"] = parts["cpt_code"].str.split(",")
+    parts = parts.explode("entry")
+    parts["entry"] = parts["entry"].str.strip(" ")
+    parts = parts[parts["entry"].isin(LOW_CPT_ENTRIES)]
+    if parts.empty:
+        return pd.DataFrame(columns=columns)
+
+    split = parts["entry"].str.extract(r"^(\d+)\((\d+)\)$")
+    out = pd.DataFrame({
+        "visit_row_id": parts["id"].astype("int64"),
+        "problematic_cpt": split[0].astype("int64"),
+        "problematic_amount": split[1].astype("int64"),
+    })
+    return out.drop_duplicates()
+
+
+INGEST_RULES = (
+    IngestRule(
+        sql_file="rpt_pt_ot_four_unit_minimum.sql",
+        columns=_PT_OT_ST_COLUMNS,
+        match=match_pt_ot_four_unit_minimum,
+    ),
+    IngestRule(
+        sql_file="rpt_st_two_unit_minimum.sql",
+        columns=_PT_OT_ST_COLUMNS,
+        match=match_st_two_unit_minimum,
+    ),
+    IngestRule(
+        sql_file="rpt_97110_97112_same_visit.sql",
+        columns=(
+            "visit_row_id", "case_id", "patient_id", "first_name", "last_name",
+            "case_description", "note_date", "note", "cpt_code",
+            "visiting_therapist", "primary_insurance",
+        ),
+        match=match_97110_97112_same_visit,
+    ),
+    IngestRule(
+        sql_file="rpt_97750CPT.sql",
+        columns=(
+            "visit_row_id", "note_id", "case_id", "note", "patient_id", "first_name",
+            "last_name", "case_description", "primary_insurance", "note_date",
+            "cpt_code", "visiting_therapist",
+        ),
+        match=match_97750,
+    ),
+    IngestRule(
+        sql_file="rpt_low_cpt_code_use.sql",
+        columns=(
+            "visit_row_id", "note_id", "case_id", "patient_id", "first_name", "last_name",
+            "case_description", "note_date", "note", "cpt_code", "problematic_cpt",
+            "problematic_amount", "visiting_therapist", "primary_insurance",
+        ),
+        match=match_low_cpt_code_use,
+        computed={"problematic_cpt": "int", "problematic_amount": "int"},
+    ),
+)
+
+
+# -----------------------------------------------------------
+# Loading
+# -----------------------------------------------------------
+async def load_rule_inputs(
+    db,
+    note_ids: Optional[list[int]] = None,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+) -> pd.DataFrame:
+    """
+    Finalized visits, by note_id (ingest) or finalized_date window (cross-check).
+    Un-finalized notes are left for later: the reports only cover finalized ones.
+    """
+    select_sql = f"SELECT {', '.join(RULE_INPUT_COLUMNS)} FROM visits WHERE finalized_date IS NOT NULL"
+    if note_ids is not None:
+        result = await db.execute(text(f"{select_sql} AND note_id = ANY(:note_ids)"), {"note_ids": note_ids})
+    else:
+        result = await db.execute(
+            text(f"{select_sql} AND finalized_date BETWEEN :from_date AND :to_date"),
+            {"from_date": from_date, "to_date": to_date},
+        )
+    return pd.DataFrame(result.all(), columns=list(RULE_INPUT_COLUMNS))
+
+
+async def load_rule_targets(db) -> dict:
+    """
+    {sql_file: definition} for enabled reports whose output table is already
+    built for the current definition (stored schema hash matches). Anything
+    else is skipped here; the nightly runner creates / migrates the table.
+    """
+    result = await db.execute(
+        text("""
+            SELECT code, sql_file, output_table, output_columns
+            FROM report_definitions
+            WHERE enabled = true
+              AND sql_file = ANY(:files)
+        """),
+        {"files": [r.sql_file for r in INGEST_RULES]},
+    )
+    definitions = result.all()
+    hashes = await load_report_table_hashes(db, [d.output_table for d in definitions])
+
+    targets = {}
+    for d in definitions:
+        if hashes.get(d.output_table.lower()) != schema_hash(d):
+            continue
+        if not unique_key(d):
+            continue
+        targets[d.sql_file] = d
+    return targets
+
+
+# -----------------------------------------------------------
+# Writing
+# -----------------------------------------------------------
+def _insert_sql(rule: IngestRule, definition) -> str:
+    table_cols = {c["name"] for c in definition.output_columns["columns"]}
+    cols = [c for c in rule.columns if c == "visit_row_id" or c in table_cols]
+
+    def source(col: str) -> str:
+        if col == "visit_row_id" or col in rule.computed:
+            return f"f.{col}"
+        return f"v.{col}"
+
+    record_cols = ", ".join(
+        ["visit_row_id int"] + [f"{name} {sql_type}" for name, sql_type in rule.computed.items()]
+    )
+    return f"""
+        INSERT INTO {definition.output_table} ({", ".join(cols)})
+        SELECT {", ".join(source(c) for c in cols)}
+        FROM jsonb_to_recordset(CAST(:payload AS jsonb)) AS f({record_cols})
+        JOIN visits v ON v.id = f.visit_row_id
+        ON CONFLICT ({", ".join(unique_key(definition))}) DO NOTHING
+    """
+
+
+async def run_ingest_rules(db, note_ids: list[int]) -> dict:
+    """
+    Evaluate INGEST_RULES over the given notes and insert the findings into
+    each report table. Each rule runs in its own savepoint, so a broken
+    report table is logged and skipped without touching the caller's
+    transaction. Does not commit.
+    """
+    out = {"rule_findings": 0, "rule_errors": 0}
+    if not note_ids:
+        return out
+
+    df = await load_rule_inputs(db, note_ids=note_ids)
+    if df.empty:
+        return out
+
+    targets = await load_rule_targets(db)
+    for rule in INGEST_RULES:
+        definition = targets.get(rule.sql_file)
+        if definition is None:
+            continue
+
+        findings = rule.match(df)
+        if findings.empty:
+            continue
+
+        try:
+            async with db.begin_nested():
+                result = await db.execute(
+                    text(_insert_sql(rule, definition)),
+                    {"payload": findings.to_json(orient="records")},
+                )
+            out["rule_findings"] += int(result.rowcount or 0)
+        except Exception:
+            logger.exception("ingest rule %s failed", rule.sql_file)
+            out["rule_errors"] += 1
+
+    return out
+
+
+# -----------------------------------------------------------
+# Cross-check against the nightly SQL's rows
+# -----------------------------------------------------------
+async def cross_check(db, from_date: date, to_date: date) -> list[dict]:
+    """
+    For visits finalized in the window: findings the rules produce vs rows
+    already in each report table (written by either path). Read-only.
+    """
+    df = await load_rule_inputs(db, from_date=from_date, to_date=to_date)
+    targets = await load_rule_targets(db)
+
+    report = []
+    for rule in INGEST_RULES:
+        definition = targets.get(rule.sql_file)
+        if definition is None:
+            report.append({"sql_file": rule.sql_file, "skipped": "table not built / definition disabled"})
+            continue
+
+        key = unique_key(definition)
+        found = rule.match(df) if not df.empty else pd.DataFrame(columns=key)
+        expected = set(found[key].itertuples(index=False, name=None))
+
+        stored = await db.execute(
+            text(f"""
+                SELECT {", ".join(f"t.{c}" for c in key)}
+                FROM {definition.output_table} t
+                JOIN visits v ON v.id = t.visit_row_id
+                WHERE v.finalized_date BETWEEN :from_date AND :to_date
+            """),
+            {"from_date": from_date, "to_date": to_date},
+        )
+        actual = {tuple(r) for r in stored.all()}
+
+        report.append({
+            "sql_file": rule.sql_file,
+            "rules": len(expected),
+            "table": len(actual),
+            "only_rules": sorted(expected - actual)[:20],
+            "only_table": sorted(actual - expected)[:20],
+        })
+    return report
+
+
+if __name__ == "__main__":
+    import asyncio
+    import argparse
+    from datetime import datetime, timedelta
+
+    from app.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Diff ingest rules against report tables")
+    parser.add_argument("--from", dest="date_from", default=None, help="finalized_date from (YYYY-MM-DD, default yesterday)")
+    parser.add_argument("--to", dest="date_to", default=None, help="finalized_date to (YYYY-MM-DD, default --from)")
+    args = parser.parse_args()
+
+    date_from = (
+        datetime.strptime(args.date_from, "%Y-%m-%d").date()
+        if args.date_from
+        else date.today() - timedelta(days=1)
+    )
+    date_to = datetime.strptime(args.date_to, "%Y-%m-%d").date() if args.date_to else date_from
+
+    async def main():
+        async with SessionLocal() as db:
+            for r in await cross_check(db, date_from, date_to):
+                if "skipped" in r:
+                    print(f"⏭️  {r['sql_file']}: {r['skipped']}")
+                    continue
+                mark = "✅" if not r["only_rules"] and not r["only_table"] else "⚠️"
+                print(f"{mark} {r['sql_file']}: rules={r['rules']} table={r['table']}")
+                if r["only_rules"]:
+                    print(f"    only in rules (sample): {r['only_rules']}")
+                if r["only_table"]:
+                    print(f"    only in table (sample): {r['only_table']}")
+
+    asyncio.run(main())
@@ -1,7 +1,7 @@
 WITH yesterday AS (
     SELECT *
     FROM visits
-    WHERE finalized_date = CURRENT_DATE - INTERVAL '1 day'
+    WHERE finalized_date BETWEEN CAST(:from_date AS date) AND CAST(:to_date AS date)
 ),
 
 flagged AS (
@@ -39,8 +39,4 @@ SELECT
     v.visiting_therapist,
     v.primary_insurance
 FROM flagged v
-WHERE NOT EXISTS (
-    SELECT 1
-    FROM report_97110_97112_same_visit r
-    WHERE r.visit_row_id = v.id
-);
+ON CONFLICT (visit_row_id) DO NOTHING;
@@ -29,10 +29,6 @@ SELECT
     v.visiting_therapist
 FROM visits v
 WHERE 
-    v.finalized_date = CURRENT_DATE - INTERVAL '1 day'  AND 
+    v.finalized_date BETWEEN CAST(:from_date AS date) AND CAST(:to_date AS date)  AND 
     v.cpt_code ILIKE '%97750%'
-  AND NOT EXISTS (
-        SELECT 1
-        FROM report_97750CPT r
-        WHERE r.visit_row_id = v.id
-    );
+ON CONFLICT (visit_row_id) DO NOTHING;
@@ -1,7 +1,7 @@
 WITH target_visits AS (
     SELECT *
     FROM visits
-    WHERE finalized_date = CURRENT_DATE - INTERVAL '1 day'
+    WHERE finalized_date BETWEEN CAST(:from_date AS date) AND CAST(:to_date AS date)
 ),
 
 -- 🧩 Find duplicates by date
@@ -121,8 +121,4 @@ SELECT
     v.primary_insurance,
     v.dup_key
 FROM all_matches v
-WHERE NOT EXISTS (
-    SELECT 1
-    FROM report_double_notes r
-    WHERE r.visit_row_id = v.visit_row_id
-);
+ON CONFLICT (visit_row_id) DO NOTHING;
@@ -1,7 +1,7 @@
 WITH yesterday AS (
     SELECT *
     FROM visits
-    WHERE finalized_date = CURRENT_DATE - INTERVAL '1 day'
+    WHERE finalized_date BETWEEN CAST(:from_date AS date) AND CAST(:to_date AS date)
 ),
 
 split_codes AS (
@@ -76,10 +76,4 @@ SELECT
     pr.visiting_therapist,
     pr.primary_insurance
 FROM parsed pr
-WHERE NOT EXISTS (
-    SELECT 1
-    FROM report_low_cpt_code_use r
-    WHERE r.visit_row_id = pr.visit_row_id
-      AND r.problematic_cpt = pr.problematic_cpt
-      AND r.problematic_amount = pr.problematic_amount
-);
+ON CONFLICT (visit_row_id, problematic_cpt, problematic_amount) DO NOTHING;
@@ -1,7 +1,7 @@
 WITH yesterday AS (
     SELECT *
     FROM visits
-    WHERE finalized_date = CURRENT_DATE - INTERVAL '1 day'
+    WHERE finalized_date BETWEEN CAST(:from_date AS date) AND CAST(:to_date AS date)
       AND COALESCE(hold, false) = false
 ),
 
@@ -38,16 +38,16 @@ overlap_rows AS (
             'Visit period was ', coalesce(b.time_in::text, ''), ' - ', coalesce(b.time_out::text, '')
         ) AS explanation
     FROM yesterday a
+    -- therapist_key / visit_period are generated columns; this join is a
+    -- GiST probe (ix_visits_therapist_period) per window visit, so only
+    -- that therapist's visits overlapping a.visit_period are ever read
     JOIN visits b
-      ON trim(coalesce(a.visiting_therapist, '')) = trim(coalesce(b.visiting_therapist, ''))
+      ON b.therapist_key = a.therapist_key
+     AND b.visit_period && a.visit_period
+     AND b.visit_period IS NOT NULL
+     AND b.hold IS NOT TRUE
      AND a.id < b.id
-     AND COALESCE(b.hold, false) = false
-     AND a.time_in IS NOT NULL
-     AND a.time_out IS NOT NULL
-     AND b.time_in IS NOT NULL
-     AND b.time_out IS NOT NULL
-     AND a.time_in < b.time_out
-     AND b.time_in < a.time_out
+    WHERE a.visit_period IS NOT NULL
 )
 
 INSERT INTO overlapping_visits_by_therapist (
@@ -98,9 +98,4 @@ SELECT
     o.overlap_time_out,
     o.explanation
 FROM overlap_rows o
-WHERE NOT EXISTS (
-    SELECT 1
-    FROM overlapping_visits_by_therapist r
-    WHERE r.visit_row_id = o.visit_row_id
-      AND r.overlap_visit_row_id = o.overlap_visit_row_id
-);
+ON CONFLICT (visit_row_id, overlap_visit_row_id) DO NOTHING;
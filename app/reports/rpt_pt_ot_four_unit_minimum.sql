@@ -1,7 +1,7 @@
 WITH yesterday AS (
     SELECT *
     FROM visits
-    WHERE finalized_date = CURRENT_DATE - INTERVAL '1 day'
+    WHERE finalized_date BETWEEN CAST(:from_date AS date) AND CAST(:to_date AS date)
 ),
 
 filtered AS (
@@ -51,8 +51,4 @@ SELECT
     f.primary_insurance
 FROM filtered f
 WHERE f.total_units < 4
-  AND NOT EXISTS (
-        SELECT 1
-        FROM report_pt_ot_four_unit_minimum r
-        WHERE r.visit_row_id = f.id
-  );
+ON CONFLICT (visit_row_id) DO NOTHING;
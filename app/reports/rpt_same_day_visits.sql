@@ -1,7 +1,7 @@
 WITH yesterday AS (
     SELECT *
     FROM visits
-    WHERE finalized_date = CURRENT_DATE - INTERVAL '1 day'
+    WHERE finalized_date BETWEEN CAST(:from_date AS date) AND CAST(:to_date AS date)
 ),
 
 -- Find (patient_id, note_date) pairs where they appear more than once
@@ -52,8 +52,4 @@ SELECT
     d.cpt_code,
     d.primary_insurance
 FROM dupe_visits d
-WHERE NOT EXISTS (
-    SELECT 1
-    FROM report_same_day_visits r
-    WHERE r.visit_row_id = d.id
-);
+ON CONFLICT (visit_row_id) DO NOTHING;
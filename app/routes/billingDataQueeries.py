@@ -1,7 +1,6 @@
 from datetime import date
 from datetime import date as Date, datetime
-from calendar import monthrange
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
@@ -9,79 +8,125 @@ from app.models.users import User
 from app.dependencies.auth import get_current_user
 
 from app.crud.billingQueries.unpreparedVisits import (
-    count_visits_by_month_three_buckets,
-    count_visits_by_day_three_buckets,
-    fetch_visits_for_day_three_buckets,
     fetch_all_unprepared_visits,
+    count_unprepared_from_stats,
     ISSUE_LABELS,
 )
 
+from app.crud.billingQueries.calendarSummary import SUMMARY_KEYS
+from app.crud.billingQueries.billingDayStats import (
+    refresh_dirty_billing_day_stats,
+    has_dirty_dates,
+    read_year_by_month,
+    read_month_by_day,
+)
+from app.crud.billingQueries.daySummary import fetch_day_summary
+from app.services.calendar_cache import calendar_cache, year_key, month_key, day_key
+from app.services.query_fanout import run_concurrently, ServerTiming
 
-from app.crud.billingQueries.getUnproccessedAR import (
-    calculate_ar_by_month,
-    calculate_ar_by_day
 
-)
 
-from app.crud.billingQueries.sentToBillingVisits import (
-    count_sent_to_billing_visits_by_month,
-    count_sent_to_billing_visits_by_day,
-    fetch_sent_to_billing_visits_for_day,
-    count_billed_visits_by_month,
-    count_billed_visits_by_day,
-    fetch_billed_visits_for_day,
-)
+router = APIRouter()
 
 
+def _billing_block(counts: dict) -> dict:
+    return {
+        "notReadyToBill": counts.get("unprepared", 0),
+        "heldForDeductible": counts.get("held_for_deductible", 0),
+        "readyToBill": counts.get("ready_to_bill", 0),
+        "sentToBilling": counts.get("sent_to_billing", 0),
+        "billed": counts.get("billed", 0),
+        "issues": counts.get("issues", 0),
+        "paid": counts.get("paid", 0),
+        "denied": counts.get("denied", 0),
+    }
 
-router = APIRouter()
+
+def _dollars(value) -> int:
+    # stats keep amounts to the cent; the calendar reports whole dollars
+    return int(round(value or 0))
+
+
+def _reconcile_block(counts: dict) -> dict:
+    return {
+        "ar": _dollars(counts.get("ar", 0)),
+        "paid": _dollars(counts.get("paid_amount", 0)),
+        "reconciled": counts.get("reconciled", 0),
+        "denied": counts.get("denied", 0),
+    }
 
 @router.get("/billing/unprepared")
 async def billing_unprepared_visits(
+    response: Response,
     start_date: Date | None = Query(None, description="YYYY-MM-DD (optional)"),
     end_date: Date | None = Query(None, description="YYYY-MM-DD (optional)"),
     limit: int = Query(500, ge=1, le=5000),
-    offset: int = Query(0, ge=0),
+    offset: int = Query(0, ge=0, description="Legacy paging; prefer cursor"),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    include_total: bool = Query(True, description="Skip the total when not needed"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
     Dedicated endpoint for Unprepared tab:
     returns unprepared visits independent of a specific calendar day.
+    Page with the returned next_cursor (null on the last page).
     """
     if start_date and end_date and start_date > end_date:
         raise HTTPException(status_code=400, detail="start_date cannot be after end_date")
 
-    try:
-        visits, total = await fetch_all_unprepared_visits(
-            db=db,
+    timing = ServerTiming()
+
+    # Page rows and the total are independent: run them on separate connections.
+    # The fanout sessions only read, so stale stats dates are refreshed here first.
+    queries = {
+        "rows": lambda s: fetch_all_unprepared_visits(
+            db=s,
             start_date=start_date,
             end_date=end_date,
             limit=limit,
             offset=offset,
-        )
+            cursor=cursor,
+            include_total=False,
+        ),
+    }
+    if include_total:
+        queries["total"] = lambda s: count_unprepared_from_stats(s, start_date, end_date)
 
-        return {
-            "filters": {
-                "start_date": start_date,
-                "end_date": end_date,
-            },
-            "issue_labels": ISSUE_LABELS,
-            "total": total,
-            "count": len(visits),
-            "limit": limit,
-            "offset": offset,
-            "visits": visits,
-        }
+    try:
+        if include_total:
+            with timing.step("refresh_stats"):
+                await refresh_dirty_billing_day_stats(db)
+        fan = await run_concurrently(queries, label="billing_unprepared")
+        visits, _, next_cursor = fan.results["rows"]
+        total = fan.results.get("total")
+        response.headers["Server-Timing"] = ", ".join(h for h in (timing.header(), fan.server_timing()) if h)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Failed to fetch unprepared visits: {e}",
         )
 
+    return {
+        "filters": {
+            "start_date": start_date,
+            "end_date": end_date,
+        },
+        "issue_labels": ISSUE_LABELS,
+        "total": total,
+        "count": len(visits),
+        "limit": limit,
+        "offset": offset,
+        "next_cursor": next_cursor,
+        "visits": visits,
+    }
+
 
 @router.get("/billing/calendar/year-summary")
 async def billing_calendar_year_summary(
+    response: Response,
     year: int = Query(..., ge=2000, le=2100),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -91,42 +136,38 @@ async def billing_calendar_year_summary(
     Unbilled (billed=false AND hold=false).
     """
 
+    cached = calendar_cache.get(year_key(year))
+    if cached is not None:
+        response.headers["Server-Timing"] = 'cache;desc="hit"'
+        return cached
+
+    timing = ServerTiming()
     try:
-        # ✅ delegate to CRUD
-        by_month = await count_visits_by_month_three_buckets(db, year)
-        sent_to_billing_by_month = await count_sent_to_billing_visits_by_month(db, year)
-        billed_by_month = await count_billed_visits_by_month(db, year)
-        ar_by_month = await calculate_ar_by_month(db, year)
+        # ✅ pre-aggregated per-day stats (stale dates refreshed first; the
+        #    read depends on the refresh, so these stay sequential)
+        with timing.step("refresh_stats"):
+            await refresh_dirty_billing_day_stats(db)
+        with timing.step("read_stats"):
+            # checked before the read: dates a concurrent drain still holds
+            # show up here, and once it commits the read sees its stats
+            cacheable = not await has_dirty_dates(db, date(year, 1, 1), date(year + 1, 1, 1))
+            by_month = await read_year_by_month(db, year)
 
         payload = []
         for month in range(1, 13):
-            m_counts = by_month.get(month, {})
-            unprepared = m_counts.get("unprepared", 0)
-            held = m_counts.get("held_for_deductible", 0)
-            ready = m_counts.get("ready_to_bill", 0)
+            m_counts = by_month[month]
             payload.append(
                 {
                     "year": year,
                     "month": month,
-                    "billing": {
-                        "notReadyToBill": unprepared,
-                        "heldForDeductible": held,
-                        "readyToBill": ready,
-                        "sentToBilling": sent_to_billing_by_month.get(month, 0),
-                        "billed": billed_by_month.get(month, 0),
-                        "issues": 0,
-                        "paid": 0,
-                        "denied": 0,
-                    },
-                    "reconcile": {
-                        "ar": ar_by_month.get(month, 0),
-                        "paid": 0,
-                        "reconciled": 0,
-                        "denied": 0,
-                    },
+                    "billing": _billing_block(m_counts),
+                    "reconcile": _reconcile_block(m_counts),
                 }
             )
 
+        if cacheable:
+            calendar_cache.set(year_key(year), payload)
+        response.headers["Server-Timing"] = timing.header()
         return payload
 
     except Exception as e:
@@ -138,6 +179,7 @@ async def billing_calendar_year_summary(
 
 @router.get("/billing/calendar/month-summary")
 async def billing_calendar_month_summary(
+    response: Response,
     year: int = Query(..., ge=2000, le=2100),
     month: int = Query(..., ge=1, le=12),
     db: AsyncSession = Depends(get_db),
@@ -147,67 +189,44 @@ async def billing_calendar_month_summary(
     Month view summary + day-by-day buckets.
     """
 
-    try:
-        # ✅ delegate to CRUD
-        by_day = await count_visits_by_day_three_buckets(db, year, month)
-        sent_to_billing_by_day = await count_sent_to_billing_visits_by_day(db, year, month)
-        billed_by_day = await count_billed_visits_by_day(db, year, month)
-        ar_by_day = await calculate_ar_by_day(db, year, month)
+    cached = calendar_cache.get(month_key(year, month))
+    if cached is not None:
+        response.headers["Server-Timing"] = 'cache;desc="hit"'
+        return cached
 
-        days_in_month = monthrange(year, month)[1]
-        unprepared_month_total = sum(v.get("unprepared", 0) for v in by_day.values())
-        held_month_total = sum(v.get("held_for_deductible", 0) for v in by_day.values())
-        ready_month_total = sum(v.get("ready_to_bill", 0) for v in by_day.values())
-        sent_to_billing_month_total = sum(sent_to_billing_by_day.values())
-        billed_month_total = sum(billed_by_day.values())
+    timing = ServerTiming()
+    try:
+        # ✅ pre-aggregated per-day stats (stale dates refreshed first)
+        with timing.step("refresh_stats"):
+            await refresh_dirty_billing_day_stats(db)
+        with timing.step("read_stats"):
+            month_end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+            cacheable = not await has_dirty_dates(db, date(year, month, 1), month_end)
+            by_day = await read_month_by_day(db, year, month)
 
+        month_totals = {k: sum(v[k] for v in by_day.values()) for k in SUMMARY_KEYS}
 
         days_payload = []
-        for d in range(1, days_in_month + 1):
-            d_counts = by_day.get(d, {})
+        for d, d_counts in by_day.items():
             days_payload.append(
                 {
                     "day": d,
-                    "billing": {
-                        "notReadyToBill": d_counts.get("unprepared", 0),
-                        "heldForDeductible": d_counts.get("held_for_deductible", 0),
-                        "readyToBill": d_counts.get("ready_to_bill", 0),
-                        "sentToBilling": sent_to_billing_by_day.get(d, 0),
-                        "billed": billed_by_day.get(d, 0),
-                        "issues": 0,
-                        "paid": 0,
-                        "denied": 0,
-                    },
-                    "reconcile": {
-                        "ar": ar_by_day.get(d, 0),
-                        "paid": 0,
-                        "reconciled": 0,
-                        "denied": 0,
-                    },
+                    "billing": _billing_block(d_counts),
+                    "reconcile": _reconcile_block(d_counts),
                 }
             )
 
-        return {
+        payload = {
             "year": year,
             "month": month,
-            "billing": {
-                "notReadyToBill": unprepared_month_total,
-                "heldForDeductible": held_month_total,
-                "readyToBill": ready_month_total,
-                "sentToBilling": sent_to_billing_month_total,
-                "billed": billed_month_total,
-                "issues": 0,
-                "paid": 0,
-                "denied": 0,
-            },
-            "reconcile": {
-                "ar": 0,
-                "paid": 0,
-                "reconciled": 0,
-                "denied": 0,
-            },
+            "billing": _billing_block(month_totals),
+            "reconcile": _reconcile_block(month_totals),
             "days": days_payload,
         }
+        if cacheable:
+            calendar_cache.set(month_key(year, month), payload)
+        response.headers["Server-Timing"] = timing.header()
+        return payload
 
     except Exception as e:
         raise HTTPException(
@@ -219,13 +238,14 @@ async def billing_calendar_month_summary(
 
 @router.get("/billing/calendar/day-summary")
 async def billing_calendar_day_summary(
+    response: Response,
     date: str = Query(..., description="YYYY-MM-DD"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
     Returns a single day summary for calendar day view.
-    Includes visit rows (currently only Unprepared bucket logic).
+    Counts and visit rows come from one day-scoped query.
     """
     try:
         # Parse date string safely
@@ -234,43 +254,28 @@ async def billing_calendar_day_summary(
         month = dt.month
         day = dt.day
 
-        # Fetch month/day maps from CRUD (your existing functions)
-        by_day = await count_visits_by_day_three_buckets(db, year, month)
-        day_counts = by_day.get(day, {})
-
-        sent_to_billing_by_day = await count_sent_to_billing_visits_by_day(db, year, month)
-        ar_by_day = await calculate_ar_by_day(db, year, month)
+        cached = calendar_cache.get(day_key(dt))
+        if cached is not None:
+            response.headers["Server-Timing"] = 'cache;desc="hit"'
+            return cached
 
-        three_bucket_visits = await fetch_visits_for_day_three_buckets(db, dt)
-        sent_visits = await fetch_sent_to_billing_visits_for_day(db, dt)
-        billed_by_day = await count_billed_visits_by_day(db, year, month)
-        billed_visits = await fetch_billed_visits_for_day(db, dt)
-        visits = three_bucket_visits + sent_visits + billed_visits
+        # ✅ counts + rows for this note_date only, one query
+        timing = ServerTiming()
+        with timing.step("day_summary"):
+            day_counts, visits = await fetch_day_summary(db, dt)
 
-
-        return {
+        payload = {
             "year": year,
             "month": month,
             "day": day,
-            "billing": {
-                "notReadyToBill": day_counts.get("unprepared", 0),
-                "heldForDeductible": day_counts.get("held_for_deductible", 0),
-                "readyToBill": day_counts.get("ready_to_bill", 0),
-                "sentToBilling": sent_to_billing_by_day.get(day, 0),
-                "billed": billed_by_day.get(day, 0),
-                "issues": 0,
-                "paid": 0,
-                "denied": 0,
-            },
-            "reconcile": {
-                "ar": ar_by_day.get(day, 0),
-                "paid": 0,
-                "reconciled": 0,
-                "denied": 0,
-            },
+            "billing": _billing_block(day_counts),
+            "reconcile": _reconcile_block(day_counts),
             # ✅ NEW
             "visits": visits,
         }
+        calendar_cache.set(day_key(dt), payload)
+        response.headers["Server-Timing"] = timing.header()
+        return payload
 
     except Exception as e:
         raise HTTPException(
@@ -3,6 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.services.biling_import import parse_billed_excel, import_billed_notes_from_rows
+from app.services.calendar_cache import invalidate_note_dates
 
 router = APIRouter(prefix="/billing", tags=["Billing"])
 
@@ -39,6 +40,8 @@ async def import_billed_excel(
         await db.rollback()
         raise
 
+    invalidate_note_dates(result.touched_note_dates)
+
     return {
         "ok": True,
         "processed": result.processed,
@@ -18,6 +18,7 @@ from app.models.visits import Visit
 from app.models.patients import Patient
 from app.dependencies.auth import get_current_user
 from app.models.users import User
+from app.services.typeahead import typeahead_index
 
 router = APIRouter()
 
@@ -701,32 +702,10 @@ async def download_timely_filling_notes(
 
 @router.get("/primary-insurances")
 async def get_primary_insurances(
-    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Get distinct primary insurance names from visits and patients tables.
+    Get distinct primary insurance names from visits and patients tables
+    (both feed the primary_insurance typeahead kind at ingest).
     """
-    # Get from visits table
-    visits_stmt = select(Visit.primary_insurance).distinct().where(
-        Visit.primary_insurance.isnot(None),
-        Visit.primary_insurance != ""
-    )
-
-    # Get from patients table
-    patients_stmt = select(Patient.primary_insurance).distinct().where(
-        Patient.primary_insurance.isnot(None),
-        Patient.primary_insurance != ""
-    )
-
-    visits_result = await db.execute(visits_stmt)
-    patients_result = await db.execute(patients_stmt)
-
-    visits_insurances = [row[0] for row in visits_result.fetchall() if row[0]]
-    patients_insurances = [row[0] for row in patients_result.fetchall() if row[0]]
-
-    # Combine and deduplicate
-    all_insurances = list(set(visits_insurances + patients_insurances))
-    all_insurances.sort()
-
-    return {"insurances": all_insurances}
\ No newline at end of file
+    return {"insurances": await typeahead_index.values("primary_insurance")}
\ No newline at end of file
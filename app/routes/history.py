@@ -1,59 +1,53 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from sqlalchemy import cast, String, or_
-from typing import Optional, Sequence
+from typing import Optional
 
 from app.database import get_db
 from app.models.users import User
-from app.models.visits import Visit
 from app.dependencies.auth import get_current_user
+from app.crud.visit_search import search_visit_history
 
 router = APIRouter()
 
 @router.get("/payroll/history")
 async def get_payroll_history(
-    query: Optional[str] = Query(None, description="Search by patient_id, name, or invoice"),
+    response: Response,
+    query: Optional[str] = Query(None, description="Search by patient_id, note_id, visit_uid or name"),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),  # 🔐 Requires valid login
 ):
     """
-    Return visit history with limited fields.
+    Return visit history with limited fields, one page at a time.
+    The body stays a plain list; the next page's cursor is in the
+    X-Next-Cursor header (absent on the last page).
     If login expired → 401 Unauthorized.
     """
 
-    stmt = select(Visit)
+    try:
+        visits, next_cursor = await search_visit_history(db, query, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    # 🔍 Search support
-    if query:
-        like_pattern = f"%{query}%"
-        stmt = stmt.where(
-            or_(
-                cast(Visit.patient_id, String).ilike(like_pattern),
-                cast(Visit.note_id, String).ilike(like_pattern),
-                Visit.first_name.ilike(like_pattern),
-                Visit.last_name.ilike(like_pattern)
-            )
-        )
-
-    result = await db.execute(stmt)
-    visits: Sequence[Visit] = result.scalars().all()
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
 
     return [
         {
-            "visit_uid": v.visit_uid,
-            "note_id": v.note_id,
-            "id": v.id,
-            "patient_id": v.patient_id,
-            "first_name": v.first_name,
-            "last_name": v.last_name,
-            "note": v.note,
-            "note_date": str(v.note_date) if v.note_date else None,
-            "visit_type": v.visit_type,
-            "case_description": v.case_description,
-            "note_number": v.note_number,
-            "visiting_therapist":v.visiting_therapist,
-            "supervising_therapist":str(v.supervising_therapist) if v.supervising_therapist else None,
+            "visit_uid": v["visit_uid"],
+            "note_id": v["note_id"],
+            "id": v["id"],
+            "patient_id": v["patient_id"],
+            "first_name": v["first_name"],
+            "last_name": v["last_name"],
+            "note": v["note"],
+            "note_date": str(v["note_date"]) if v["note_date"] else None,
+            "visit_type": v["visit_type"],
+            "case_description": v["case_description"],
+            "note_number": v["note_number"],
+            "visiting_therapist":v["visiting_therapist"],
+            "supervising_therapist":str(v["supervising_therapist"]) if v["supervising_therapist"] else None,
         }
         for v in visits
     ]
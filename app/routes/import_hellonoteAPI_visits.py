@@ -6,9 +6,7 @@ from app.models.users import User
 from app.dependencies.auth import get_current_user
 
 # --- Local imports ---
-from app.crud.visits_via_api import fetch_all_hellonote_visits
-from app.crud.visits import insert_visit_rows
-from app.helloNoteApi.visits_mapper import map_hellonote_list_to_visits
+from app.services.hellonote_pipeline import run_hellonote_import_pipeline
 from app.powerAutomate.teamsMessageMyself import notify_teams  # ✅ new import
 
 import os
@@ -28,50 +26,43 @@ async def import_hellonote_visits(
 ):
     """
     Fetch all HelloNote visits between dateFrom/dateTo, map them to DB structure,
-    and insert them using insert_visit_rows().
+    and insert them page by page through the import pipeline.
     """
     stage = "import_hellonote_visits"
     script_name = os.path.basename(__file__)
 
     try:
-        # 1️⃣ Fetch all HelloNote visits into a DataFrame
-        df = fetch_all_hellonote_visits(
+        # 1️⃣ Fetch → map → insert, one page at a time
+        result = await run_hellonote_import_pipeline(
+            db,
             date_from=dateFrom,
             date_to=dateTo,
+            uploaded_by=current_user.id,
             isAllStatus=isAllStatus,
             isAllStatusWithHold=isAllStatusWithHold,
             isFinalizedDate=isFinalizedDate,
         )
-        if df.empty:
+        if not result.total_count:
             msg = f"No visits found for range {dateFrom}–{dateTo}"
             notify_teams("success", stage, msg, script_name)
             return {"message": msg, "inserted": 0}
 
-        # 2️⃣ Convert DataFrame → list[dict]
-        hellonote_items = df.to_dict(orient="records")
-
-        # 3️⃣ Map HelloNote → Visit structure
-        mapped_visits = map_hellonote_list_to_visits(hellonote_items)
-        for visit in mapped_visits:
-            visit["uploaded_by"] = current_user.id
-            visit["visit_uid"] = None  # Let insert_visit_rows generate it
-
-        # 4️⃣ Insert visits into database
-        result = await insert_visit_rows(db, mapped_visits, uploaded_by=current_user.id)
+        totals = result.totals
+        skipped = totals.get("skipped_notes", [])
 
         msg = (
-            f"Imported {result['inserted_count']} visits "
-            f"(skipped {result['skipped_notes']}, "
-            f"new UIDs {result['visit_uids_created']})"
+            f"Imported {totals.get('inserted_count', 0)} visits "
+            f"(skipped {skipped}, "
+            f"new UIDs {totals.get('visit_uids_created', 0)})"
         )
         print(f"✅ {msg}")
         notify_teams("success", stage, msg, script_name)
 
         return {
             "message": msg,
-            "inserted_count": result["inserted_count"],
-            "skipped": result["skipped_notes"],
-            "visit_uids_created": result["visit_uids_created"],
+            "inserted_count": totals.get("inserted_count", 0),
+            "skipped": skipped,
+            "visit_uids_created": totals.get("visit_uids_created", 0),
         }
 
     except Exception as e:
@@ -1,4 +1,3 @@
-from datetime import date, datetime
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -8,24 +7,14 @@ from app.dependencies.auth import get_current_user
 from app.models.users import User
 from app.models.visits import Visit  # <-- adjust to your actual model import
 from app.schemas.visits import VisitBulkUpdateIn, VisitDetailsOut, VisitDetailsUpdate
+from app.crud.billingQueries.visitDerivedFields import refresh_visit_derived_fields
+from app.services.calendar_cache import invalidate_note_dates
+from app.crud.typeahead import refresh_typeahead_values
+from app.crud.visit_edits import apply_visit_updates, clean_visit_updates
+from app.services.typeahead import typeahead_index
 
 router = APIRouter(prefix="/visits", tags=["Visits"])
 
-ALLOWED_UPDATE_FIELDS = {
-    "primary_insurance",
-    "secondary_insurance",
-    "primary_ins_id",
-    "secondary_ins_id",
-    "ref_provider_npi",
-    "referring_provider",
-    "diagnosis",
-    "visiting_therapist",
-    "cpt_code",
-    "auth_number",
-    "medical_diagnosis",
-    "rendering_provider_npi",
-}
-
 
 @router.get("/note-details", response_model=VisitDetailsOut)
 async def get_note_details(
@@ -50,31 +39,15 @@ async def get_note_details(
 
 @router.get("/insurance-options")
 async def get_insurance_options(
-    db: AsyncSession = Depends(get_db),
     _user: User = Depends(get_current_user),
 ):
     """
-    Return unique insurance values for searchable dropdowns.
+    Return unique insurance values for searchable dropdowns
+    (from the typeahead index, not a DISTINCT over visits).
     """
-    primary_stmt = (
-        select(Visit.primary_insurance)
-        .where(Visit.primary_insurance.is_not(None), Visit.primary_insurance != "")
-        .distinct()
-        .order_by(Visit.primary_insurance.asc())
-    )
-    secondary_stmt = (
-        select(Visit.secondary_insurance)
-        .where(Visit.secondary_insurance.is_not(None), Visit.secondary_insurance != "")
-        .distinct()
-        .order_by(Visit.secondary_insurance.asc())
-    )
-
-    primary_rows = (await db.execute(primary_stmt)).scalars().all()
-    secondary_rows = (await db.execute(secondary_stmt)).scalars().all()
-
     return {
-        "primary_insurance": [v for v in primary_rows if v],
-        "secondary_insurance": [v for v in secondary_rows if v],
+        "primary_insurance": await typeahead_index.values("primary_insurance"),
+        "secondary_insurance": await typeahead_index.values("secondary_insurance"),
     }
 
 
@@ -95,22 +68,17 @@ async def update_note_details(
     if not visit:
         raise HTTPException(status_code=404, detail=f"Visit with note_id={note_id} not found")
 
-    updates = payload.model_dump(exclude_unset=True)
-    for key, value in updates.items():
-        if key not in ALLOWED_UPDATE_FIELDS or not hasattr(visit, key):
-            continue
-
-        # Frontend sends empty string for cleared fields; coerce to null where valid.
-        if value == "":
-            current_value = getattr(visit, key, None)
-            if isinstance(current_value, (bool, int, float, date, datetime)):
-                value = None
-            else:
-                value = None
-
-        setattr(visit, key, value)
+    updates = clean_visit_updates(payload.model_dump(exclude_unset=True))
+    touched = await apply_visit_updates(
+        db, [note_id], updates, source="note_details", edited_by=_user.id
+    )
 
+    if touched:
+        await refresh_visit_derived_fields(db, note_ids=[note_id])
+        await refresh_typeahead_values(db, note_ids=[note_id])
     await db.commit()
+    invalidate_note_dates(d for _, d in touched)
+    typeahead_index.mark_stale()
     await db.refresh(visit)
     return visit
 
@@ -131,30 +99,24 @@ async def bulk_update_note_details(
     if not note_ids:
         raise HTTPException(status_code=400, detail="No valid note_ids provided")
 
-    stmt = select(Visit).where(Visit.note_id.in_(note_ids))
-    rows = (await db.execute(stmt)).scalars().all()
-    by_note_id = {int(v.note_id): v for v in rows if v.note_id is not None}
-
-    updates = payload.updates.model_dump(exclude_unset=True)
-    applied_fields = [k for k in updates.keys() if k in ALLOWED_UPDATE_FIELDS]
+    updates = clean_visit_updates(payload.updates.model_dump(exclude_unset=True))
+    applied_fields = list(updates)
     if not applied_fields:
         raise HTTPException(status_code=400, detail="No allowed update fields provided")
 
-    updated_count = 0
-    for note_id in note_ids:
-        visit = by_note_id.get(note_id)
-        if not visit:
-            continue
-        for key in applied_fields:
-            value = updates[key]
-            if value == "":
-                value = None
-            setattr(visit, key, value)
-        updated_count += 1
+    # One UPDATE ... RETURNING (+ audit rows) for every note_id
+    touched = await apply_visit_updates(
+        db, note_ids, updates, source="bulk_update", edited_by=_user.id
+    )
+    updated_ids = [n for n, _ in touched]
 
+    await refresh_visit_derived_fields(db, note_ids=updated_ids)
+    await refresh_typeahead_values(db, note_ids=updated_ids)
     await db.commit()
+    invalidate_note_dates(d for _, d in touched)
+    typeahead_index.mark_stale()
     return {
         "requested_note_ids": len(note_ids),
-        "updated_rows": updated_count,
+        "updated_rows": len(touched),
         "applied_fields": applied_fields,
     }
@@ -0,0 +1,61 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.models.users import User
+from app.dependencies.auth import get_current_user
+from app.crud.report_runs import list_report_runs, get_report_run, report_duration_trends
+
+router = APIRouter()
+
+
+@router.get("/reports/runs")
+async def get_report_runs(
+    code: Optional[str] = Query(None, description="report_definitions.code"),
+    status: Optional[str] = Query(None, description="ok | ensure_failed | sql_missing | failed"),
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    """Report run ledger written by dailyAutomations/dailyReports.py, newest first."""
+    return await list_report_runs(db, code=code, status=status, limit=limit, offset=offset)
+
+
+@router.get("/reports/runs/trends")
+async def get_report_run_trends(
+    days: int = Query(30, ge=1, le=365),
+    recent_days: int = Query(7, ge=1, le=90),
+    code: Optional[str] = Query(None),
+    include_backfills: bool = Query(False, description="Also count multi-day --from/--to runs"),
+    db: AsyncSession = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    """
+    Per-report duration per day, and the median of the last recent_days
+    against the rest of the window. Slowest-growing reports come first.
+    """
+    if recent_days >= days:
+        raise HTTPException(status_code=400, detail="recent_days must be smaller than days")
+    return await report_duration_trends(
+        db,
+        days=days,
+        recent_days=recent_days,
+        code=code,
+        include_backfills=include_backfills,
+    )
+
+
+@router.get("/reports/runs/{run_id}")
+async def get_report_run_detail(
+    run_id: int,
+    db: AsyncSession = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    """One run, including the captured EXPLAIN (ANALYZE, BUFFERS) plan if any."""
+    run = await get_report_run(db, run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Report run not found")
+    return run
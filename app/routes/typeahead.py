@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.models.users import User
+from app.dependencies.auth import get_current_user
+from app.crud.typeahead import TYPEAHEAD_KINDS
+from app.services.typeahead import typeahead_index
+
+router = APIRouter()
+
+
+@router.get("/typeahead")
+async def get_typeahead(
+    kind: str = Query(..., description=" | ".join(TYPEAHEAD_KINDS)),
+    q: str = Query("", max_length=100, description="Prefix; 3+ characters also match substrings/typos"),
+    limit: int = Query(20, ge=1, le=100),
+    _user: User = Depends(get_current_user),
+):
+    """
+    Dropdown suggestions from the in-memory typeahead index.
+    For kind=patient, id is the patient id; otherwise it is 0.
+    """
+    if kind not in TYPEAHEAD_KINDS:
+        raise HTTPException(status_code=400, detail=f"kind must be one of {list(TYPEAHEAD_KINDS)}")
+
+    hits = await typeahead_index.search(kind, q.strip(), limit=limit)
+    return {
+        "kind": kind,
+        "q": q,
+        "items": [{"value": value, "id": ref_id} for value, ref_id in hits],
+    }
@@ -10,6 +10,8 @@ from app.database import get_db
 from app.models.users import User
 from app.models.visits import Visit
 from app.dependencies.auth import get_current_user
+from app.crud.billingQueries.visitDerivedFields import refresh_visit_derived_fields
+from app.services.calendar_cache import invalidate_note_dates
 from app.routes.upload_visit_file import (
     ALLOWED_EXTENSIONS, MAX_FILE_SIZE_MB,
     normalize_and_map_columns, clean_dataframe_for_db,
@@ -60,6 +62,8 @@ async def upload_hold_report(
 
     updated = 0
     inserted = 0
+    inserted_note_ids = []
+    touched_note_dates = set()
 
     for row in rows:
         note_id = row.get("note_id")
@@ -83,15 +87,20 @@ async def upload_hold_report(
                 )
             )
             await db.execute(q)
+            touched_note_dates.add(visit.note_date)
             updated += 1
         else:
             # If not exists → insert the row as new
             row["uploaded_by"] = current_user.id
             stmt = insert(Visit).values(row)
             await db.execute(stmt)
+            inserted_note_ids.append(note_id)
+            touched_note_dates.add(row.get("note_date"))
             inserted += 1
 
+    await refresh_visit_derived_fields(db, note_ids=inserted_note_ids)
     await db.commit()
+    invalidate_note_dates(touched_note_dates)
 
     return {
         "message": f"✅ Processed {len(rows)} hold rows",
@@ -12,6 +12,8 @@ import math
 
 from app.database import get_db
 from app.models.millin_invoices import MillinInvoice
+from app.crud.billingQueries.invoiceMatches import refresh_invoice_matches
+from app.services.calendar_cache import invalidate_note_dates
 
 router = APIRouter(prefix="/millin-invoices", tags=["Millin Invoices"])
 
@@ -441,9 +443,17 @@ async def import_millin_invoices(
         print(f"[update] bulk full update rows={len(payload)}")
         await db.execute(sql, {"payload": json.dumps(payload), "now": now})
 
+    # Re-match visits for every patient in this upload (new and changed invoices)
+    upload_patient_ids = []
+    if "patient_id" in df.columns:
+        upload_patient_ids = [int(p) for p in df["patient_id"].tolist() if pd.notna(p)]
+    matches = await refresh_invoice_matches(db, patient_ids=upload_patient_ids)
+    print(f"[match] matched={matches['matched']} removed={matches['removed']}")
+
     print("\n[import] committing transaction...")
     await db.commit()
     print("[import] commit complete")
+    invalidate_note_dates(matches["note_dates"])
 
     result = {
         "inserted": inserted,
@@ -453,6 +463,7 @@ async def import_millin_invoices(
         "skipped": skipped,
         "total_rows": original_row_count,
         "invalid_conversion_counts": invalid_counts,
+        "visits_matched": matches["matched"],
     }
 
     print(f"[import] result={result}")
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, File, UploadFile, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.dialects.postgresql import insert
-from sqlalchemy import func
+from sqlalchemy import func, select
 from pathlib import Path
 from io import BytesIO
 import pandas as pd
@@ -13,7 +13,12 @@ from typing import Any
 from app.database import get_db
 from app.models.users import User
 from app.models.patients import Patient
+from app.models.visits import Visit
 from app.dependencies.auth import get_current_user
+from app.crud.billingQueries.visitDerivedFields import refresh_visit_derived_fields
+from app.crud.typeahead import refresh_typeahead_values
+from app.services.typeahead import typeahead_index
+from app.services.calendar_cache import invalidate_note_dates
 
 router = APIRouter()
 
@@ -204,12 +209,31 @@ async def upload_patients_file(
     if not cleaned_rows:
         raise HTTPException(status_code=400, detail="No valid rows found (all missing patient id).")
 
+    touched_note_dates: set = set()
     try:
         for batch in chunked(cleaned_rows, BATCH_SIZE):
+            patient_ids = [r["id"] for r in batch]
             stmt = build_upsert_stmt(batch)
             await db.execute(stmt)
+            # met_deductible may have changed / patient may be new for existing visits
+            await refresh_visit_derived_fields(db, patient_ids=patient_ids)
+            await refresh_typeahead_values(db, patient_ids=patient_ids)
+
+            # Dates whose held/ready split may have moved (only unbilled visits care)
+            touched = await db.execute(
+                select(Visit.note_date)
+                .where(
+                    Visit.patient_id.in_(patient_ids),
+                    Visit.billed.is_(False),
+                    Visit.note_date.is_not(None),
+                )
+                .distinct()
+            )
+            touched_note_dates.update(touched.scalars().all())
 
         await db.commit()
+        typeahead_index.mark_stale()
+        invalidate_note_dates(touched_note_dates)
 
     except IntegrityError as e:
         await db.rollback()
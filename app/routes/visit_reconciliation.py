@@ -0,0 +1,36 @@
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.models.users import User
+from app.dependencies.auth import get_current_user
+from app.crud.visit_reconciliation import list_reconciliation
+
+router = APIRouter()
+
+
+@router.get("/visits/reconciliation")
+async def get_visit_reconciliation(
+    status: Optional[str] = Query("missing", description="missing | resolved (empty for all)"),
+    date_from: Optional[date] = Query(None, description="note_date from (inclusive)"),
+    date_to: Optional[date] = Query(None, description="note_date to (inclusive)"),
+    limit: int = Query(200, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    """
+    Notes that exist in visits but were not returned by HelloNote
+    (written by helloNoteApi/checkDeletedItems.py).
+    """
+    return await list_reconciliation(
+        db,
+        status=status or None,
+        date_from=date_from,
+        date_to=date_to,
+        limit=limit,
+        offset=offset,
+    )
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date, datetime
 from io import BytesIO
 from typing import Any, Dict, List, Optional, Tuple
@@ -21,6 +21,9 @@ class ImportBilledResult:
     missing_note_ids: List[int]
     duplicate_note_ids: List[int]
     already_billed_note_ids: List[int]
+    # note_dates of the visits marked billed; the caller invalidates the
+    # calendar cache for these once it has committed
+    touched_note_dates: List[date] = field(default_factory=list)
 
 
 def _pick_col(df: pd.DataFrame, candidates: List[str]) -> Optional[str]:
@@ -88,9 +91,12 @@ async def import_billed_notes_from_rows(
     note_ids = [nid for nid, _ in rows]
 
     res = await db.execute(
-        select(Visit.note_id, Visit.billed).where(Visit.note_id.in_(note_ids))
+        select(Visit.note_id, Visit.billed, Visit.note_date).where(Visit.note_id.in_(note_ids))
     )
-    existing_map: Dict[int, bool] = {int(nid): bool(billed) for nid, billed in res.all()}
+    existing_rows = res.all()
+    existing_map: Dict[int, bool] = {int(nid): bool(billed) for nid, billed, _ in existing_rows}
+    note_dates: Dict[int, Optional[date]] = {int(nid): nd for nid, _, nd in existing_rows}
+    touched_note_dates: set[date] = set()
 
     missing_note_ids = [nid for nid in note_ids if nid not in existing_map]
 
@@ -127,6 +133,8 @@ async def import_billed_notes_from_rows(
 
         created += 1
         updated += 1
+        if note_dates.get(note_id) is not None:
+            touched_note_dates.add(note_dates[note_id])
 
     return ImportBilledResult(
         processed=created,
@@ -135,4 +143,5 @@ async def import_billed_notes_from_rows(
         missing_note_ids=missing_note_ids,
         duplicate_note_ids=[],
         already_billed_note_ids=already_billed,
+        touched_note_dates=sorted(touched_note_dates),
     )
\ No newline at end of file
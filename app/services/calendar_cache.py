@@ -0,0 +1,177 @@
+"""
+Response cache for /billing/calendar/* keyed by year / month / day.
+
+Write paths call invalidate_note_dates() after they commit, which drops the
+year, month and day entries covering each touched note_date.
+
+Exact invalidation across processes needs REDIS_URL: every process then
+shares one cache and one set of invalidations. Without it the cache is
+per-process, so invalidations from cron jobs (the dailyAutomations
+imports) never reach the API process and its entries stay stale for up
+to CALENDAR_CACHE_TTL_SECONDS. A warning is logged at startup in that
+case.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from datetime import date, datetime
+from typing import Any, Iterable, Optional
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "billing_cal"
+
+
+def year_key(year: int) -> str:
+    return f"{KEY_PREFIX}:year:{year}"
+
+
+def month_key(year: int, month: int) -> str:
+    return f"{KEY_PREFIX}:month:{year}-{month:02d}"
+
+
+def day_key(dt: date) -> str:
+    return f"{KEY_PREFIX}:day:{dt.isoformat()}"
+
+
+def keys_for_date(dt: date) -> list[str]:
+    return [year_key(dt.year), month_key(dt.year, dt.month), day_key(dt)]
+
+
+def _as_date(value: Any) -> Optional[date]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return datetime.fromisoformat(str(value)[:10]).date()
+    except ValueError:
+        return None
+
+
+class _MemoryBackend:
+    def __init__(self):
+        self._data: dict[str, tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is None:
+                return None
+            expires_at, value = hit
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+
+    def delete(self, keys: list[str]) -> None:
+        with self._lock:
+            for k in keys:
+                self._data.pop(k, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class _RedisBackend:
+    def __init__(self, client):
+        self._client = client
+
+    def get(self, key: str) -> Any:
+        raw = self._client.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        self._client.setex(key, ttl, json.dumps(value, default=str))
+
+    def delete(self, keys: list[str]) -> None:
+        if keys:
+            self._client.delete(*keys)
+
+    def clear(self) -> None:
+        keys = list(self._client.scan_iter(f"{KEY_PREFIX}:*"))
+        if keys:
+            self._client.delete(*keys)
+
+
+def _make_backend():
+    settings = get_settings()
+    if settings.REDIS_URL:
+        try:
+            import redis  # type: ignore
+        except Exception:
+            logger.warning("REDIS_URL is set but redis is not installed; using in-process calendar cache")
+        else:
+            return _RedisBackend(redis.Redis.from_url(settings.REDIS_URL))
+    if settings.CALENDAR_CACHE_TTL_SECONDS > 0:
+        logger.warning(
+            "calendar cache is in-process: writes from other processes are only "
+            "seen after CALENDAR_CACHE_TTL_SECONDS=%s; set REDIS_URL for exact invalidation",
+            settings.CALENDAR_CACHE_TTL_SECONDS,
+        )
+    return _MemoryBackend()
+
+
+class CalendarCache:
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._backend = _make_backend()
+
+    def get(self, key: str) -> Any:
+        if self.ttl_seconds <= 0:
+            return None
+        try:
+            return self._backend.get(key)
+        except Exception as e:
+            # A cache outage must never fail a calendar request
+            logger.warning("calendar cache get failed: %s", e)
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        try:
+            self._backend.set(key, value, self.ttl_seconds)
+        except Exception as e:
+            logger.warning("calendar cache set failed: %s", e)
+
+    def invalidate_note_dates(self, note_dates: Iterable[Any]) -> int:
+        keys: set[str] = set()
+        for value in note_dates:
+            dt = _as_date(value)
+            if dt is not None:
+                keys.update(keys_for_date(dt))
+        if not keys:
+            return 0
+        try:
+            self._backend.delete(sorted(keys))
+        except Exception as e:
+            logger.warning("calendar cache invalidate failed, clearing: %s", e)
+            self.clear()
+        return len(keys)
+
+    def clear(self) -> None:
+        try:
+            self._backend.clear()
+        except Exception as e:
+            logger.warning("calendar cache clear failed: %s", e)
+
+
+calendar_cache = CalendarCache(get_settings().CALENDAR_CACHE_TTL_SECONDS)
+
+
+def invalidate_note_dates(note_dates: Iterable[Any]) -> int:
+    return calendar_cache.invalidate_note_dates(note_dates)
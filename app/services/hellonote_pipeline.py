@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.visits import insert_visit_rows
+from app.helloNoteApi.transaction_report_request import fetch_hellonote_visits_raw
+from app.helloNoteApi.visits_mapper import map_hellonote_list_to_visits
+
+
+# Called once per written page after insert_visit_rows, on the same session:
+#   (db, raw_items, mapped_rows) -> {"counter": int, ...}
+BatchHook = Callable[[AsyncSession, List[dict], List[dict]], Awaitable[Dict[str, Any]]]
+
+_DONE = object()
+
+
+@dataclass
+class StageCounter:
+    name: str
+    items: int = 0
+    batches: int = 0
+    busy_seconds: float = 0.0
+
+    def add(self, items: int, seconds: float) -> None:
+        self.items += items
+        self.batches += 1
+        self.busy_seconds += seconds
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.busy_seconds if self.busy_seconds else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "items": self.items,
+            "batches": self.batches,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "items_per_second": round(self.items_per_second, 1),
+        }
+
+
+@dataclass
+class PipelineResult:
+    total_count: int = 0
+    wall_seconds: float = 0.0
+    stages: Dict[str, StageCounter] = field(default_factory=dict)
+    totals: Dict[str, Any] = field(default_factory=dict)
+
+    def merge(self, batch_result: Dict[str, Any]) -> None:
+        for key, value in (batch_result or {}).items():
+            if isinstance(value, bool):
+                continue
+            if isinstance(value, (int, float)):
+                self.totals[key] = self.totals.get(key, 0) + value
+            elif isinstance(value, list):
+                self.totals.setdefault(key, []).extend(value)
+
+    def summary(self) -> str:
+        lines = [f"wall={self.wall_seconds:.2f}s total_count={self.total_count}"]
+        for c in self.stages.values():
+            lines.append(
+                f"- {c.name}: {c.items} items / {c.batches} pages, "
+                f"{c.busy_seconds:.2f}s busy, {c.items_per_second:,.0f} items/s"
+            )
+        return "\n".join(lines)
+
+
+async def fetch_hellonote_pages(
+    date_from: str,
+    date_to: str,
+    page_size: int = 500,
+    counter: Optional[StageCounter] = None,
+    on_total: Optional[Callable[[int], None]] = None,
+    **flags,
+) -> AsyncIterator[List[dict]]:
+    """
+    Yield HelloNote BillingTransactions one page at a time. The first page's
+    totalCount replaces the separate amount=1 preview request.
+    """
+    skip = 0
+    total: Optional[int] = None
+
+    while total is None or skip < total:
+        started = time.perf_counter()
+        raw = await asyncio.to_thread(
+            fetch_hellonote_visits_raw,
+            dateFrom=date_from,
+            dateTo=date_to,
+            skipCount=skip,
+            amount=page_size,
+            **flags,
+        )
+        result = raw.get("result") or {}
+        items = result.get("items") or []
+
+        if total is None:
+            total = int(result.get("totalCount") or 0)
+            if on_total:
+                on_total(total)
+
+        if counter is not None:
+            counter.add(len(items), time.perf_counter() - started)
+
+        if not items:
+            break
+
+        yield items
+
+        if len(items) < page_size:
+            break
+        skip += page_size
+
+
+async def run_hellonote_import_pipeline(
+    db: AsyncSession,
+    date_from: str,
+    date_to: str,
+    uploaded_by: Optional[int],
+    page_size: int = 500,
+    queue_size: int = 2,
+    on_batch: Optional[BatchHook] = None,
+    **flags,
+) -> PipelineResult:
+    """
+    fetch → map → insert, one page at a time.
+
+    Stages are joined by bounded queues (queue_size pages), so a slow DB
+    write holds back fetching instead of buffering the whole range in memory.
+    Each page is committed by insert_visit_rows before the next is written.
+    """
+    result = PipelineResult(
+        stages={
+            "fetch": StageCounter("fetch"),
+            "map": StageCounter("map"),
+            "insert": StageCounter("insert"),
+        }
+    )
+
+    raw_q: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    mapped_q: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    def _set_total(total: int) -> None:
+        result.total_count = total
+
+    # On failure the sentinel is never sent; gather() below cancels the rest.
+    async def fetch_stage():
+        async for page in fetch_hellonote_pages(
+            date_from,
+            date_to,
+            page_size=page_size,
+            counter=result.stages["fetch"],
+            on_total=_set_total,
+            **flags,
+        ):
+            await raw_q.put(page)
+        await raw_q.put(_DONE)
+
+    async def map_stage():
+        while True:
+            page = await raw_q.get()
+            if page is _DONE:
+                break
+            started = time.perf_counter()
+            mapped = map_hellonote_list_to_visits(page)
+            result.stages["map"].add(len(mapped), time.perf_counter() - started)
+            await mapped_q.put((page, mapped))
+        await mapped_q.put(_DONE)
+
+    async def insert_stage():
+        while True:
+            batch = await mapped_q.get()
+            if batch is _DONE:
+                break
+            page, mapped = batch
+            started = time.perf_counter()
+
+            inserted = await insert_visit_rows(db, mapped, uploaded_by=uploaded_by, notify=False)
+            result.merge(inserted)
+
+            if on_batch is not None:
+                result.merge(await on_batch(db, page, mapped))
+                await db.commit()
+
+            result.stages["insert"].add(len(mapped), time.perf_counter() - started)
+
+    started = time.perf_counter()
+    tasks = [
+        asyncio.create_task(fetch_stage()),
+        asyncio.create_task(map_stage()),
+        asyncio.create_task(insert_stage()),
+    ]
+    try:
+        await asyncio.gather(*tasks)
+    except Exception:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    finally:
+        result.wall_seconds = time.perf_counter() - started
+
+    return result
@@ -0,0 +1,102 @@
+"""
+Run independent read queries concurrently, one pooled connection each.
+
+An AsyncSession can only run one statement at a time, so awaiting several
+CRUD calls on the request's session serialises them. run_concurrently()
+gives every query its own SessionLocal() session and gathers them:
+
+    fan = await run_concurrently({
+        "rows": lambda s: fetch_rows(s, ...),
+        "total": lambda s: count_rows(s, ...),
+    }, label="billing_unprepared")
+    rows, total = fan.results["rows"], fan.results["total"]
+    response.headers["Server-Timing"] = fan.server_timing()
+
+Only use it for reads: each session is closed without committing.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+Query = Callable[[AsyncSession], Awaitable[Any]]
+
+
+@dataclass
+class FanoutResult:
+    label: str
+    results: Dict[str, Any] = field(default_factory=dict)
+    timings_ms: Dict[str, float] = field(default_factory=dict)
+    wall_ms: float = 0.0
+
+    @property
+    def serial_ms(self) -> float:
+        """What the same queries would have cost awaited one after another."""
+        return sum(self.timings_ms.values())
+
+    def server_timing(self) -> str:
+        parts = [f"{name};dur={ms:.1f}" for name, ms in self.timings_ms.items()]
+        parts.append(f'{self.label};dur={self.wall_ms:.1f};desc="wall (serial {self.serial_ms:.1f})"')
+        return ", ".join(parts)
+
+
+async def run_concurrently(queries: Dict[str, Query], label: str = "fanout") -> FanoutResult:
+    result = FanoutResult(label=label)
+
+    async def _run(name: str, query: Query):
+        started = time.perf_counter()
+        try:
+            async with SessionLocal() as session:
+                return await query(session)
+        finally:
+            result.timings_ms[name] = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    tasks = {name: asyncio.create_task(_run(name, q)) for name, q in queries.items()}
+    try:
+        values = await asyncio.gather(*tasks.values())
+    except Exception:
+        for t in tasks.values():
+            t.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        raise
+    finally:
+        result.wall_ms = (time.perf_counter() - started) * 1000
+
+    result.results = dict(zip(tasks.keys(), values))
+    logger.info(
+        "%s: wall=%.1fms serial=%.1fms (%s)",
+        label,
+        result.wall_ms,
+        result.serial_ms,
+        ", ".join(f"{k}={v:.1f}ms" for k, v in result.timings_ms.items()),
+    )
+    return result
+
+
+class ServerTiming:
+    """Collects sequential step timings for routes whose queries depend on each other."""
+
+    def __init__(self):
+        self.timings_ms: Dict[str, float] = {}
+
+    @contextmanager
+    def step(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings_ms[name] = (time.perf_counter() - started) * 1000
+
+    def header(self) -> str:
+        return ", ".join(f"{name};dur={ms:.1f}" for name, ms in self.timings_ms.items())
@@ -0,0 +1,117 @@
+"""
+In-memory sorted index over typeahead_values for prefix lookups.
+
+The whole table is small (distinct payers, therapists, patients), so each
+process keeps it as one sorted key list per kind and answers prefixes with
+bisect. It reloads after TYPEAHEAD_TTL_SECONDS, or on the next lookup after
+an ingest path in this process calls mark_stale(). Substring/fuzzy matches
+fall through to the trigram index in the database.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from bisect import bisect_left
+from typing import Optional
+
+from app.config import get_settings
+from app.crud.typeahead import TYPEAHEAD_KINDS, load_typeahead_values, search_typeahead_trgm
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Shorter queries stay prefix-only: trigrams need 3 characters
+MIN_TRGM_QUERY = 3
+
+
+class _KindIndex:
+    def __init__(self, rows: list[tuple[str, int]]):
+        rows = sorted(rows, key=lambda r: (r[0].lower(), r[0], r[1]))
+        self.keys = [value.lower() for value, _ in rows]
+        self.rows = rows
+
+    def prefix(self, query: str, limit: int) -> list[tuple[str, int]]:
+        q = query.lower()
+        out: list[tuple[str, int]] = []
+        i = bisect_left(self.keys, q)
+        while i < len(self.keys) and self.keys[i].startswith(q) and len(out) < limit:
+            out.append(self.rows[i])
+            i += 1
+        return out
+
+    def values(self) -> list[str]:
+        seen: set[str] = set()
+        out: list[str] = []
+        for value, _ in self.rows:
+            if value not in seen:
+                seen.add(value)
+                out.append(value)
+        return out
+
+
+class TypeaheadIndex:
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._kinds: dict[str, _KindIndex] = {}
+        self._loaded_at: Optional[float] = None
+        self._stale = True
+        self._lock = asyncio.Lock()
+
+    def mark_stale(self) -> None:
+        self._stale = True
+
+    def _fresh(self) -> bool:
+        return (
+            not self._stale
+            and self._loaded_at is not None
+            and time.monotonic() - self._loaded_at < self.ttl_seconds
+        )
+
+    async def _ensure_loaded(self) -> None:
+        if self._fresh():
+            return
+        async with self._lock:
+            if self._fresh():
+                return
+            # Cleared before the read so a mark_stale() during it isn't lost
+            self._stale = False
+            async with SessionLocal() as db:
+                rows = await load_typeahead_values(db)
+            grouped: dict[str, list[tuple[str, int]]] = {k: [] for k in TYPEAHEAD_KINDS}
+            for kind, value, ref_id in rows:
+                grouped.setdefault(kind, []).append((value, ref_id))
+            self._kinds = {kind: _KindIndex(r) for kind, r in grouped.items()}
+            self._loaded_at = time.monotonic()
+            logger.info("typeahead index loaded: %d values", len(rows))
+
+    async def values(self, kind: str) -> list[str]:
+        """Every distinct value of a kind, case-insensitively sorted."""
+        await self._ensure_loaded()
+        index = self._kinds.get(kind)
+        return index.values() if index else []
+
+    async def search(self, kind: str, query: str, limit: int = 20) -> list[tuple[str, int]]:
+        """Prefix hits from memory first, then trigram hits from the DB to fill up."""
+        await self._ensure_loaded()
+        index = self._kinds.get(kind)
+        if index is None:
+            return []
+
+        hits = index.prefix(query, limit)
+        if len(hits) >= limit or len(query) < MIN_TRGM_QUERY:
+            return hits
+
+        async with SessionLocal() as db:
+            fuzzy = await search_typeahead_trgm(db, kind, query, limit)
+        seen = set(hits)
+        for row in fuzzy:
+            if row not in seen:
+                hits.append(row)
+                seen.add(row)
+            if len(hits) >= limit:
+                break
+        return hits
+
+
+typeahead_index = TypeaheadIndex(get_settings().TYPEAHEAD_TTL_SECONDS)